@@ -1,22 +1,46 @@
 import demographic
 import comedian
+import problemspec
 
 #This is a class that is used to read in the requirements from the problem folder and convert 
 #it into a list of comedians and demographics
+#A file can also give the problem's dimensions (see problemspec.py) in a third section, after a second '===' breaker,
+#with one "setting,value" line per setting. Files without one get the standard 5 day week, and a setting that isn't one of
+#problemspec.ProblemSpec.FIELDS is a ValueError
 
 class ReaderWriter:
 	
 	#This converts a text file into a list of comedians and demographics, so that they can be fit to a schedule
 	#Each line in the text file is a comma separated list of attributes
+	#The dimensions read from the file are kept in self.spec
 	def readRequirements(self,filename):
 		comedian_List = list()
 		demographic_List = list()
+		self.spec = problemspec.ProblemSpec()
 		with open(filename) as f:
 			demographics = False
+			settings = False
 			for line in f:
-				#comedians are listed first, up until the breaker character, '==='
+				#comedians are listed first, up until the breaker character, '===', and the dimensions come after the second one
 				if "===" in line:
+					if demographics:
+						settings = True
 					demographics = True
+				elif settings:
+					line = line.replace("\n","").split(",")
+					#a misspelt setting would otherwise quietly solve the standard week, so it is an error, as is a line that isn't
+					#setting,value or a value that isn't a whole number
+					if line[0].strip() == "":
+						continue
+					if len(line) != 2:
+						raise ValueError("Setting line '" + ",".join(line) + "' in " + str(filename) + " should be setting,value")
+					if line[0] not in problemspec.ProblemSpec.FIELDS:
+						raise ValueError("Unknown setting '" + line[0] + "' in " + str(filename) + ", it should be one of " + problemspec.listToWords(problemspec.ProblemSpec.FIELDS))
+					try:
+						value = int(line[1])
+					except ValueError:
+						raise ValueError("Setting '" + line[0] + "' in " + str(filename) + " should be a whole number, not '" + line[1] + "'")
+					setattr(self.spec, line[0], value)
 				else:
 					line = line.replace("\n","")
 					line = line.split(",")
@@ -40,7 +64,8 @@ class ReaderWriter:
 		return [comedian_List, demographic_List]
 
 	#This will convert a list of comedian and demographic objects into a text file, so that it can be used later
-	def writeRequirements(self,comedian_List, demographic_List, filename):
+	#If a spec is given and it isn't the standard week, its dimensions are written after the demographics
+	def writeRequirements(self,comedian_List, demographic_List, filename, spec=None):
 		#Each comedian object and demographic object are converted into a string of comma separated values
 		for c in comedian_List:
 			comedian_String = str(c.name)
@@ -63,3 +88,8 @@ class ReaderWriter:
 			with open(filename, "a") as f:
 				f.write(demographic_String + "\n")
 
+		if spec is not None and spec != problemspec.ProblemSpec():
+			with open(filename, "a") as f:
+				f.write("===\n")
+				for field, value in spec.asDict().items():
+					f.write(field + "," + str(value) + "\n")
@@ -0,0 +1,209 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import ReaderWriter
+import scheduler
+import solutioncache
+import portfolio
+import solvers
+
+#Solves many problem files from the command line, e.g. every venue-week of a night's run:
+#   python3 batch.py weeks/ --tasks 3 --mode lns --workers 4 --time-limit 30 --output results.jsonl
+#Each input is a directory (every .txt file in it), a glob or a file. Every file is solved for every selected task, each in a
+#process of its own with at most --workers of them running at once, and each result is written as one line of JSON as soon as
+#it finishes (in whatever order they finish), so other jobs can read the results while the batch is running.
+#A line has:
+#   instance, task, mode - what was solved, with the solver mode from solvers.SOLVERS
+#   status               - "solved", "infeasible" (the solver showed there is no schedule), "timeout" or "error"
+#   valid, cost          - from Timetable.scheduleChecker (cost is None unless the schedule is valid)
+#   bound, gap           - task 3 only: the lower bound on the cost and the fraction of the cost above it (see lowerbound.py)
+#   readTime, solveTime, checkTime - seconds spent reading the file, solving it and checking the schedule
+#   nodes                - search nodes over every search the solve ran
+#   timetable            - [day, session, comedian, demographic, show type] rows, or None
+#   error                - what went wrong, for status "error" (and for a solve that had to be killed)
+#The time limit is per instance. The searches check Scheduler.shouldStop every 1000 nodes and stop once it has passed, and
+#the anytime solvers (improved, lns and optimal) are given all of it as their budget, so they return their best schedule at
+#the limit. A solve that is still going --kill-after seconds after the limit (e.g. stuck in a phase that doesn't check
+#shouldStop) has its process killed, and is reported as a timeout without a schedule.
+
+# The problem files the inputs name, in order, without repeats
+def expandInputs(inputs):
+    filenames = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "*.txt")))
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+        else:
+            matches = [item]
+        for filename in matches:
+            if filename not in filenames:
+                filenames.append(filename)
+    return filenames
+
+# A result line for a job, with nothing found yet
+def newResult(job):
+    [filename, task, mode, timeLimit, seed, cacheDirectory] = job
+    result = {"instance": filename, "task": task, "mode": mode, "status": "error", "valid": False, "cost": None,
+        "readTime": None, "solveTime": None, "checkTime": None, "nodes": 0, "timetable": None}
+    if task == 3:
+        result["bound"] = None
+        result["gap"] = None
+    return result
+
+# Solves one file for one task, and returns its result line as a dict
+def solveJob(job):
+    [filename, task, mode, timeLimit, seed, cacheDirectory] = job
+    solver = solvers.findSolver(task, mode)
+    result = newResult(job)
+
+    try:
+        start = time.perf_counter()
+        rw = ReaderWriter.ReaderWriter()
+        [comedian_List, demographic_List] = rw.readRequirements(filename)
+        result["readTime"] = round(time.perf_counter() - start, 6)
+
+        sch = scheduler.Scheduler(comedian_List, demographic_List, rw.spec)
+        sch.reportGap = True
+        if cacheDirectory is not None:
+            sch.cache = solutioncache.SolutionCache(cacheDirectory)
+        start = time.perf_counter()
+        sch.shouldStop = lambda: time.perf_counter() - start > timeLimit
+        with contextlib.redirect_stdout(io.StringIO()):
+            tt = solver[2](sch, timeLimit, seed)
+        result["solveTime"] = round(time.perf_counter() - start, 6)
+        result["nodes"] = sch.nodes
+        if mode == "optimal" and hasattr(sch, "exactSolver"):
+            result["nodes"] += sch.exactSolver.nodes
+        if task == 3:
+            result["bound"] = sch.bound
+            result["gap"] = None if sch.gap is None else round(sch.gap, 6)
+
+        if tt == False:
+            result["status"] = "timeout" if result["solveTime"] > timeLimit else "infeasible"
+            return result
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result["valid"] = tt.scheduleChecker(comedian_List, demographic_List)
+        result["checkTime"] = round(time.perf_counter() - start, 6)
+        result["cost"] = tt.cost if result["valid"] else None
+        result["timetable"] = portfolio.timetableToRows(tt)
+        result["status"] = "solved"
+    except Exception as e:
+        # One bad file shouldn't stop the rest of the batch
+        result["status"] = "error"
+        result["error"] = type(e).__name__ + ": " + str(e)
+    return result
+
+# What each job's process runs: the job's result is sent back down connection
+def runJob(job, connection):
+    connection.send(solveJob(job))
+    connection.close()
+
+# Runs each job in a process of its own, at most workers at a time, calling onResult with each result as soon as it is ready.
+# Jobs are only started as processes free up, so a batch of any size takes the same memory and can be stopped part way through.
+# A job still running killAfter seconds after its time limit is killed
+def runJobs(jobs, workers, killAfter, onResult):
+    jobs = iter(jobs)
+    # [process, connection, job, started, deadline] for each job running
+    running = []
+    try:
+        while True:
+            while len(running) < workers:
+                job = next(jobs, None)
+                if job is None:
+                    break
+                receiver, sender = multiprocessing.Pipe(False)
+                process = multiprocessing.Process(target=runJob, args=(job, sender), daemon=True)
+                started = time.monotonic()
+                process.start()
+                sender.close()
+                running.append([process, receiver, job, started, started + job[3] + killAfter])
+            if not running:
+                break
+
+            timeout = max(0, min(entry[4] for entry in running) - time.monotonic())
+            ready = multiprocessing.connection.wait([entry[1] for entry in running], timeout)
+            for entry in list(running):
+                [process, receiver, job, started, deadline] = entry
+                if receiver in ready:
+                    try:
+                        result = receiver.recv()
+                    except EOFError:
+                        # The process died without sending anything back
+                        process.join()
+                        result = newResult(job)
+                        result["error"] = "the solver's process exited with code " + str(process.exitcode)
+                elif time.monotonic() >= deadline:
+                    process.kill()
+                    result = newResult(job)
+                    result["status"] = "timeout"
+                    result["solveTime"] = round(time.monotonic() - started, 6)
+                    result["error"] = "killed " + str(killAfter) + "s after the time limit"
+                else:
+                    continue
+                process.join()
+                receiver.close()
+                running.remove(entry)
+                onResult(result)
+    finally:
+        # If the batch is stopped part way through, don't leave solves running
+        for [process, receiver, job, started, deadline] in running:
+            process.kill()
+            process.join()
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many problem files in parallel, writing one line of JSON per result as it finishes")
+    parser.add_argument("inputs", nargs="+", help="problem files, directories of .txt problem files, or globs")
+    parser.add_argument("--tasks", default="3", help="comma separated tasks to solve each problem for")
+    parser.add_argument("--mode", default=None, help="the solver mode (" + ", ".join(sorted(set(solver[1] for solver in solvers.SOLVERS))) + "); defaults to each task's first")
+    parser.add_argument("--workers", type=int, default=None, help="solves to run at once (defaults to the number of cores)")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="seconds each instance gets, which the anytime solvers use in full")
+    parser.add_argument("--kill-after", type=float, default=5.0, help="seconds past the time limit before a solve that hasn't stopped is killed")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the improved and lns modes")
+    parser.add_argument("--cache", default=None, help="directory of a solutioncache.SolutionCache to share between the workers")
+    parser.add_argument("--output", default=None, help="file to write the JSON lines to, instead of printing them")
+    args = parser.parse_args()
+
+    tasks = [int(t) for t in args.tasks.split(",")]
+    modes = {}
+    for task in tasks:
+        solver = solvers.findSolver(task, args.mode)
+        if solver is None:
+            parser.error("task " + str(task) + " has no mode " + str(args.mode))
+        modes[task] = solver[1]
+    filenames = expandInputs(args.inputs)
+    if not filenames:
+        parser.error("no problem files found")
+    workers = args.workers if args.workers is not None else os.cpu_count()
+    jobs = ([filename, task, modes[task], args.time_limit, args.seed, args.cache] for filename in filenames for task in tasks)
+
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    counts = {}
+    start = time.perf_counter()
+
+    def onResult(result):
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    try:
+        runJobs(jobs, workers, args.kill_after, onResult)
+    except KeyboardInterrupt:
+        print("Stopped after " + str(sum(counts.values())) + " results", file=sys.stderr)
+        sys.exit(130)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(str(sum(counts.values())) + " results in " + str(round(time.perf_counter() - start, 2)) + "s: " + json.dumps(counts), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import numpy
+import compactstate
+import eligibility
+import problemspec
+
+#Checks and prices many task 2/3 schedules at once with NumPy, for scoring thousands of candidates when tuning weights or
+#searching locally. Needs NumPy, which nothing else in the project does, so it is only imported by code that asks for it.
+#
+#A batch of N schedules is an (N x days x slotsPerDay) integer array, where each cell is a show packed as in compactstate.py
+#(comedian id, demographic id and whether it is a test, with the ids from eligibility.py), or compactstate.EMPTY.
+#encodeTimeslots and encodeTimetable build one from the solvers' timeslots or from Timetables.
+#
+#check returns [valid, violations, costs], each of length N:
+#   valid      - True if Timetable.task23Checker would accept the schedule
+#   violations - the first constraint the schedule breaks (one of the codes below, VALID if none). The schedule is scanned
+#                in the same order as task23Checker (day by day, session by session, and the same checks on each show in the
+#                same order), so this is the one it would have printed a message about
+#   costs      - the cost of the schedule, the same as Timetable.cost after task23Checker accepts it.
+#                For schedules that aren't valid it is the cost of the shows as they stand
+#Timetable.task23Checker stays the reference implementation, and this should always agree with it.
+
+VALID = 0
+# A day has a slot with no show in it ("does not have every slot assigned")
+INCOMPLETE_DAY = 1
+# A demographic has a second main or a second test
+DUPLICATE_MAIN = 2
+DUPLICATE_TEST = 3
+# The comedian is already on stage for the daily cap before this show
+DAILY_CAP = 4
+# This show takes the comedian over the weekly cap
+WEEKLY_CAP = 5
+# The comedian can't market the show to its demographic
+CANNOT_MARKET = 6
+# The comedian's shows add up to more than the daily cap by the end of the day (e.g. a main after a test)
+DAILY_TOTAL = 7
+
+VIOLATION_NAMES = ["valid", "incomplete day", "duplicate main", "duplicate test", "daily cap", "weekly cap", "cannot market", "daily total"]
+
+class BatchChecker:
+
+    # spec gives the week's dimensions and hour caps (see problemspec.py), and defaults to the standard week
+    def __init__(self, comedian_List, demographic_List, spec=None):
+        self.spec = spec if spec is not None else problemspec.ProblemSpec()
+        self.index = eligibility.EligibilityIndex(comedian_List, demographic_List)
+        self.comedianCount = len(self.index.comedian_List)
+
+        # eligible[isTest, comedian, demographic]
+        self.eligible = numpy.zeros((2, self.comedianCount, len(self.index.demographic_List)), dtype=bool)
+        for c in range(self.comedianCount):
+            for isTest in [False, True]:
+                shows = self.index.testShows[c] if isTest else self.index.mainShows[c]
+                for d in self.index.maskToIds(shows):
+                    self.eligible[int(isTest), c, d] = True
+
+    # Encodes a list of filled timeslot lists ([demo, comedian, isTest] for each slot, day by day, as returned by
+    # Scheduler.findMinCostTimeslots), with None for an empty slot
+    def encodeTimeslots(self, timeslotsList):
+        shows = numpy.full((len(timeslotsList), self.spec.slots()), compactstate.EMPTY, dtype=numpy.int64)
+        for n, timeslots in enumerate(timeslotsList):
+            for i, slot in enumerate(timeslots):
+                if slot is not None:
+                    shows[n, i] = compactstate.packAssignment(self.index, slot)
+        return shows.reshape(len(timeslotsList), self.spec.days, self.spec.slotsPerDay)
+
+    # Encodes a list of task 2/3 Timetables. Sessions are numbered from 1, as in Timetable.addSession
+    def encodeTimetables(self, timetables):
+        shows = numpy.full((len(timetables), self.spec.days, self.spec.slotsPerDay), compactstate.EMPTY, dtype=numpy.int64)
+        for n, tt in enumerate(timetables):
+            for day, sessions in enumerate(tt.schedule.values()):
+                for session, [comedian, demographic, showType] in sessions.items():
+                    shows[n, day, session - 1] = compactstate.packAssignment(self.index, [demographic, comedian, showType == "test"])
+        return shows
+
+    def encodeTimetable(self, tt):
+        return self.encodeTimetables([tt])
+
+    # Checks and prices a batch of encoded schedules. Returns [valid, violations, costs] (see the top of this file)
+    def check(self, shows):
+        shows = numpy.asarray(shows, dtype=numpy.int64)
+        count, days, slotsPerDay = shows.shape
+        dailyHours = self.spec.dailyHours
+        weeklyHours = self.spec.weeklyHours
+
+        empty = shows < 0
+        cells = numpy.where(empty, 0, shows)
+        comedians = cells >> compactstate.COMEDIAN_SHIFT
+        demographics = (cells >> 1) & compactstate.DEMOGRAPHIC_MASK
+        isTest = (cells & 1).astype(bool)
+        hours = numpy.where(empty, 0, numpy.where(isTest, problemspec.TEST_HOURS, problemspec.MAIN_HOURS))
+
+        # Flatten each schedule into the order task23Checker reads it in
+        flat = lambda a: a.reshape(count, days * slotsPerDay)
+        position = numpy.arange(days * slotsPerDay)
+        dayOf = position // slotsPerDay
+
+        # A show is a duplicate if an earlier show has the same demographic and type. Empty cells get keys of their own
+        keys = numpy.where(flat(empty), -1 - position, flat(demographics) * 2 + flat(isTest))
+        duplicate = self.repeats(keys)
+
+        # Hours each comedian has had earlier today, and this week including this show
+        [todayAfter, dayTotals] = self.groupSums(flat(comedians) * days + dayOf, flat(hours))
+        todayBefore = todayAfter - flat(hours)
+        weekAfter = self.groupSums(flat(comedians), flat(hours))[0]
+
+        canMarket = self.eligible[flat(isTest).astype(int), flat(comedians), flat(demographics)] | flat(empty)
+
+        entryViolations = numpy.where(duplicate, numpy.where(flat(isTest), DUPLICATE_TEST, DUPLICATE_MAIN),
+            numpy.where(todayBefore >= dailyHours, DAILY_CAP,
+            numpy.where(weekAfter > weeklyHours, WEEKLY_CAP,
+            numpy.where(~canMarket, CANNOT_MARKET, VALID))))
+        entryViolations = numpy.where(flat(empty), VALID, entryViolations).reshape(count, days, slotsPerDay)
+
+        # Each day is read as: the check for empty slots, every show in turn, then the check of the day's totals
+        incomplete = numpy.where(empty.any(axis=2), INCOMPLETE_DAY, VALID)
+        overDay = numpy.where((dayTotals.reshape(count, days, slotsPerDay) > dailyHours).any(axis=2), DAILY_TOTAL, VALID)
+        events = numpy.concatenate([incomplete[:, :, None], entryViolations, overDay[:, :, None]], axis=2).reshape(count, -1)
+
+        first = numpy.argmax(events != VALID, axis=1)
+        violations = events[numpy.arange(count), first]
+        valid = violations == VALID
+        return [valid, violations, self.costs(comedians, isTest, empty)]
+
+    # Marks every entry of each row whose key has already appeared earlier in the row
+    def repeats(self, keys):
+        order = numpy.argsort(keys, axis=1, kind="stable")
+        sortedKeys = numpy.take_along_axis(keys, order, axis=1)
+        repeated = numpy.zeros(keys.shape, dtype=bool)
+        repeated[:, 1:] = sortedKeys[:, 1:] == sortedKeys[:, :-1]
+        result = numpy.zeros(keys.shape, dtype=bool)
+        numpy.put_along_axis(result, order, repeated, axis=1)
+        return result
+
+    # For each entry of each row, the sum of values over the entries with the same group: [up to and including it, over the whole row]
+    def groupSums(self, groups, values):
+        width = groups.shape[1]
+        # Sorting stably keeps each group's entries in the order they are read in
+        order = numpy.argsort(groups, axis=1, kind="stable")
+        sortedGroups = numpy.take_along_axis(groups, order, axis=1)
+        sortedValues = numpy.take_along_axis(values, order, axis=1)
+        sums = numpy.cumsum(sortedValues, axis=1)
+
+        # Where each entry's group starts and ends in the sorted row
+        starts = numpy.ones(groups.shape, dtype=bool)
+        starts[:, 1:] = sortedGroups[:, 1:] != sortedGroups[:, :-1]
+        ends = numpy.ones(groups.shape, dtype=bool)
+        ends[:, :-1] = starts[:, 1:]
+        startIndex = numpy.maximum.accumulate(numpy.where(starts, numpy.arange(width), 0), axis=1)
+        endIndex = numpy.minimum.accumulate(numpy.where(ends, numpy.arange(width), width)[:, ::-1], axis=1)[:, ::-1]
+
+        before = numpy.take_along_axis(sums - sortedValues, startIndex, axis=1)
+        running = numpy.empty(groups.shape, dtype=sums.dtype)
+        totals = numpy.empty(groups.shape, dtype=sums.dtype)
+        numpy.put_along_axis(running, order, sums - before, axis=1)
+        numpy.put_along_axis(totals, order, numpy.take_along_axis(sums, endIndex, axis=1) - before, axis=1)
+        return [running, totals]
+
+    # The same pricing as costmodel.weekCost, for every comedian of every schedule at once
+    def costs(self, comedians, isTest, empty):
+        count, days, slotsPerDay = comedians.shape
+        rows = numpy.repeat(numpy.arange(count), days * slotsPerDay).reshape(count, days, slotsPerDay)
+        dayIndex = numpy.broadcast_to(numpy.arange(days)[None, :, None], comedians.shape)
+        mains = numpy.zeros((count, self.comedianCount, days), dtype=numpy.int64)
+        tests = numpy.zeros((count, self.comedianCount, days), dtype=numpy.int64)
+        filled = ~empty
+        numpy.add.at(mains, (rows[filled & ~isTest], comedians[filled & ~isTest], dayIndex[filled & ~isTest]), 1)
+        numpy.add.at(tests, (rows[filled & isTest], comedians[filled & isTest], dayIndex[filled & isTest]), 1)
+
+        cost = numpy.zeros((count, self.comedianCount), dtype=numpy.int64)
+        mainCount = numpy.zeros((count, self.comedianCount), dtype=numpy.int64)
+        testCount = numpy.zeros((count, self.comedianCount), dtype=numpy.int64)
+        onStageYesterday = numpy.zeros((count, self.comedianCount), dtype=bool)
+        for d in range(days):
+            onStageToday = numpy.zeros((count, self.comedianCount), dtype=bool)
+            discount = numpy.zeros((count, self.comedianCount), dtype=numpy.int64)
+            for m in range(int(mains[:, :, d].max(initial=0))):
+                doing = mains[:, :, d] > m
+                mainCount += doing
+                cost += doing * numpy.where(mainCount == 1, 500, numpy.where(onStageYesterday, 100, 300))
+                onStageToday |= doing
+            for t in range(int(tests[:, :, d].max(initial=0))):
+                doing = tests[:, :, d] > t
+                testCount += doing
+                testCost = 300 - 50 * testCount
+                # Already on stage today, so this test is half price, and so is the first test of the day if there was one.
+                # The mains were priced first, as in costmodel.weekCost
+                cost += doing * numpy.where(onStageToday, testCost // 2 - discount, testCost)
+                discount = numpy.where(doing, numpy.where(onStageToday, 0, testCost // 2), discount)
+                onStageToday |= doing
+            onStageYesterday = onStageToday
+        return cost.sum(axis=1)
@@ -0,0 +1,130 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+import scheduler
+import exactsolver
+import lowerbound
+import generator
+import stats
+import solvers
+
+#Runs every task and solver mode over the example problems and any number of generated ones, and prints the results as JSON
+#so runs on different commits can be compared. For each run it records:
+#   wallTime    - seconds, measured without tracemalloc running
+#   nodes       - search nodes over every search the run made (including the exact solver's, for the optimal mode)
+#   backtracks  - choices the searches ran out of
+#   peakMemory  - the most memory Python had allocated during a second, identical run under tracemalloc, in bytes
+#   cost        - the schedule's cost, from Timetable.scheduleChecker
+#   bound       - the best known lower bound on the cost of any schedule for the problem, from the exact solver (tasks 2 and 3)
+#   gap         - the fraction of the cost that is above the bound, as lowerbound.gap and Scheduler.printGap work it out
+#   stats       - the checks, prunes and time per phase counted by stats.SearchStats
+#Runs that take longer than --time-limit seconds are stopped and reported as invalid. The improved and lns modes would use the
+#whole time limit, so they are given at most a second, and seed 0, to keep the runs comparable.
+
+# Runs one solver on a fresh scheduler, and returns [timetable or False, scheduler]
+def runSolver(solver, comedian_List, demographic_List, spec, timeLimit):
+    sch = scheduler.Scheduler(comedian_List, demographic_List, spec)
+    sch.stats = stats.SearchStats()
+    start = time.time()
+    sch.shouldStop = lambda: time.time() - start > timeLimit
+    with contextlib.redirect_stdout(io.StringIO()):
+        tt = solver[2](sch, min(1.0, timeLimit) if solver[1] in ["improved", "lns"] else timeLimit, 0)
+    return [tt, sch]
+
+# The best known lower bound on the cost of a schedule, or None if there is no schedule at all
+# (or if the exact solver can't handle the problem's hour caps)
+def bestKnownBound(comedian_List, demographic_List, spec, timeLimit):
+    if not spec.hasStandardCaps():
+        return None
+    solver = exactsolver.ExactSolver(scheduler.Scheduler(comedian_List, demographic_List, spec))
+    with contextlib.redirect_stdout(io.StringIO()):
+        solver.solve(timeLimit)
+    if solver.lowerBound == float("inf"):
+        return None
+    return solver.lowerBound
+
+def benchmarkInstance(name, comedian_List, demographic_List, spec, tasks, timeLimit, measureMemory):
+    results = []
+    bound = None
+    if 2 in tasks or 3 in tasks:
+        bound = bestKnownBound(comedian_List, demographic_List, spec, timeLimit)
+
+    for solver in solvers.SOLVERS:
+        if solver[0] not in tasks:
+            continue
+        start = time.perf_counter()
+        [tt, sch] = runSolver(solver, comedian_List, demographic_List, spec, timeLimit)
+        wallTime = time.perf_counter() - start
+
+        valid = False
+        cost = None
+        if tt != False:
+            with contextlib.redirect_stdout(io.StringIO()):
+                valid = tt.scheduleChecker(comedian_List, demographic_List)
+            cost = tt.cost if valid else None
+
+        nodes = sch.nodes
+        if solver[1] == "optimal":
+            nodes += sch.exactSolver.nodes
+
+        peakMemory = None
+        if measureMemory:
+            tracemalloc.start()
+            runSolver(solver, comedian_List, demographic_List, spec, timeLimit)
+            peakMemory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        result = {"instance": name, "task": solver[0], "mode": solver[1], "valid": valid, "cost": cost,
+            "wallTime": round(wallTime, 6), "nodes": nodes, "backtracks": sch.backtracks, "peakMemory": peakMemory,
+            "stats": {"checks": sch.stats.checks, "prunes": sch.stats.prunes, "phaseTimes": sch.stats.phaseTimes}}
+        if solver[0] != 1:
+            result["bound"] = bound
+            result["gap"] = None if cost is None or bound is None else round(lowerbound.gap(cost, bound), 6)
+        results.append(result)
+    return results
+
+# The commit being benchmarked, if this is a git checkout
+def currentCommit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers over the example problems and generated problems")
+    parser.add_argument("--problems", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "ExampleProblems", "*.txt"), help="glob of problem files to run")
+    parser.add_argument("--generate", type=int, default=0, help="how many generated problems to run as well")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first generated problem")
+    parser.add_argument("--comedians", type=int, default=30)
+    parser.add_argument("--themes", type=int, default=15)
+    parser.add_argument("--themes-per-comedian", type=int, default=3)
+    parser.add_argument("--tightness", type=float, default=None, help="set the roster size from the fraction of comedian hours the shows need")
+    parser.add_argument("--tasks", default="1,2,3", help="comma separated tasks to run")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds before a run is stopped")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--output", default=None, help="file to write the JSON to, instead of printing it")
+    args = parser.parse_args()
+
+    tasks = [int(t) for t in args.tasks.split(",")]
+    instances = generator.readProblems(args.problems, args.generate, args.seed, comedians=args.comedians, themes=args.themes,
+        themesPerComedian=args.themes_per_comedian, tightness=args.tightness)
+
+    results = []
+    for name, comedian_List, demographic_List, spec in instances:
+        results += benchmarkInstance(name, comedian_List, demographic_List, spec, tasks, args.time_limit, not args.no_memory)
+
+    report = {"commit": currentCommit(), "python": platform.python_version(), "timeLimit": args.time_limit, "results": results}
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,64 @@
-import demographic
+import sys
 #Class for storing a comedian object, tracks their name, and themes
-#themes are a list of strings
+#themes is a tuple of strings, in the order they were given with any repeats dropped
+#The themes are only kept as the tuple, since a comedian has a handful of them and a second copy as a set would double the
+#memory they take. The solvers check eligibility with the per-problem bit masks in eligibility.py instead
 #name is a string
+#Comedians are immutable values: two comedians with the same name and themes are equal, and the hash is worked out once,
+#since they are used as dict keys all through the solvers. Use withName/withThemes to get a changed copy
+#Whether two tuples without repeats hold the same items, in any order
+def sameItems(first, second):
+	return first == second or (len(first) == len(second) and all(item in second for item in first))
+
 class Comedian:
 
-	def __init__(self,name="", themes=list()):
-		self.name=name
-		self.themes=themes
-
-	#this is used during set up and should not be used in your solution
-	def setName(self,name):
-		self.name = name
-	
-	#this is used during set up and should not be used in your solution	
-	def setThemes(self,themes):
-		self.themes = themes
-	
-	#this is used during set up and should not be used in your solution
-	def addTheme(self,theme):
-		self.themes.add(theme)
+	__slots__ = ("name", "themes", "hashCode")
+
+	def __init__(self,name="", themes=()):
+		#the themes are copied, so a list passed in can't change the comedian afterwards,
+		#and interned, so the same theme read in for thousands of comedians is only stored once
+		themes = tuple(dict.fromkeys(sys.intern(t) for t in themes))
+		object.__setattr__(self, "name", name)
+		object.__setattr__(self, "themes", themes)
+		#the order the themes were given in doesn't matter to equality, so neither can it to the hash
+		object.__setattr__(self, "hashCode", hash((name, frozenset(themes))))
+
+	def __setattr__(self, attribute, value):
+		raise AttributeError("Comedian objects are immutable")
+
+	def __delattr__(self, attribute):
+		raise AttributeError("Comedian objects are immutable")
+
+	def withName(self,name):
+		return Comedian(name, self.themes)
+
+	def withThemes(self,themes):
+		return Comedian(self.name, themes)
+
+	def withTheme(self,theme):
+		return Comedian(self.name, self.themes + (theme,))
+
+	#can this comedian do a main for the demographic (they have every one of its topics), or a test (they have at least one)?
+	def canDoMain(self,demographic):
+		return all(topic in self.themes for topic in demographic.topics)
+
+	def canDoTest(self,demographic):
+		return any(topic in self.themes for topic in demographic.topics)
+
+	def __eq__(self, other):
+		if not isinstance(other, Comedian):
+			return NotImplemented
+		return self.hashCode == other.hashCode and self.name == other.name and sameItems(self.themes, other.themes)
+
+	def __hash__(self):
+		return self.hashCode
+
+	#slotted objects that refuse setattr need telling how to be pickled, e.g. to send them to the portfolio's worker processes
+	def __reduce__(self):
+		return (Comedian, (self.name, self.themes))
 
 	def __str__(self):
-		return str([self.name, self.themes])
+		return str([self.name, list(self.themes)])
 
 	def __repr__(self):
 		return str(self)
\ No newline at end of file
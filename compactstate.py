@@ -0,0 +1,118 @@
+from array import array
+import problemspec
+
+#Compact state for the searches in search.py. Comedians and demographics are numbered by their place in the problem's lists
+#(the same ids as eligibility.py uses), and a show given to a comedian is packed into a single int:
+#   bit 0          - 1 for a test, 0 for a main
+#   bits 1 to 20   - the demographic's id
+#   bits 21 and up - the comedian's id
+#The per-comedian and per-day counts are kept in arrays made once per search, so a node never hashes a Comedian object or
+#builds a [demo, comedian, isTest] list. Shows are only turned back into objects once a search has finished (see unpackShow)
+
+DEMOGRAPHIC_BITS = 20
+COMEDIAN_SHIFT = DEMOGRAPHIC_BITS + 1
+DEMOGRAPHIC_MASK = (1 << DEMOGRAPHIC_BITS) - 1
+
+# Marks a timeslot with no show in it yet
+EMPTY = -1
+
+def packShow(comedian, demographic, isTest):
+    return (comedian << COMEDIAN_SHIFT) | (demographic << 1) | (1 if isTest else 0)
+
+# Gives a show packed without a comedian (comedian 0) to a comedian
+def withComedian(show, comedian):
+    return show | (comedian << COMEDIAN_SHIFT)
+
+def showComedian(show):
+    return show >> COMEDIAN_SHIFT
+
+def showDemographic(show):
+    return (show >> 1) & DEMOGRAPHIC_MASK
+
+def showIsTest(show):
+    return show & 1 == 1
+
+def showHours(show):
+    return problemspec.TEST_HOURS if show & 1 else problemspec.MAIN_HOURS
+
+# Packs a [demo, comedian, isTest] assignment, using the ids from an eligibility.EligibilityIndex
+def packAssignment(index, assignment):
+    return packShow(index.comedianId(assignment[1]), index.demographicId(assignment[0]), assignment[2])
+
+# The other way round, back to [demo, comedian, isTest]
+def unpackShow(index, show):
+    return [index.demographic_List[showDemographic(show)], index.comedian_List[showComedian(show)], showIsTest(show)]
+
+def zeros(count):
+    return array("i", [0]) * count
+
+#What the task 2/3 pairing searches keep for each comedian: their hours left, and how many mains and tests they have
+class PairingState:
+
+    def __init__(self, comedianCount, weeklyHours):
+        self.hoursLeft = array("i", [weeklyHours]) * comedianCount
+        self.mainCounts = zeros(comedianCount)
+        self.testCounts = zeros(comedianCount)
+        # The packed shows assigned so far, in the order they were assigned
+        self.shows = []
+
+    def showCount(self, comedian, isTest):
+        return self.testCounts[comedian] if isTest else self.mainCounts[comedian]
+
+#What the task 3 slot search keeps: how many mains and tests each comedian has on each day (comedian * days + day),
+#and how many of each they have still to be given a slot
+class SlotState:
+
+    def __init__(self, comedianCount, days):
+        self.days = days
+        self.mains = zeros(comedianCount * days)
+        self.tests = zeros(comedianCount * days)
+        self.unplacedMains = zeros(comedianCount)
+        self.unplacedTests = zeros(comedianCount)
+
+    def addUnplaced(self, show):
+        if show & 1:
+            self.unplacedTests[show >> COMEDIAN_SHIFT] += 1
+        else:
+            self.unplacedMains[show >> COMEDIAN_SHIFT] += 1
+
+    # Moves a show from unplaced onto a day (count = 1), or back again (count = -1)
+    def update(self, show, day, count):
+        comedian = show >> COMEDIAN_SHIFT
+        if show & 1:
+            self.tests[comedian * self.days + day] += count
+            self.unplacedTests[comedian] -= count
+        else:
+            self.mains[comedian * self.days + day] += count
+            self.unplacedMains[comedian] -= count
+
+    def place(self, show, day):
+        self.update(show, day, 1)
+
+    def remove(self, show, day):
+        self.update(show, day, -1)
+
+    def mainsOnDay(self, comedian, day):
+        return self.mains[comedian * self.days + day]
+
+    def testsOnDay(self, comedian, day):
+        return self.tests[comedian * self.days + day]
+
+    # Everything the slot search knows about a comedian: their mains and tests on each day, and how many of each are unplaced.
+    # Two comedians with the same profile can swap shows without the rest of the search noticing
+    def profile(self, comedian):
+        i = comedian * self.days
+        return (tuple(self.mains[i:i + self.days]), tuple(self.tests[i:i + self.days]), self.unplacedMains[comedian], self.unplacedTests[comedian])
+
+    # Unplaced mains, unplaced tests and hours on the day, packed into one number, for every comedian with shows left to
+    # place, sorted, as bytes (so a search.NogoodTable full of them stays small)
+    def signature(self, day):
+        profiles = []
+        for comedian in range(len(self.unplacedMains)):
+            if self.unplacedMains[comedian] or self.unplacedTests[comedian]:
+                profiles.append((self.unplacedMains[comedian] << 32) | (self.unplacedTests[comedian] << 16) | self.hoursOnDay(comedian, day))
+        return array("q", sorted(profiles)).tobytes()
+
+    def hoursOnDay(self, comedian, day):
+        i = comedian * self.days + day
+        return problemspec.MAIN_HOURS * self.mains[i] + problemspec.TEST_HOURS * self.tests[i]
@@ -0,0 +1,204 @@
+#The Task 2/3 cost model, following the rules in Timetable.task23Checker:
+# - a comedian's first main of the week costs 500, and every later main costs 100 if they were on stage the day before, or 300 if not
+# - a comedian's nth test of the week costs 300 - 50n, and if they do two tests on the same day both are half price
+# - a test after a main on the same day is half price
+#With the standard 2 hour daily cap a comedian can't do a main and a test on the same day at all. Only a daily cap above
+#2 hours (see problemspec.py) allows a test before a main on the same day, which the original rules didn't price, and for
+#those caps task23Checker makes that test half price when the main comes. So a day's order never changes its cost, which the
+#day patterns, the lower bound and every incremental update rely on.
+#A comedian's cost only depends on how many mains and tests they do on each day, and is independent of every other comedian,
+#so the cost of the whole schedule is the sum of each comedian's weekly cost.
+
+import problemspec
+
+# What a comedian can legally do on a single day with the standard 2 hour daily cap. A main and a test on the same day would be 3 hours
+DAY_OPTIONS = ["", "M", "T", "TT"]
+
+# Works out one comedian's weekly cost from the number of mains and tests they do each day.
+# Each day's mains are priced before its tests, which gives the same cost as any other order (see the rules above)
+def weekCost(mains, tests):
+    cost = 0
+    mainCount = 0
+    testCount = 0
+    onStageYesterday = False
+    for d in range(len(mains)):
+        onStageToday = False
+        discount = 0
+        for m in range(mains[d]):
+            mainCount += 1
+            if mainCount == 1:
+                cost += 500
+            elif onStageYesterday:
+                cost += 100
+            else:
+                cost += 300
+            onStageToday = True
+        for t in range(tests[d]):
+            testCount += 1
+            testCost = 300 - 50 * testCount
+            if onStageToday:
+                # Already on stage today, so this test is half price, and so is the first test of the day if there was one
+                cost += testCost // 2 - discount
+                discount = 0
+            else:
+                cost += testCost
+                discount = testCost // 2
+            onStageToday = True
+        onStageYesterday = onStageToday
+    return cost
+
+# The same thing, for a week written as one DAY_OPTIONS string per day
+def patternCost(pattern):
+    return weekCost([today.count("M") for today in pattern], [today.count("T") for today in pattern])
+
+# The hours each DAY_OPTIONS entry takes
+OPTION_HOURS = {option: problemspec.MAIN_HOURS * option.count("M") + problemspec.TEST_HOURS * option.count("T") for option in DAY_OPTIONS}
+
+# Adds every legal way of finishing the week from pattern (the options for its first days) to patterns, with hoursLeft hours
+# still free. Only the options that fit are tried, so the weeks visited are just the legal ones and not all 4**days of them
+def addPatterns(patterns, pattern, days, hoursLeft):
+    if len(pattern) == days:
+        mains = pattern.count("M")
+        tests = pattern.count("T") + 2 * pattern.count("TT")
+        patterns.setdefault((mains, tests), []).append([patternCost(pattern), tuple(pattern)])
+        return
+    for option in DAY_OPTIONS:
+        if OPTION_HOURS[option] <= hoursLeft:
+            pattern.append(option)
+            addPatterns(patterns, pattern, days, hoursLeft - OPTION_HOURS[option])
+            pattern.pop()
+
+# Returns {(mains, tests): [[cost, pattern], ...]} for every legal week a comedian could have, cheapest pattern first
+def getDayPatterns(days, weeklyHours=4):
+    patterns = {}
+    addPatterns(patterns, [], days, weeklyHours)
+    for showType in patterns:
+        patterns[showType].sort()
+    return patterns
+
+#Keeps the running cost of a (partial) schedule, along with each comedian's show counts for every day, and how full every day is.
+#Placing or removing one show only re-prices the comedian involved, and a comedian has at most 4 shows a week,
+#so every update and every evaluation below costs the same however many comedians and demographics there are.
+#Comedians can be any hashable key: Comedian objects, names or integer ids.
+#The hour caps used by isValid and canPlace default to the standard ones (see problemspec.py)
+class CostModel:
+
+    def __init__(self, days=5, dailyHours=2, weeklyHours=4):
+        self.days = days
+        self.dailyHours = dailyHours
+        self.weeklyHours = weeklyHours
+        self.mains = {}
+        self.tests = {}
+        self.hours = {}
+        self.costs = {}
+        self.occupancy = [0] * days
+        self.cost = 0
+
+    def addComedian(self, comedian):
+        self.mains[comedian] = [0] * self.days
+        self.tests[comedian] = [0] * self.days
+        self.hours[comedian] = 0
+        self.costs[comedian] = 0
+
+    def comedianCost(self, comedian):
+        if comedian not in self.costs:
+            return 0
+        return self.costs[comedian]
+
+    def mainsOnDay(self, comedian, day):
+        if comedian not in self.mains:
+            return 0
+        return self.mains[comedian][day]
+
+    def testsOnDay(self, comedian, day):
+        if comedian not in self.tests:
+            return 0
+        return self.tests[comedian][day]
+
+    def hoursOnDay(self, comedian, day):
+        return problemspec.MAIN_HOURS * self.mainsOnDay(comedian, day) + problemspec.TEST_HOURS * self.testsOnDay(comedian, day)
+
+    def hoursInWeek(self, comedian):
+        if comedian not in self.hours:
+            return 0
+        return self.hours[comedian]
+
+    # Does this comedian's week keep to the daily and weekly hours caps?
+    def isValid(self, comedian):
+        if self.hoursInWeek(comedian) > self.weeklyHours:
+            return False
+        for d in range(self.days):
+            if self.hoursOnDay(comedian, d) > self.dailyHours:
+                return False
+        return True
+
+    # Could this show be added without breaking either hours cap?
+    def canPlace(self, comedian, day, isTest):
+        hours = problemspec.TEST_HOURS if isTest else problemspec.MAIN_HOURS
+        return self.hoursInWeek(comedian) + hours <= self.weeklyHours and self.hoursOnDay(comedian, day) + hours <= self.dailyHours
+
+    def updateCounts(self, comedian, day, isTest, count):
+        if comedian not in self.mains:
+            self.addComedian(comedian)
+        if isTest:
+            self.tests[comedian][day] += count
+            self.hours[comedian] += problemspec.TEST_HOURS * count
+        else:
+            self.mains[comedian][day] += count
+            self.hours[comedian] += problemspec.MAIN_HOURS * count
+        self.occupancy[day] += count
+
+    # Works out a comedian's weekly cost again after their counts changed, and returns the change in cost
+    def reprice(self, comedian):
+        newCost = weekCost(self.mains[comedian], self.tests[comedian])
+        delta = newCost - self.costs[comedian]
+        self.costs[comedian] = newCost
+        self.cost += delta
+        return delta
+
+    # Adds or removes (count = -1) one show, and returns the change in cost
+    def update(self, comedian, day, isTest, count):
+        self.updateCounts(comedian, day, isTest, count)
+        return self.reprice(comedian)
+
+    def place(self, comedian, day, isTest):
+        return self.update(comedian, day, isTest, 1)
+
+    def remove(self, comedian, day, isTest):
+        return self.update(comedian, day, isTest, -1)
+
+    # The change in cost if the show were placed, without placing it
+    def placeDelta(self, comedian, day, isTest):
+        delta = self.place(comedian, day, isTest)
+        self.remove(comedian, day, isTest)
+        return delta
+
+    # Makes a list of changes, each [comedian, day, isTest, count], and returns the change in cost
+    # Each comedian involved is only re-priced once, however many of the changes are theirs
+    def apply(self, changes):
+        touched = set()
+        for comedian, day, isTest, count in changes:
+            self.updateCounts(comedian, day, isTest, count)
+            touched.add(comedian)
+        delta = 0
+        for comedian in touched:
+            delta += self.reprice(comedian)
+        return delta
+
+    # Undoes a list of changes made by apply
+    def undo(self, changes):
+        self.apply([[comedian, day, isTest, -count] for comedian, day, isTest, count in changes])
+
+    # The change in cost if the changes were made, without making them
+    def changeDelta(self, changes):
+        delta = self.apply(changes)
+        self.undo(changes)
+        return delta
+
+    # Changes that exchange the days of two shows
+    def swapChanges(self, comedian1, day1, isTest1, comedian2, day2, isTest2):
+        return [[comedian1, day1, isTest1, -1], [comedian2, day2, isTest2, -1], [comedian1, day2, isTest1, 1], [comedian2, day1, isTest2, 1]]
+
+    # The change in cost if two shows swapped days
+    def swapDelta(self, comedian1, day1, isTest1, comedian2, day2, isTest2):
+        return self.changeDelta(self.swapChanges(comedian1, day1, isTest1, comedian2, day2, isTest2))
@@ -0,0 +1,100 @@
+#The optimal second phase for Task 3. Once every show has a comedian, the cost of the week only depends on which days each
+#comedian does their mains and tests on (see costmodel.py), and not on which demographics the shows are for. Every comedian's
+#(mains, tests) type has a list of legal day patterns with their exact cost (costmodel.getDayPatterns), so the cheapest week is
+#the cheapest choice of one pattern per comedian that doesn't put more shows on any day than it has slots.
+#
+#That choice is found by a depth-first branch and bound over the comedians, trying each comedian's cheapest patterns first.
+#It is memoised on how full each day is after the comedians so far, which is all the rest of the week depends on, so it works
+#like a DP over the day occupancies that only visits the states that can still beat the best week found.
+#The patterns are built for the standard 2 hour daily cap (a main, a test or two tests a day), so nothing else is supported.
+#
+#Used by ExactSolver for every pairing it reaches, and by Scheduler.findMinCostTimeslots with daysMode "optimal" in place of
+#the heuristic search in assignShowsToDays.
+#On long weeks the number of occupancy states can get very large, so a solve can be given a node limit and a shouldStop
+#function (checked every 1000 nodes), and gives up without an answer if either runs out.
+class DayAssignment:
+
+    # patterns is from costmodel.getDayPatterns, for the week's number of days and weekly cap
+    def __init__(self, patterns, days, slotsPerDay):
+        self.patterns = patterns
+        self.days = days
+        self.slotsPerDay = slotsPerDay
+        self.cost = None
+
+    # Finds the cheapest patterns for a list of [comedian, (mains, tests)], for the comedians doing any shows.
+    # Returns their cost if it is below budget, or None if there isn't a week that cheap (or no week at all), or if it was
+    # stopped by nodeLimit or shouldStop first (which sets self.stopped)
+    def solve(self, types, budget=float("inf"), nodeLimit=None, shouldStop=None):
+        self.nodes = 0
+        self.nodeLimit = nodeLimit
+        self.shouldStop = shouldStop
+        self.stopped = False
+        if any(showType not in self.patterns for comedian, showType in types):
+            self.cost = None
+            return None
+        # The types with the fewest patterns go first, as they are the hardest to fit in once the days fill up (e.g. two mains
+        # on consecutive days), and comedians of the same type go together, so the states after them are more often shared
+        self.comedians = sorted(types, key = lambda t: [len(self.patterns[t[1]]), t[1]])
+        self.minRest = [0] * (len(self.comedians) + 1)
+        for i in range(len(self.comedians) - 1, -1, -1):
+            self.minRest[i] = self.minRest[i + 1] + self.patterns[self.comedians[i][1]][0][0]
+        self.dayBounds = {}
+        self.dayChoices = {}
+
+        self.cost = self.searchDays(0, tuple([0] * self.days), budget)
+        if self.stopped:
+            self.cost = None
+        return self.cost
+
+    def addPattern(self, occupancy, pattern):
+        return tuple(occupancy[d] + len(pattern[d]) for d in range(self.days))
+
+    # Cheapest way to give days to comedians[i:], given how full each day already is.
+    # Returns a cost below budget, or None if there isn't one.
+    # dayBounds remembers, for each state, a cost the rest of the week is known not to go below
+    def searchDays(self, i, occupancy, budget):
+        self.nodes += 1
+        if self.nodeLimit is not None and self.nodes > self.nodeLimit:
+            self.stopped = True
+        elif self.shouldStop is not None and self.nodes % 1000 == 0 and self.shouldStop():
+            self.stopped = True
+        if self.stopped:
+            return None
+        if i == len(self.comedians):
+            return 0 if budget > 0 else None
+
+        key = (i, occupancy)
+        if self.dayBounds.get(key, 0) >= budget:
+            return None
+
+        best = None
+        for patternIndex, [cost, pattern] in enumerate(self.patterns[self.comedians[i][1]]):
+            if cost + self.minRest[i + 1] >= budget:
+                break
+            if any(occupancy[d] + len(pattern[d]) > self.slotsPerDay for d in range(self.days)):
+                continue
+            rest = self.searchDays(i + 1, self.addPattern(occupancy, pattern), budget - cost)
+            # A stopped search hasn't proved anything, so nothing is remembered for this state
+            if self.stopped:
+                return None
+            if rest is not None:
+                best = cost + rest
+                budget = best
+                self.dayChoices[key] = patternIndex
+
+        # Either best is the exact optimum from here, or nothing beats the budget we were given
+        self.dayBounds[key] = best if best is not None else budget
+        return best
+
+    # The week the last successful solve found: for each day, [comedian, isTest] for each of its shows, with the comedians
+    # in the order solve puts them in
+    def week(self):
+        week = [[] for d in range(self.days)]
+        occupancy = tuple([0] * self.days)
+        for i, [comedian, showType] in enumerate(self.comedians):
+            pattern = self.patterns[showType][self.dayChoices[(i, occupancy)]][1]
+            for d in range(self.days):
+                for show in pattern[d]:
+                    week[d].append([comedian, show == "T"])
+            occupancy = self.addPattern(occupancy, pattern)
+        return week
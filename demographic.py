@@ -1,25 +1,51 @@
-#Simple class representing a demographic, includes the reference code, and the list of topics
-#topics is a list of strings
+import sys
+import comedian
+#Simple class representing a demographic, includes the reference code, and the topics
+#topics is a tuple of strings, in the order they were given with any repeats dropped
 #reference is a string
+#Like comedians, demographics keep their topics only as the tuple, and are immutable values with a hash worked out once. Use withReference/withTopics to get a changed copy
+
 class Demographic:
-	def __init__(self,reference="", topics=list()):
-		self.reference = reference
-		self.topics = topics
 
-	#this is used during set up and should not be used in your solution
-	def setReference(self,name):
-		self.reference = reference
+	__slots__ = ("reference", "topics", "hashCode")
+
+	def __init__(self,reference="", topics=()):
+		#the topics are copied, so a list passed in can't change the demographic afterwards,
+		#and interned, so the same topic read in for thousands of demographics is only stored once
+		topics = tuple(dict.fromkeys(sys.intern(t) for t in topics))
+		object.__setattr__(self, "reference", reference)
+		object.__setattr__(self, "topics", topics)
+		object.__setattr__(self, "hashCode", hash((reference, frozenset(topics))))
+
+	def __setattr__(self, attribute, value):
+		raise AttributeError("Demographic objects are immutable")
+
+	def __delattr__(self, attribute):
+		raise AttributeError("Demographic objects are immutable")
+
+	def withReference(self,reference):
+		return Demographic(reference, self.topics)
+
+	def withTopics(self,topics):
+		return Demographic(self.reference, topics)
+
+	def withTopic(self,topic):
+		return Demographic(self.reference, self.topics + (topic,))
+
+	def __eq__(self, other):
+		if not isinstance(other, Demographic):
+			return NotImplemented
+		return self.hashCode == other.hashCode and self.reference == other.reference and comedian.sameItems(self.topics, other.topics)
 
-	#this is used during set up and should not be used in your solution
-	def setTopics(self,topics):
-		self.topics = topics
+	def __hash__(self):
+		return self.hashCode
 
-	#this is used during set up and should not be used in your solution
-	def addTopic(self,topic):
-		self.topics.append(topic)
+	#slotted objects that refuse setattr need telling how to be pickled, e.g. to send them to the portfolio's worker processes
+	def __reduce__(self):
+		return (Demographic, (self.reference, self.topics))
 
 	def __str__(self):
-		return str([self.reference, self.topics])
+		return str([self.reference, list(self.topics)])
 
 	def __repr__(self):
 		return str(self)
\ No newline at end of file
@@ -0,0 +1,138 @@
+#Precomputed index of which comedians can market which demographics
+#Every theme/topic string is interned to an integer id, so each comedian's themes and each demographic's topics become a bitmask
+#A comedian can do a main show for a demographic if the demographic's topic mask is a subset of the comedian's theme mask,
+#and a test show if the two masks share at least one bit. Both answers are worked out once per problem, when the index is built.
+class EligibilityIndex:
+
+    def __init__(self, comedian_List, demographic_List):
+        self.comedian_List = list(comedian_List)
+        self.demographic_List = list(demographic_List)
+
+        # Intern every theme and topic to an integer id
+        self.themeIds = {}
+        for comedian in self.comedian_List:
+            for theme in comedian.themes:
+                self.internTheme(theme)
+        for demographic in self.demographic_List:
+            for topic in demographic.topics:
+                self.internTheme(topic)
+
+        self.comedianIds = {}
+        self.comedianMasks = []
+        for comedian in self.comedian_List:
+            self.comedianIds[comedian] = len(self.comedianMasks)
+            self.comedianMasks.append(self.getMask(comedian.themes))
+
+        self.demographicIds = {}
+        self.demographicMasks = []
+        for demographic in self.demographic_List:
+            self.demographicIds[demographic] = len(self.demographicMasks)
+            self.demographicMasks.append(self.getMask(demographic.topics))
+
+        # Comedians with the same themes (and demographics with the same topics) are interchangeable in every search.
+        # comedianClasses[c] / demographicClasses[d] number these classes in order of first appearance
+        self.comedianClasses = self.classesOf(self.comedianMasks)
+        self.demographicClasses = self.classesOf(self.demographicMasks)
+
+        # mainShows[c] / testShows[c] are bitmasks over demographic ids that comedian c can market
+        # mainComedians[d] / testComedians[d] are bitmasks over comedian ids that can market demographic d
+        self.mainShows = [0] * len(self.comedian_List)
+        self.testShows = [0] * len(self.comedian_List)
+        self.mainComedians = [0] * len(self.demographic_List)
+        self.testComedians = [0] * len(self.demographic_List)
+        for c, themes in enumerate(self.comedianMasks):
+            for d, topics in enumerate(self.demographicMasks):
+                if topics & ~themes == 0:
+                    self.mainShows[c] |= 1 << d
+                    self.mainComedians[d] |= 1 << c
+                if topics & themes != 0:
+                    self.testShows[c] |= 1 << d
+                    self.testComedians[d] |= 1 << c
+
+        # Candidate lists keep the order of comedian_List, so searches that walk them try comedians in the same order as before
+        self.mainCandidates = []
+        self.testCandidates = []
+        self.mainCandidateIds = []
+        self.testCandidateIds = []
+        for d in range(len(self.demographic_List)):
+            self.mainCandidates.append(self.maskToComedians(self.mainComedians[d]))
+            self.testCandidates.append(self.maskToComedians(self.testComedians[d]))
+            self.mainCandidateIds.append(self.maskToIds(self.mainComedians[d]))
+            self.testCandidateIds.append(self.maskToIds(self.testComedians[d]))
+
+    def internTheme(self, theme):
+        if theme not in self.themeIds:
+            self.themeIds[theme] = len(self.themeIds)
+        return self.themeIds[theme]
+
+    # Numbers the distinct masks in order of first appearance, giving each entry the number of its mask
+    def classesOf(self, masks):
+        numbers = {}
+        return [numbers.setdefault(mask, len(numbers)) for mask in masks]
+
+    # Converts a list of themes/topics into a bitmask. Strings the index has never seen get no bit
+    def getMask(self, themes):
+        mask = 0
+        for theme in themes:
+            themeId = self.themeIds.get(theme)
+            if themeId is not None:
+                mask |= 1 << themeId
+        return mask
+
+    def maskToIds(self, mask):
+        ids = []
+        c = 0
+        while mask:
+            if mask & 1:
+                ids.append(c)
+            mask >>= 1
+            c += 1
+        return ids
+
+    def maskToComedians(self, mask):
+        return [self.comedian_List[c] for c in self.maskToIds(mask)]
+
+    def comedianId(self, comedian):
+        return self.comedianIds.get(comedian)
+
+    def demographicId(self, demographic):
+        return self.demographicIds.get(demographic)
+
+    # Same answer as Timetable.canMarket, but a table lookup for anything the index was built from
+    def canMarket(self, comedian, demographic, isTest):
+        c = self.comedianIds.get(comedian)
+        d = self.demographicIds.get(demographic)
+        if c is None or d is None:
+            return self.canMarketUnindexed(comedian, demographic, isTest)
+
+        if isTest:
+            return (self.testShows[c] >> d) & 1 == 1
+        return (self.mainShows[c] >> d) & 1 == 1
+
+    # Fallback for objects that weren't part of the problem the index was built for
+    def canMarketUnindexed(self, comedian, demographic, isTest):
+        if isTest:
+            return comedian.canDoTest(demographic)
+        return comedian.canDoMain(demographic)
+
+    # Returns the comedians (in comedian_List order) that can market the given show
+    def candidates(self, demographic, isTest):
+        d = self.demographicIds.get(demographic)
+        if d is None:
+            return [c for c in self.comedian_List if self.canMarketUnindexed(c, demographic, isTest)]
+        return self.testCandidates[d] if isTest else self.mainCandidates[d]
+
+    # Same as canMarket, for a comedian id and a demographic id
+    def canMarketIds(self, c, d, isTest):
+        if isTest:
+            return (self.testShows[c] >> d) & 1 == 1
+        return (self.mainShows[c] >> d) & 1 == 1
+
+    # The ids of the comedians (in comedian_List order) that can market demographic d's show
+    def candidateIds(self, d, isTest):
+        return self.testCandidateIds[d] if isTest else self.mainCandidateIds[d]
+
+    # Returns the candidates for the given show as a bitmask over comedian ids
+    def candidateMask(self, demographic, isTest):
+        d = self.demographicIds[demographic]
+        return self.testComedians[d] if isTest else self.mainComedians[d]
@@ -0,0 +1,259 @@
+import argparse
+import contextlib
+import io
+import random
+import sys
+import ReaderWriter
+import scheduler
+import timetable
+import costmodel
+import generator
+import problemspec
+
+#Checks that the fast checkers agree with Timetable.task23Checker, which stays the reference for them, on the example problems
+#and a few generated ones with other weeks, and on schedules made from their task 3 schedules with a few random changes each
+#(swapped, moved to the day of another show by the same comedian, changed, copied, flipped or emptied slots). Everything is
+#seeded, so every run checks the same schedules.
+#   python3 equivalence.py [--mutations N] [--seed S]
+#prints each disagreement it finds and a summary, and exits with status 1 if there were any.
+#   batch - batchchecker.BatchChecker.check: validity, the first constraint broken and the cost (skipped without NumPy)
+#   cost  - costmodel.CostModel against task23Checker's cost on every valid schedule, task23Checker against slotOrderCost below
+#           (the original checker's pricing) wherever the daily cap is 2 hours, and CostModel's swapDelta against pricing the
+#           swapped schedule from scratch
+#   specs - every timetable the task 1, 2 and 3 drivers return for generated problems in short or oddly capped weeks (see
+#           SOLVER_SPECS) passes scheduleChecker
+
+# The start of each message task23Checker prints, with the batchchecker violation code it goes with. %s is the daily cap
+MESSAGES = [
+    ["does not have every slot assigned", 1],
+    ["more than one main show", 2],
+    ["more than one test show", 3],
+    ["is already on stage for %s hours on", 4],
+    ["is already on stage for", 5],
+    ["can not be marketed", 6],
+    ["hours in a day", 7],
+]
+
+# The batchchecker violation code for the message task23Checker printed, or None if it isn't one of them
+def violationCode(output, spec):
+    for message, code in MESSAGES:
+        if "%s" in message:
+            message = message % problemspec.numberToWords(spec.dailyHours)
+        if message in output:
+            return code
+    return None
+
+# The example problems in the standard week, and generated ones in weeks with other dimensions and caps, as
+# [name, comedian_List, demographic_List, spec]
+def problems():
+    found = []
+    for p in range(1, 9):
+        rw = ReaderWriter.ReaderWriter()
+        [comedian_List, demographic_List] = rw.readRequirements("ExampleProblems/Problem" + str(p) + ".txt")
+        found.append(["Problem" + str(p), comedian_List, demographic_List, rw.spec])
+    specs = [problemspec.ProblemSpec(days=6, dailyHours=3, weeklyHours=5), problemspec.ProblemSpec(days=4, slotsPerDay=6)]
+    for seed, spec in enumerate(specs):
+        [comedian_List, demographic_List] = generator.generateProblem(seed, comedians=30, demographics=spec.slots() // 2)
+        found.append(["generated problem " + str(seed + 1), comedian_List, demographic_List, spec])
+    return found
+
+# A copy of a task 3 timeslots list ([demo, comedian, isTest] per slot) with up to 3 random changes. Empty slots are None
+def mutate(rng, timeslots, comedian_List, demographic_List, spec):
+    slots = [list(slot) for slot in timeslots]
+    for m in range(rng.choice([0, 1, 1, 2, 3])):
+        r = rng.random()
+        i = rng.randrange(len(slots))
+        j = rng.randrange(len(slots))
+        if r < 0.3:
+            slots[i], slots[j] = slots[j], slots[i]
+        elif r < 0.4:
+            # Moves show j to any slot of the day of another show by the same comedian, so they do two shows that day in
+            # either order. The solvers never plan a main and a test on one day, so only this makes such days
+            same = [k for k in range(len(slots)) if slots[j] is not None and slots[k] is not None and slots[k][1] == slots[j][1] and k // spec.slotsPerDay != j // spec.slotsPerDay]
+            if same:
+                day = rng.choice(same) // spec.slotsPerDay
+                k = rng.randrange(day * spec.slotsPerDay, (day + 1) * spec.slotsPerDay)
+                slots[j], slots[k] = slots[k], slots[j]
+        elif slots[i] is None or slots[j] is None:
+            continue
+        elif r < 0.6:
+            slots[i][1] = rng.choice(comedian_List)
+        elif r < 0.75:
+            slots[i] = list(slots[j])
+        elif r < 0.85:
+            slots[i][2] = not slots[i][2]
+        elif r < 0.95:
+            slots[i] = None
+        else:
+            slots[i][0] = rng.choice(demographic_List)
+    return slots
+
+def toTimetable(slots, spec):
+    tt = timetable.Timetable(3, spec)
+    days = spec.dayNames()
+    for i, slot in enumerate(slots):
+        if slot is not None:
+            tt.addSession(days[i // spec.slotsPerDay], i % spec.slotsPerDay + 1, slot[1], slot[0], "test" if slot[2] else "main")
+    return tt
+
+# Runs task23Checker on a schedule. Returns [valid, violation code, cost]
+def referenceCheck(slots, comedian_List, demographic_List, spec):
+    tt = toTimetable(slots, spec)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        valid = tt.scheduleChecker(comedian_List, demographic_List)
+    if valid:
+        return [True, 0, tt.cost]
+    return [False, violationCode(output.getvalue(), spec), None]
+
+# The cost of a valid schedule priced slot by slot with the original task23Checker's rules, before daily caps above 2 hours
+def slotOrderCost(slots, spec):
+    cost = 0
+    mainCount = {}
+    testCount = {}
+    yesterday = set()
+    for day in range(spec.days):
+        today = set()
+        discount = {}
+        for slot in slots[day * spec.slotsPerDay:(day + 1) * spec.slotsPerDay]:
+            [demographic, comedian, isTest] = slot
+            if not isTest:
+                mainCount[comedian] = mainCount.get(comedian, 0) + 1
+                if mainCount[comedian] == 1:
+                    cost += 500
+                elif comedian in yesterday:
+                    cost += 100
+                else:
+                    cost += 300
+            else:
+                testCount[comedian] = testCount.get(comedian, 0) + 1
+                testCost = 300 - 50 * testCount[comedian]
+                if comedian in today:
+                    cost += testCost // 2 - discount.pop(comedian, 0)
+                else:
+                    cost += testCost
+                    discount[comedian] = testCost // 2
+            today.add(comedian)
+        yesterday = today
+    return cost
+
+def pricedModel(slots, spec):
+    costModel = costmodel.CostModel(spec.days, spec.dailyHours, spec.weeklyHours)
+    for i, slot in enumerate(slots):
+        if slot is not None:
+            costModel.place(slot[1], spec.getDay(i), slot[2])
+    return costModel
+
+# Compares CostModel with task23Checker on the valid schedules, task23Checker with slotOrderCost on them if the daily cap is
+# 2 hours, and CostModel's swapDelta for a random pair of slots of each schedule with pricing the swapped schedule from scratch.
+# Returns the number of disagreements
+def checkCosts(name, comedian_List, demographic_List, spec, schedules, rng):
+    failures = 0
+    for n, slots in enumerate(schedules):
+        costModel = pricedModel(slots, spec)
+        [valid, violation, cost] = referenceCheck(slots, comedian_List, demographic_List, spec)
+        if valid and costModel.cost != cost:
+            failures += 1
+            print(name + ", schedule " + str(n) + ": CostModel gives " + str(costModel.cost) + ", task23Checker " + str(cost))
+        if valid and spec.dailyHours == 2 and cost != slotOrderCost(slots, spec):
+            failures += 1
+            print(name + ", schedule " + str(n) + ": task23Checker gives " + str(cost) + ", the original pricing " + str(slotOrderCost(slots, spec)))
+
+        i = rng.randrange(len(slots))
+        j = rng.randrange(len(slots))
+        if slots[i] is None or slots[j] is None:
+            continue
+        delta = costModel.swapDelta(slots[i][1], spec.getDay(i), slots[i][2], slots[j][1], spec.getDay(j), slots[j][2])
+        swapped = list(slots)
+        swapped[i], swapped[j] = swapped[j], swapped[i]
+        if costModel.cost + delta != pricedModel(swapped, spec).cost:
+            failures += 1
+            print(name + ", schedule " + str(n) + ": swapping slots " + str(i) + " and " + str(j) + " changes the cost by " + str(pricedModel(swapped, spec).cost - costModel.cost) + ", not " + str(delta))
+    return failures
+
+# Weeks whose dimensions and caps the drivers' shortcuts don't fit, e.g. more mains or shows per comedian than there are days
+SOLVER_SPECS = [
+    problemspec.ProblemSpec(days=3, mainSlotsPerDay=5, slotsPerDay=6, dailyHours=4, weeklyHours=8),
+    problemspec.ProblemSpec(days=2, mainSlotsPerDay=4, slotsPerDay=8),
+    problemspec.ProblemSpec(days=1, mainSlotsPerDay=6, slotsPerDay=10),
+    problemspec.ProblemSpec(days=4, mainSlotsPerDay=5, slotsPerDay=6, dailyHours=3, weeklyHours=5),
+    problemspec.ProblemSpec(days=6, mainSlotsPerDay=3, slotsPerDay=6, dailyHours=1),
+]
+
+# Runs every driver on generated problems for each of SOLVER_SPECS, and checks whatever timetable it returns.
+# Returns [timetables checked, the number the checker rejected]
+def checkSolvers(problemsPerSpec):
+    checked = 0
+    failures = 0
+    drivers = [[1, "backtrack"], [1, "matching"], [2, "heuristic"], [2, "forwardchecking"], [3, "heuristic"]]
+    for spec in SOLVER_SPECS:
+        for seed in range(problemsPerSpec):
+            for [task, mode] in drivers:
+                demographics = spec.mainSlots() if task == 1 else spec.slots() // 2
+                [comedian_List, demographic_List] = generator.generateProblem(seed, comedians=max(4, demographics), demographics=demographics, themes=8, themesPerComedian=4)
+                sch = scheduler.Scheduler(comedian_List, demographic_List, spec)
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    tt = [sch.createSchedule, sch.createTestShowSchedule, sch.createMinCostSchedule][task - 1](mode)
+                    valid = tt == False or tt.scheduleChecker(comedian_List, demographic_List)
+                if tt == False:
+                    continue
+                checked += 1
+                if not valid:
+                    failures += 1
+                    print(str(spec) + ", problem " + str(seed) + ": task " + str(task) + " (" + mode + ") gave a timetable the checker rejects: " + output.getvalue().strip().split("\n")[-1])
+    return [checked, failures]
+
+# Compares BatchChecker.check with task23Checker on every schedule. Returns the number of disagreements, or None without NumPy
+def checkBatch(name, comedian_List, demographic_List, spec, schedules):
+    try:
+        import batchchecker
+    except ImportError:
+        return None
+    checker = batchchecker.BatchChecker(comedian_List, demographic_List, spec)
+    [valid, violations, costs] = checker.check(checker.encodeTimeslots(schedules))
+    failures = 0
+    for n, slots in enumerate(schedules):
+        [expectedValid, expectedViolation, expectedCost] = referenceCheck(slots, comedian_List, demographic_List, spec)
+        got = [bool(valid[n]), int(violations[n]), int(costs[n]) if expectedValid else None]
+        if got != [expectedValid, expectedViolation, expectedCost]:
+            failures += 1
+            print(name + ", schedule " + str(n) + ": batchchecker gives " + str(got) + ", task23Checker " + str([expectedValid, expectedViolation, expectedCost]))
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the fast checkers and the cost model against the reference ones")
+    parser.add_argument("--mutations", type=int, default=100, help="changed schedules to check per problem")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spec-problems", type=int, default=4, help="generated problems to solve per week in SOLVER_SPECS")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    checked = 0
+    failures = 0
+    skipped = False
+    for [name, comedian_List, demographic_List, spec] in problems():
+        sch = scheduler.Scheduler(comedian_List, demographic_List, spec)
+        with contextlib.redirect_stdout(io.StringIO()):
+            timeslots = sch.findMinCostTimeslots()
+        if timeslots == False:
+            continue
+        schedules = [timeslots] + [mutate(rng, timeslots, comedian_List, demographic_List, spec) for m in range(args.mutations)]
+
+        batchFailures = checkBatch(name, comedian_List, demographic_List, spec, schedules)
+        if batchFailures is None:
+            skipped = True
+        else:
+            failures += batchFailures
+        failures += checkCosts(name, comedian_List, demographic_List, spec, schedules, rng)
+        checked += len(schedules)
+
+    [timetables, solverFailures] = checkSolvers(args.spec_problems)
+    checked += timetables
+    failures += solverFailures
+
+    if skipped:
+        print("NumPy isn't installed, so only the cost model was checked")
+    print(str(checked) + " schedules checked, " + str(failures) + " failures")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import time
+import matching
+import lowerbound
+import dayassignment
+
+#An exact solver for Task 3, that returns a provably cheapest schedule under the cost model in Timetable.task23Checker
+#
+#The cost of a schedule is the sum of each comedian's own cost, and a comedian's cost only depends on their "day pattern":
+#which days of the week they do a main, a test, or two tests on. It doesn't depend on which demographics the shows are for.
+#So the search is split into three levels, each a branch and bound:
+# 1) Give each demographic's main to a comedian. With k different comedians doing mains, the mains cost at least 100 * demos + 400 * k,
+#    and the comedians left over bound the cost of the tests, so a lower bound on k gives a lower bound on the whole schedule
+#    (this is the bound in lowerbound.py, which is the bound at the root).
+# 2) With the mains fixed, pick how many tests each comedian does, checking with max-flow that the tests can still be matched to demographics.
+#    Each (mains, tests) type has a cheapest day pattern, and a DP over the remaining comedians bounds the rest of the tests.
+# 3) With every comedian's type fixed, pick a day pattern for each of them, so that no day has more shows than slots.
+#    This is a memoised search over how full each day is (see dayassignment.py).
+
+class ExactSolver:
+
+    # The number of days and slots per day come from the scheduler's spec (see problemspec.py), which has to have the standard hour caps
+    def __init__(self, scheduler):
+        self.index = scheduler.index
+        self.comedian_List = scheduler.comedian_List
+        self.demographic_List = scheduler.demographic_List
+        self.days = scheduler.spec.days
+        self.slotsPerDay = scheduler.spec.slotsPerDay
+        self.patterns = lowerbound.dayPatterns(self.days, scheduler.spec.weeklyHours)
+        self.dayAssignment = dayassignment.DayAssignment(self.patterns, self.days, self.slotsPerDay)
+
+        # Results of the last solve
+        self.cost = None
+        self.lowerBound = None
+        self.gap = None
+        self.optimal = False
+        self.nodes = 0
+
+    # Finds the cheapest schedule. Stops after timeLimit seconds if one is given, returning the best schedule found so far.
+    # incumbent is an optional [cost, timeslots] that is already known, e.g. from createMinCostSchedule, to prune with.
+    # With a gapTarget (e.g. 0.01), the search also prunes anything that can't beat the best schedule by more than that
+    # fraction of its cost, so it stops as soon as the gap is within the target
+    # Returns a list of timeslots (the same format as Scheduler.findMinCostTimeslots), or False if no schedule was found
+    def solve(self, timeLimit=None, incumbent=None, gapTarget=None):
+        self.deadline = None if timeLimit is None else time.time() + timeLimit
+        self.gapTarget = gapTarget
+        self.timedOut = False
+        self.nodes = 0
+        self.bestCost = float("inf")
+        self.bestTimeslots = None
+        if incumbent is not None:
+            self.bestCost = incumbent[0]
+            self.bestTimeslots = incumbent[1]
+
+        demoCount = len(self.demographic_List)
+        comedianCount = len(self.comedian_List)
+        self.mainCandidates = []
+        self.testCandidates = []
+        for demo in self.demographic_List:
+            self.mainCandidates.append([self.index.comedianId(c) for c in self.index.candidates(demo, False)])
+            self.testCandidates.append([self.index.comedianId(c) for c in self.index.candidates(demo, True)])
+        self.maxTests = [min(4, bin(self.index.testShows[c]).count("1")) for c in range(comedianCount)]
+
+        # Demographics with the fewest comedians able to do their main go first
+        self.demoOrder = sorted(range(demoCount), key = lambda d: len(self.mainCandidates[d]))
+        self.mainCounts = [0] * comedianCount
+        self.mainAssignment = [None] * demoCount
+        self.seenMains = set()
+        self.mainBound = lowerbound.mainBounds(self.patterns, demoCount, comedianCount)
+
+        unresolved = self.searchMains(0, 0)
+
+        if self.bestTimeslots is None:
+            self.cost = None
+            self.lowerBound = unresolved
+            self.gap = None
+            self.optimal = False
+            return False
+
+        self.cost = self.bestCost
+        self.lowerBound = min(unresolved, self.bestCost)
+        self.gap = lowerbound.gap(self.cost, self.lowerBound)
+        self.optimal = self.lowerBound >= self.cost
+        return self.bestTimeslots
+
+    def checkTime(self):
+        if self.deadline is not None and time.time() > self.deadline:
+            self.timedOut = True
+        return self.timedOut
+
+    # A subtree whose bound is at least this can't beat the best schedule by more than the gap target, so isn't searched.
+    # Its bound still counts towards the lower bound, unless it can't beat the best schedule at all
+    def cutoff(self):
+        if self.gapTarget is None:
+            return self.bestCost
+        return self.bestCost * (1 - self.gapTarget)
+
+    # A lower bound on how many more comedians have to start doing mains, to cover demoOrder[i:]
+    # Returns None if those mains can't be covered at all
+    def newMainComedians(self, i):
+        return lowerbound.newMainComedians([self.mainCandidates[d] for d in self.demoOrder[i:]], self.mainCounts)
+
+    # Level 1: branch and bound over which comedian does each demographic's main
+    # Returns the smallest lower bound of any part of this subtree that wasn't explored (inf if all of it was)
+    def searchMains(self, i, used):
+        self.nodes += 1
+        if i == len(self.demoOrder):
+            # Many main assignments give the same number of mains per comedian, and the rest of the search only depends on that
+            key = tuple(self.mainCounts)
+            if key in self.seenMains:
+                return float("inf")
+            self.seenMains.add(key)
+            return self.searchTests()
+
+        extra = self.newMainComedians(i)
+        if extra is None:
+            return float("inf")
+        bound = self.mainBound[min(used + extra, len(self.mainBound) - 1)]
+        if bound >= self.bestCost:
+            return float("inf")
+        if bound >= self.cutoff() or self.checkTime():
+            return bound
+
+        # Prefer comedians who already do a main, so they end up doing two
+        d = self.demoOrder[i]
+        children = [c for c in self.mainCandidates[d] if self.mainCounts[c] < 2]
+        children.sort(key = lambda c: -self.mainCounts[c])
+
+        unresolved = float("inf")
+        for c in children:
+            if self.checkTime():
+                unresolved = min(unresolved, bound)
+                break
+            self.mainCounts[c] += 1
+            self.mainAssignment[d] = c
+            unresolved = min(unresolved, self.searchMains(i + 1, used + (1 if self.mainCounts[c] == 1 else 0)))
+            self.mainCounts[c] -= 1
+            self.mainAssignment[d] = None
+            if bound >= self.bestCost:
+                break
+            if bound >= self.cutoff():
+                unresolved = min(unresolved, bound)
+                break
+
+        return unresolved
+
+    # Level 2: with the mains fixed, branch and bound over how many tests each comedian does
+    def searchTests(self):
+        inf = float("inf")
+        demoCount = len(self.demographic_List)
+        comedianCount = len(self.comedian_List)
+
+        # Comedians with the most freedom go first
+        self.testOrder = sorted(range(comedianCount), key = lambda c: (self.mainCounts[c], -self.maxTests[c]))
+        self.testOptions = []
+        for c in self.testOrder:
+            options = []
+            hours = 4 - 2 * self.mainCounts[c]
+            for t in range(min(hours, self.maxTests[c]) + 1):
+                options.append([self.patterns[(self.mainCounts[c], t)][0][0], t])
+            self.testOptions.append(options)
+
+        # relaxation[k][t] is the cheapest way for testOrder[k:] to do exactly t tests, ignoring which demographics they can market
+        self.relaxation = [None] * (comedianCount + 1)
+        last = [0] + [inf] * demoCount
+        self.relaxation[comedianCount] = last
+        for k in range(comedianCount - 1, -1, -1):
+            row = [inf] * (demoCount + 1)
+            for t in range(demoCount + 1):
+                for cost, tests in self.testOptions[k]:
+                    if tests <= t and cost + last[t - tests] < row[t]:
+                        row[t] = cost + last[t - tests]
+            self.relaxation[k] = row
+            last = row
+
+        self.testCaps = [0] * comedianCount
+        for k in range(comedianCount):
+            self.testCaps[self.testOrder[k]] = self.testOptions[k][-1][1]
+        self.types = [None] * comedianCount
+        if matching.matchShows(self.testCandidates, self.testCaps)[0] is None:
+            return inf
+        return self.searchTestCounts(0, demoCount, 0)
+
+    def searchTestCounts(self, k, testsLeft, cost):
+        self.nodes += 1
+        if k == len(self.testOrder):
+            self.evaluateLeaf()
+            return float("inf")
+
+        c = self.testOrder[k]
+        children = []
+        for typeCost, tests in self.testOptions[k]:
+            if tests <= testsLeft:
+                bound = cost + typeCost + self.relaxation[k + 1][testsLeft - tests]
+                if bound != float("inf"):
+                    children.append([bound, typeCost, tests])
+        children.sort()
+
+        unresolved = float("inf")
+        for bound, typeCost, tests in children:
+            if bound >= self.bestCost:
+                break
+            if bound >= self.cutoff() or self.checkTime():
+                unresolved = min(unresolved, bound)
+                break
+
+            # Fix this comedian's tests, and check every decided comedian can still do exactly their tests
+            maxTests = self.testCaps[c]
+            self.testCaps[c] = tests
+            self.types[c] = (self.mainCounts[c], tests)
+            decided = self.testOrder[:k + 1]
+            if tests == maxTests == 0 or matching.matchShows(self.testCandidates, self.testCaps, decided)[0] is not None:
+                unresolved = min(unresolved, self.searchTestCounts(k + 1, testsLeft - tests, cost + typeCost))
+            self.types[c] = None
+            self.testCaps[c] = maxTests
+
+        return unresolved
+
+    # Level 3: every comedian has a type, and the demographics can be matched. Find the cheapest days for those types
+    def evaluateLeaf(self):
+        working = [[c, self.types[c]] for c in self.testOrder if self.types[c] != (0, 0)]
+        cost = self.dayAssignment.solve(working, self.bestCost)
+        if cost is None:
+            return
+
+        # Hand out the matched demographics to each comedian's days
+        testMatches = matching.matchShows(self.testCandidates, self.testCaps)[0]
+        mains = {}
+        tests = {}
+        for d in range(len(self.demographic_List)):
+            mains.setdefault(self.mainAssignment[d], []).append(self.demographic_List[d])
+            tests.setdefault(testMatches[d], []).append(self.demographic_List[d])
+
+        timeslots = []
+        for day in self.dayAssignment.week():
+            for c, isTest in day:
+                timeslots.append([(tests if isTest else mains)[c].pop(), self.comedian_List[c], isTest])
+        self.bestCost = cost
+        self.bestTimeslots = timeslots
@@ -0,0 +1,77 @@
+import glob
+import os
+import random
+import sys
+import tempfile
+import comedian
+import demographic
+import ReaderWriter
+
+#Makes random problems in the same format as the ones in ExampleProblems, for benchmarking and testing
+#Every problem is fixed by its seed and settings:
+#   comedians            - roster size
+#   tightness            - if given, the roster size is instead picked so the shows need this fraction of the comedians' hours
+#                          (3 hours per demographic, 4 per comedian), so values close to 1 make problems that are hard or impossible
+#   themes               - how many themes there are in total
+#   themesPerComedian    - how many themes each comedian has. The higher this is compared to themes, the more the comedians overlap,
+#                          and the more comedians can market each show
+#   topicsPerDemographic - how many topics each demographic has
+#Each demographic takes its topics from a random comedian's themes, so every main has at least one comedian who can market it
+
+def generateProblem(seed=0, comedians=30, demographics=25, themes=15, themesPerComedian=3, topicsPerDemographic=2, tightness=None):
+    rng = random.Random(seed)
+    if tightness is not None:
+        comedians = max(1, round(3 * demographics / (4 * tightness)))
+    themeNames = ["Theme " + str(t + 1) for t in range(themes)]
+
+    comedian_List = []
+    for c in range(comedians):
+        comedian_List.append(comedian.Comedian(name="Comedian " + str(c + 1), themes=rng.sample(themeNames, min(themesPerComedian, themes))))
+
+    demographic_List = []
+    references = set()
+    for d in range(demographics):
+        # References look like the ones in the example problems, two letters and three digits
+        reference = None
+        while reference is None or reference in references:
+            reference = rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") + rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") + str(rng.randrange(100, 1000))
+        references.add(reference)
+        themesToUse = rng.choice(comedian_List).themes
+        demographic_List.append(demographic.Demographic(reference=reference, topics=rng.sample(themesToUse, min(topicsPerDemographic, len(themesToUse)))))
+
+    return [comedian_List, demographic_List]
+
+# Generates a problem and writes it to filename, replacing anything already there (writeRequirements appends)
+# If a spec (see problemspec.py) is given it is written to the file too, and unless told otherwise there are
+# as many demographics as the spec's week has room for in tasks 2 and 3
+def writeProblem(filename, seed=0, spec=None, **settings):
+    if spec is not None and "demographics" not in settings:
+        settings["demographics"] = spec.slots() // 2
+    [comedian_List, demographic_List] = generateProblem(seed, **settings)
+    if os.path.exists(filename):
+        os.remove(filename)
+    ReaderWriter.ReaderWriter().writeRequirements(comedian_List, demographic_List, filename, spec)
+    return [comedian_List, demographic_List]
+
+# Reads every problem file pattern matches, in name order, then makes generate problems with seeds from seed on (and any
+# settings for generateProblem), and returns them all as [name, comedian_List, demographic_List, spec]
+def readProblems(pattern, generate=0, seed=0, **settings):
+    problems = []
+    for filename in sorted(glob.glob(pattern)):
+        rw = ReaderWriter.ReaderWriter()
+        problems.append([os.path.basename(filename)] + rw.readRequirements(filename) + [rw.spec])
+
+    # Generated problems go through writeRequirements and readRequirements, just like the example problems
+    with tempfile.TemporaryDirectory() as directory:
+        for s in range(seed, seed + generate):
+            filename = os.path.join(directory, "generated" + str(s) + ".txt")
+            writeProblem(filename, s, **settings)
+            rw = ReaderWriter.ReaderWriter()
+            problems.append(["generated-" + str(s)] + rw.readRequirements(filename) + [rw.spec])
+    return problems
+
+# python generator.py <filename> [seed] [comedians]
+if __name__ == "__main__":
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    comedians = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    writeProblem(sys.argv[1], seed, comedians=comedians)
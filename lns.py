@@ -0,0 +1,144 @@
+import random
+import time
+from array import array
+import compactstate
+import costmodel
+import dayassignment
+import lowerbound
+import repair
+
+#Large neighbourhood search for Task 3, with the pairing and the days both free.
+#createMinCostSchedule fixes every show's comedian before it looks at the days, so whether a comedian ends up with two mains or
+#with four tests is decided without the prices. Starting from a filled list of timeslots (as produced by
+#Scheduler.findMinCostTimeslots), this keeps tearing part of the week down and building it back up:
+#   destroy - take out every show of a few random comedians, or every show on one random day
+#   repair  - give each show that was taken out a comedian and a day with a free slot, cheapest first against the shows that
+#             were kept, with ties broken at random (search.RepairProblem, as in repair.py, which backtracks if it gets stuck)
+#   polish  - with the standard daily cap, give the new pairing its cheapest days (see dayassignment.py), unless that takes more
+#             than polishNodes nodes or the time runs out, in which case the week keeps the days the repair gave it
+#A rebuilt week is priced exactly with a costmodel.CostModel, and replaces the current one if it costs no more (so the search
+#can drift across weeks of equal cost). Each new best week is handed to onImprove as it is found.
+class LNS:
+
+    # nodeLimit caps each repair search, and polishNodes each day assignment. Neighbourhoods free between minComedians and
+    # maxComedians comedians' shows
+    def __init__(self, scheduler, timeslots, seed=None, nodeLimit=2000, minComedians=2, maxComedians=4, polishNodes=50000):
+        self.scheduler = scheduler
+        self.index = scheduler.index
+        self.spec = scheduler.spec
+        self.random = random.Random(seed)
+        self.repair = repair.Repair(scheduler, None, nodeLimit)
+        self.minComedians = minComedians
+        self.maxComedians = maxComedians
+        self.polish = None
+        self.polishNodes = polishNodes
+        self.deadline = None
+        if self.spec.dailyHours == 2:
+            self.polish = dayassignment.DayAssignment(lowerbound.dayPatterns(self.spec.days, self.spec.weeklyHours), self.spec.days, self.spec.slotsPerDay)
+
+        self.timeslots = array("l", [compactstate.packAssignment(self.index, slot) for slot in timeslots])
+        self.cost = self.price(self.timeslots)
+        self.bestCost = self.cost
+        self.bestTimeslots = self.toObjects(self.timeslots)
+        self.iterations = 0
+        self.accepted = 0
+        self.improvements = 0
+
+    def toObjects(self, timeslots):
+        return [compactstate.unpackShow(self.index, show) for show in timeslots]
+
+    def price(self, timeslots):
+        costModel = costmodel.CostModel(self.spec.days, self.spec.dailyHours, self.spec.weeklyHours)
+        for i, show in enumerate(timeslots):
+            costModel.place(compactstate.showComedian(show), self.spec.getDay(i), compactstate.showIsTest(show))
+        return costModel.cost
+
+    # Takes a neighbourhood out of a copy of the timeslots. Returns [timeslots, comedians whose shows are all freed]
+    def destroy(self):
+        timeslots = array("l", self.timeslots)
+        if self.random.random() < 0.25:
+            day = self.random.randrange(self.spec.days)
+            for i in range(day * self.spec.slotsPerDay, (day + 1) * self.spec.slotsPerDay):
+                timeslots[i] = compactstate.EMPTY
+            return [timeslots, set()]
+
+        working = sorted(set(compactstate.showComedian(show) for show in timeslots))
+        count = min(len(working), self.random.randint(self.minComedians, self.maxComedians))
+        return [timeslots, set(self.random.sample(working, count))]
+
+    # Gives the pairing in the timeslots its cheapest days, in place, if they cost less than budget. Returns their cost or None
+    def polishDays(self, timeslots, budget):
+        mains = {}
+        tests = {}
+        for show in timeslots:
+            (tests if compactstate.showIsTest(show) else mains).setdefault(compactstate.showComedian(show), []).append(show)
+        types = [[c, (len(mains.get(c, [])), len(tests.get(c, [])))] for c in sorted(set(mains) | set(tests))]
+        if self.polish.solve(types, budget, self.polishNodes, self.outOfTime) is None:
+            return None
+        for day, dayShows in enumerate(self.polish.week()):
+            for session, [c, isTest] in enumerate(dayShows):
+                timeslots[day * self.spec.slotsPerDay + session] = (tests if isTest else mains)[c].pop()
+        return self.polish.cost
+
+    # Has the time given to run passed, or has the scheduler's shouldStop said to stop?
+    def outOfTime(self):
+        if self.deadline is not None and time.time() >= self.deadline:
+            return True
+        return self.scheduler.shouldStop is not None and self.scheduler.shouldStop()
+
+    # One destroy and repair. Returns True if the week it built was accepted
+    def step(self):
+        [timeslots, freedComedians] = self.destroy()
+        timeslots = self.repair.searchNeighbourhood(timeslots, freedComedians)
+        if timeslots is None:
+            return False
+        cost = self.price(timeslots)
+        # Only days that would get the week accepted are worth looking for
+        if self.polish is not None:
+            polished = self.polishDays(timeslots, min(cost, self.cost + 1))
+            if polished is not None:
+                cost = polished
+        if cost > self.cost:
+            return False
+        self.timeslots = timeslots
+        self.cost = cost
+        return True
+
+    # Runs until timeLimit seconds or iterations rebuilds have passed (whichever comes first), until the scheduler's
+    # shouldStop says so, and returns the best timeslots found. At least one of timeLimit and
+    # iterations should be given. onImprove(cost, timeslots) is called with every new best week, and with stopAt the
+    # search stops as soon as the best cost is at most stopAt
+    def run(self, timeLimit=None, iterations=None, onImprove=None, stopAt=None):
+        sch = self.scheduler
+        start = time.time()
+        self.deadline = None if timeLimit is None else start + timeLimit
+        done = 0
+        # The repair searches break ties with our random numbers
+        tieBreaker = sch.tieBreaker
+        sch.tieBreaker = self.random
+        try:
+            while True:
+                if iterations is not None and done >= iterations:
+                    break
+                if timeLimit is None and iterations is None:
+                    break
+                if stopAt is not None and self.bestCost <= stopAt:
+                    break
+                if self.outOfTime():
+                    break
+
+                done += 1
+                self.iterations += 1
+                if not self.step():
+                    continue
+                self.accepted += 1
+                if self.cost < self.bestCost:
+                    self.bestCost = self.cost
+                    self.bestTimeslots = self.toObjects(self.timeslots)
+                    self.improvements += 1
+                    if onImprove is not None:
+                        onImprove(self.bestCost, self.bestTimeslots)
+        finally:
+            sch.tieBreaker = tieBreaker
+
+        return self.bestTimeslots
@@ -0,0 +1,157 @@
+import math
+import random
+import time
+import costmodel
+
+#Anytime improvement stage for Task 3, using simulated annealing
+#It starts from a filled list of timeslots (as produced by Scheduler.findMinCostTimeslots) and keeps making small moves:
+# - swapping two timeslots on different days
+# - giving a show to a different comedian who can market it, or exchanging the comedians of two shows
+# - exchanging two whole days
+#Every move is a short list of CostModel changes, so its cost is evaluated incrementally rather than with a full Timetable.task23Checker pass.
+class LocalSearch:
+
+    # The number of days, slots per day and the hour caps come from the scheduler's spec (see problemspec.py)
+    def __init__(self, scheduler, timeslots, seed=None):
+        self.scheduler = scheduler
+        self.index = scheduler.index
+        self.days = scheduler.spec.days
+        self.slotsPerDay = scheduler.spec.slotsPerDay
+        self.random = random.Random(seed)
+        # The moves work on [demographic id, comedian id, isTest] (the ids from eligibility.py), and are turned back into objects by toObjects
+        self.timeslots = [[self.index.demographicId(demo), self.index.comedianId(comedian), isTest] for demo, comedian, isTest in timeslots]
+
+        self.costModel = costmodel.CostModel(self.days, scheduler.spec.dailyHours, scheduler.spec.weeklyHours)
+        for i, [demo, comedian, isTest] in enumerate(self.timeslots):
+            self.costModel.place(comedian, i // self.slotsPerDay, isTest)
+        self.cost = self.costModel.cost
+
+        self.bestCost = self.cost
+        self.bestTimeslots = self.toObjects(self.timeslots)
+        self.iterations = 0
+        self.improvements = 0
+
+    def toObjects(self, timeslots):
+        return [[self.index.demographic_List[d], self.index.comedian_List[c], isTest] for d, c, isTest in timeslots]
+
+    # Hands shows to other comedians. changes is a list of [slot, newComedian]
+    def reassign(self, changes):
+        for i, comedian in changes:
+            self.timeslots[i][1] = comedian
+
+    def swapSlots(self, i, j):
+        self.timeslots[i], self.timeslots[j] = self.timeslots[j], self.timeslots[i]
+
+    def swapDays(self, d1, d2):
+        for s in range(self.slotsPerDay):
+            self.swapSlots(d1 * self.slotsPerDay + s, d2 * self.slotsPerDay + s)
+
+    # The cost model changes that moving slot i's show to slot j's day, and slot j's show to slot i's day, would make
+    def slotSwapChanges(self, i, j):
+        [demoI, comedianI, testI] = self.timeslots[i]
+        [demoJ, comedianJ, testJ] = self.timeslots[j]
+        return self.costModel.swapChanges(comedianI, i // self.slotsPerDay, testI, comedianJ, j // self.slotsPerDay, testJ)
+
+    # Picks a random move. Returns [comedians it touches, cost model changes, a function that rewrites the timeslots if it's accepted], or None
+    def randomMove(self):
+        r = self.random.random()
+        total = self.days * self.slotsPerDay
+
+        if r < 0.4:
+            i = self.random.randrange(total)
+            j = self.random.randrange(total)
+            if i // self.slotsPerDay == j // self.slotsPerDay:
+                return None
+            touched = {self.timeslots[i][1], self.timeslots[j][1]}
+            return [touched, self.slotSwapChanges(i, j), lambda: self.swapSlots(i, j)]
+
+        if r < 0.65:
+            i = self.random.randrange(total)
+            [demo, comedian, isTest] = self.timeslots[i]
+            candidates = self.index.candidateIds(demo, isTest)
+            newComedian = candidates[self.random.randrange(len(candidates))]
+            if newComedian == comedian:
+                return None
+            day = i // self.slotsPerDay
+            changes = [[comedian, day, isTest, -1], [newComedian, day, isTest, 1]]
+            return [{comedian, newComedian}, changes, lambda: self.reassign([[i, newComedian]])]
+
+        if r < 0.9:
+            i = self.random.randrange(total)
+            j = self.random.randrange(total)
+            [demoI, comedianI, testI] = self.timeslots[i]
+            [demoJ, comedianJ, testJ] = self.timeslots[j]
+            if comedianI == comedianJ:
+                return None
+            if not self.index.canMarketIds(comedianJ, demoI, testI) or not self.index.canMarketIds(comedianI, demoJ, testJ):
+                return None
+            dayI = i // self.slotsPerDay
+            dayJ = j // self.slotsPerDay
+            changes = [[comedianI, dayI, testI, -1], [comedianJ, dayJ, testJ, -1], [comedianJ, dayI, testI, 1], [comedianI, dayJ, testJ, 1]]
+            return [{comedianI, comedianJ}, changes, lambda: self.reassign([[i, comedianJ], [j, comedianI]])]
+
+        d1 = self.random.randrange(self.days)
+        d2 = self.random.randrange(self.days)
+        if d1 == d2:
+            return None
+        touched = set()
+        changes = []
+        for s in range(self.slotsPerDay):
+            touched.add(self.timeslots[d1 * self.slotsPerDay + s][1])
+            touched.add(self.timeslots[d2 * self.slotsPerDay + s][1])
+            changes += self.slotSwapChanges(d1 * self.slotsPerDay + s, d2 * self.slotsPerDay + s)
+        return [touched, changes, lambda: self.swapDays(d1, d2)]
+
+    # Runs until timeLimit seconds or iterations moves have passed (whichever comes first), and returns the best timeslots
+    # found. At least one of timeLimit and iterations should be given.
+    # If stopAt is given, it also stops as soon as the best cost is at most stopAt, and it always stops once the scheduler's
+    # shouldStop says so (e.g. at a batch's time limit)
+    def run(self, timeLimit=None, iterations=None, startTemperature=200.0, endTemperature=1.0, onImprove=None, stopAt=None):
+        start = time.time()
+        done = 0
+        while True:
+            if stopAt is not None and self.bestCost <= stopAt:
+                break
+            if iterations is not None and done >= iterations:
+                break
+            elapsed = time.time() - start
+            if timeLimit is not None and elapsed >= timeLimit:
+                break
+            if timeLimit is None and iterations is None:
+                break
+            if self.scheduler.shouldStop is not None and self.scheduler.shouldStop():
+                break
+
+            # Cool down geometrically over whichever budget runs out first
+            progress = 0.0
+            if timeLimit is not None and timeLimit > 0:
+                progress = elapsed / timeLimit
+            if iterations is not None:
+                progress = max(progress, done / iterations)
+            temperature = startTemperature * (endTemperature / startTemperature) ** progress
+
+            done += 1
+            self.iterations += 1
+            move = self.randomMove()
+            if move is None:
+                continue
+            [touched, changes, rewrite] = move
+
+            delta = self.costModel.apply(changes)
+            if not all(self.costModel.isValid(c) for c in touched):
+                self.costModel.undo(changes)
+                continue
+
+            if delta <= 0 or self.random.random() < math.exp(-delta / temperature):
+                rewrite()
+                self.cost += delta
+                if self.cost < self.bestCost:
+                    self.bestCost = self.cost
+                    self.bestTimeslots = self.toObjects(self.timeslots)
+                    self.improvements += 1
+                    if onImprove is not None:
+                        onImprove(self.bestCost, self.bestTimeslots)
+            else:
+                self.costModel.undo(changes)
+
+        return self.bestTimeslots
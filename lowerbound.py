@@ -0,0 +1,108 @@
+import costmodel
+import matching
+
+#A fast lower bound on the cost of any task 3 schedule, so a schedule's cost can be reported with how far above the optimum
+#it could be at most, and the anytime solvers can stop once they are close enough.
+#
+#It relaxes the problem in a few ways, each of which can only make the cheapest schedule cheaper (see costmodel.py for the rules):
+#   - every comedian is priced at the cheapest legal week for their number of mains and tests (costmodel.getDayPatterns),
+#     whatever the other comedians are doing on those days, so the number of slots on each day is ignored
+#   - which demographics a comedian's tests are for is ignored, so only how many tests each comedian does matters
+#   - the mains are only used to work out the fewest comedians who can do them
+#Mains are the expensive part of a week: each costs at least 100, and each comedian doing one pays 400 more for the first.
+#A matching gives the fewest comedians who can do every main with at most 2 each, and a DP over the cheapest weeks prices the
+#tests over every comedian (at 4 spare hours if they do no main, and 2 if they do one). Spreading the mains over more comedians
+#never makes this go down, so the bound for the fewest comedians is a bound on every schedule.
+#
+#The bound relies on the standard hour caps (a comedian does at most 2 mains a week, and never a main and a test on the
+#same day), so it is None for any other caps. ExactSolver branches on the mains from the same tables to tighten it.
+#The gap of a schedule is (cost - bound) / cost, the fraction of its cost that might still be saved.
+
+# costmodel.getDayPatterns for each (days, weeklyHours) asked for so far, since they never change
+patternTables = {}
+
+def dayPatterns(days, weeklyHours):
+    if (days, weeklyHours) not in patternTables:
+        patternTables[(days, weeklyHours)] = costmodel.getDayPatterns(days, weeklyHours)
+    return patternTables[(days, weeklyHours)]
+
+# cheapestTestTable(...)[n][t] is the cheapest way for n comedians with hours spare hours (4, or 2 after one main) to do
+# exactly t tests between them, if we ignore which demographics they can market. A comedian with 2 spare hours is only
+# charged what their tests add to the cost of their main
+def cheapestTestTable(patterns, hours, count, demoCount):
+    inf = float("inf")
+    options = [patterns[(0 if hours == 4 else 1, t)][0][0] - (0 if hours == 4 else 500) for t in range(hours + 1)]
+    table = [[0] + [inf] * demoCount]
+    for n in range(count):
+        last = table[-1]
+        row = [inf] * (demoCount + 1)
+        for t in range(demoCount + 1):
+            for extra in range(min(t, hours) + 1):
+                if last[t - extra] + options[extra] < row[t]:
+                    row[t] = last[t - extra] + options[extra]
+        table.append(row)
+    return table
+
+# mainBounds(...)[k] is a lower bound on the cost of any schedule where at least k comedians do a main
+def mainBounds(patterns, demoCount, comedianCount):
+    inf = float("inf")
+    free = cheapestTestTable(patterns, 4, comedianCount, demoCount)
+    half = cheapestTestTable(patterns, 2, comedianCount, demoCount)
+
+    # With k comedians doing mains, demoCount - k of them do two, and 2k - demoCount do one
+    bounds = [inf] * (comedianCount + 2)
+    for k in range(comedianCount + 1):
+        if 2 * k < demoCount or k > demoCount:
+            continue
+        singles = 2 * k - demoCount
+        pairs = demoCount - k
+        mainsCost = pairs * patterns[(2, 0)][0][0] + singles * patterns[(1, 0)][0][0]
+        testsCost = inf
+        for t in range(demoCount + 1):
+            testsCost = min(testsCost, free[comedianCount - k][t] + half[singles][demoCount - t])
+        bounds[k] = mainsCost + testsCost
+
+    # Doing mains with more comedians can't make the bound go down
+    for k in range(comedianCount, -1, -1):
+        bounds[k] = min(bounds[k], bounds[k + 1])
+    return bounds
+
+# A lower bound on how many more comedians have to start doing mains to cover the remaining mains, given as a list of the
+# comedian ids that can do each one, when mainCounts[c] is how many mains comedian c does already.
+# Returns None if those mains can't be covered at all
+def newMainComedians(remaining, mainCounts):
+    spare = [2 - count for count in mainCounts]
+    if matching.matchShows(remaining, spare)[0] is None:
+        return None
+
+    # Comedians already doing one main can each take one more. Everything else needs a new comedian, who can take two
+    absorbing = [1 if count == 1 else 0 for count in mainCounts]
+    network = matching.FlowNetwork(len(remaining) + len(absorbing) + 2)
+    source = len(remaining) + len(absorbing)
+    sink = source + 1
+    for s in range(len(remaining)):
+        network.addEdge(source, s, 1)
+        for c in remaining[s]:
+            if absorbing[c]:
+                network.addEdge(s, len(remaining) + c, 1)
+    for c in range(len(absorbing)):
+        if absorbing[c]:
+            network.addEdge(len(remaining) + c, sink, 1)
+    absorbed = network.maxFlow(source, sink)
+    return (len(remaining) - absorbed + 1) // 2
+
+# The lower bound for the scheduler's problem: inf if the mains can't be covered at all, or None if the spec doesn't have
+# the standard hour caps
+def lowerBound(scheduler):
+    if not scheduler.spec.hasStandardCaps():
+        return None
+    demoCount = len(scheduler.demographic_List)
+    comedianCount = len(scheduler.comedian_List)
+    comedians = newMainComedians([scheduler.index.candidateIds(d, False) for d in range(demoCount)], [0] * comedianCount)
+    if comedians is None:
+        return float("inf")
+    bounds = mainBounds(dayPatterns(scheduler.spec.days, scheduler.spec.weeklyHours), demoCount, comedianCount)
+    return bounds[min(comedians, len(bounds) - 1)]
+
+def gap(cost, bound):
+    return (cost - bound) / cost if cost > 0 else 0
@@ -0,0 +1,148 @@
+from collections import deque
+
+#A small max-flow network (Dinic's algorithm) used for the matching-based solvers
+#Nodes are integers from 0 to size - 1. Edges are stored in flat lists, with each edge's reverse edge stored at index ^ 1
+#On a unit-capacity bipartite graph Dinic's algorithm does the same work as Hopcroft-Karp, O(E * sqrt(V))
+class FlowNetwork:
+
+    def __init__(self, size):
+        self.size = size
+        self.adjacency = [[] for i in range(size)]
+        self.heads = []
+        self.capacities = []
+
+    # Adds an edge from u to v, and returns its index so the caller can read the flow through it later
+    def addEdge(self, u, v, capacity):
+        self.adjacency[u].append(len(self.heads))
+        self.heads.append(v)
+        self.capacities.append(capacity)
+        self.adjacency[v].append(len(self.heads))
+        self.heads.append(u)
+        self.capacities.append(0)
+        return len(self.heads) - 2
+
+    # The flow through an edge is the capacity that has been pushed onto its reverse edge
+    def getFlow(self, edge):
+        return self.capacities[edge ^ 1]
+
+    # Label every node with its BFS distance from the source in the residual graph
+    def buildLevels(self, source, sink):
+        self.levels = [-1] * self.size
+        self.levels[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for e in self.adjacency[u]:
+                v = self.heads[e]
+                if self.capacities[e] > 0 and self.levels[v] < 0:
+                    self.levels[v] = self.levels[u] + 1
+                    queue.append(v)
+        return self.levels[sink] >= 0
+
+    # Push a blocking flow along the level graph, iteratively so large networks can't hit the recursion limit
+    def pushBlockingFlow(self, source, sink):
+        pushed = 0
+        nextEdge = [0] * self.size
+        while True:
+            path = []
+            u = source
+            while u != sink:
+                edges = self.adjacency[u]
+                while nextEdge[u] < len(edges):
+                    e = edges[nextEdge[u]]
+                    v = self.heads[e]
+                    if self.capacities[e] > 0 and self.levels[v] == self.levels[u] + 1:
+                        break
+                    nextEdge[u] += 1
+                if nextEdge[u] == len(edges):
+                    # Dead end, so remove u from the level graph and step back
+                    if u == source:
+                        return pushed
+                    self.levels[u] = -1
+                    e = path.pop()
+                    u = self.heads[e ^ 1]
+                    nextEdge[u] += 1
+                    continue
+                path.append(edges[nextEdge[u]])
+                u = self.heads[edges[nextEdge[u]]]
+
+            amount = min(self.capacities[e] for e in path)
+            for e in path:
+                self.capacities[e] -= amount
+                self.capacities[e ^ 1] += amount
+            pushed += amount
+
+    def maxFlow(self, source, sink):
+        flow = 0
+        while self.buildLevels(source, sink):
+            flow += self.pushBlockingFlow(source, sink)
+        return flow
+
+    # After maxFlow, returns the nodes still reachable from the source. These form the source side of a minimum cut
+    def reachableFromSource(self, source):
+        seen = [False] * self.size
+        seen[source] = True
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for e in self.adjacency[u]:
+                v = self.heads[e]
+                if self.capacities[e] > 0 and not seen[v]:
+                    seen[v] = True
+                    queue.append(v)
+        return seen
+
+#Solves a capacitated bipartite matching: every show needs exactly one comedian from its candidate list,
+#and comedian c can take at most capacities[c] shows.
+#candidates[s] is a list of comedian ids for show s.
+#If exact is given, it is a list of comedian ids that must be given exactly capacities[c] shows, rather than at most.
+#Returns [matches, hallSet]. If every show is covered, matches[s] is the comedian id given show s and hallSet is None.
+#Otherwise matches is None and hallSet is a list of show ids whose candidates, between them, have less capacity than there are shows in the set
+#(hallSet is None when the only problem is that an exact comedian can't be filled).
+def matchShows(candidates, capacities, exact=None):
+    showCount = len(candidates)
+    comedianCount = len(capacities)
+    source = showCount + comedianCount
+    sink = source + 1
+    network = FlowNetwork(sink + 1)
+
+    for s in range(showCount):
+        network.addEdge(source, s, 1)
+    showEdges = []
+    for s in range(showCount):
+        edges = []
+        for c in candidates[s]:
+            edges.append([c, network.addEdge(s, showCount + c, 1)])
+        showEdges.append(edges)
+    # Fill the exact comedians first. Augmenting paths never take flow back off an edge into the sink,
+    # so they stay full when the other comedians are added afterwards
+    flow = 0
+    isExact = [False] * comedianCount
+    if exact:
+        for c in exact:
+            isExact[c] = True
+            if capacities[c] > 0:
+                network.addEdge(showCount + c, sink, capacities[c])
+        flow = network.maxFlow(source, sink)
+        if flow < sum(capacities[c] for c in exact):
+            return [None, None]
+
+    for c in range(comedianCount):
+        if capacities[c] > 0 and not isExact[c]:
+            network.addEdge(showCount + c, sink, capacities[c])
+
+    flow += network.maxFlow(source, sink)
+    if flow == showCount:
+        matches = [None] * showCount
+        for s in range(showCount):
+            for c, e in showEdges[s]:
+                if network.getFlow(e) > 0:
+                    matches[s] = c
+                    break
+        return [matches, None]
+
+    # Any show still reachable from the source lies on an alternating path from an uncovered show.
+    # All of their candidates are saturated, so together they violate Hall's condition
+    reachable = network.reachableFromSource(source)
+    hallSet = [s for s in range(showCount) if reachable[s]]
+    return [None, hallSet]
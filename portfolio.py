@@ -0,0 +1,133 @@
+import concurrent.futures
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import time
+import scheduler
+import timetable
+import localsearch
+
+#Runs several differently configured solvers for the same problem at once, one per process, since how long the
+#backtracking searches take depends a lot on the order they try things in. Each configuration is a dict of:
+#   mode    - the search mode passed to the task's driver (see Scheduler.createSchedule and Scheduler.pairMainsAndTests)
+#   weights - changes to the heuristic weights (see scheduler.DEFAULT_WEIGHTS)
+#   seed    - a seed for random tie-breaking in the heuristic orderings, or None to keep their usual order
+#   improve - task 3 only: whether to spend the time left before the deadline improving the schedule with simulated annealing
+#For tasks 1 and 2 the first schedule found wins, and for task 3 the cheapest schedule found by the deadline.
+#Either way the other workers are told to stop, which the searches check for every 1000 nodes (see Scheduler.runSearch).
+
+# Set in each worker process by initWorker
+stopEvent = None
+
+def initWorker(event):
+    global stopEvent
+    stopEvent = event
+
+# The first configuration is always the plain solver, so the portfolio never does worse than it would have.
+# The rest change the search mode, jitter the weights and break ties randomly, all chosen with the given seed
+def makeConfigurations(task, count, seed=0):
+    rng = random.Random(seed)
+    modes = {1: ["backtrack", "matching"], 2: ["heuristic", "forwardchecking"], 3: ["heuristic", "forwardchecking"]}[task]
+    configurations = [{"mode": modes[0], "weights": {}, "seed": None, "improve": task == 3}]
+    for i in range(1, count):
+        weights = {}
+        for feature, weight in scheduler.DEFAULT_WEIGHTS.items():
+            weights[feature] = weight * rng.choice([0.5, 1, 1, 2])
+        configurations.append({"mode": modes[i % len(modes)], "weights": weights, "seed": rng.randrange(2 ** 32), "improve": task == 3})
+    return configurations
+
+# Flattens a timetable into [day, session, comedian name, demographic reference, show type] rows, so it can be sent between processes
+def timetableToRows(tt):
+    rows = []
+    for day in tt.schedule:
+        for session, [c, d, showType] in sorted(tt.schedule[day].items()):
+            rows.append([day, session, c.name, d.reference, showType])
+    return rows
+
+# Runs one configuration in a worker process. Returns [cost, rows], or None if it found nothing before being stopped
+def solveConfiguration(comedian_List, demographic_List, spec, task, configuration, deadline):
+    sch = scheduler.Scheduler(comedian_List, demographic_List, spec)
+    sch.weights.update(configuration["weights"])
+    if configuration["seed"] is not None:
+        sch.tieBreaker = random.Random(configuration["seed"])
+    sch.shouldStop = lambda: stopEvent.is_set() or (deadline is not None and time.time() > deadline)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if task == 1:
+            tt = sch.createSchedule(configuration["mode"])
+        elif task == 2:
+            tt = sch.createTestShowSchedule(configuration["mode"])
+        else:
+            tt = False
+            timeslots = sch.findMinCostTimeslots(configuration["mode"])
+            if timeslots != False:
+                if configuration["improve"] and deadline is not None and time.time() < deadline:
+                    improver = localsearch.LocalSearch(sch, timeslots, seed=configuration["seed"])
+                    # Leave a little time to send the result back before the deadline
+                    timeslots = improver.run(timeLimit=max(0, deadline - time.time() - 0.1))
+                tt = sch.timeslotsToTimetable(timeslots)
+
+        if tt == False or not tt.scheduleChecker(comedian_List, demographic_List):
+            return None
+    return [tt.cost, timetableToRows(tt)]
+
+class Portfolio:
+
+    # workers defaults to every core on the machine. seed picks the configurations (see makeConfigurations)
+    # spec is the problem's dimensions (see problemspec.py), and defaults to the standard week
+    def __init__(self, comedian_List, demographic_List, workers=None, seed=0, spec=None):
+        self.comedian_List = comedian_List
+        self.demographic_List = demographic_List
+        self.spec = spec
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.seed = seed
+        # Filled in by solve: the configuration that produced the returned schedule, and what every configuration returned
+        self.winner = None
+        self.results = []
+
+    # Rebuilds a timetable from rows, using this problem's own comedian and demographic objects
+    def rowsToTimetable(self, task, rows):
+        comedians = {c.name: c for c in self.comedian_List}
+        demographics = {d.reference: d for d in self.demographic_List}
+        tt = timetable.Timetable(task, self.spec)
+        for day, session, name, reference, showType in rows:
+            tt.addSession(day, session, comedians[name], demographics[reference], showType)
+        return tt
+
+    # Solves task 1, 2 or 3 and returns the timetable, or False if no configuration found a schedule in time.
+    # For task 3, timeLimit is how long every worker gets. For tasks 1 and 2 it is how long to wait for the first schedule (None to wait forever)
+    def solve(self, task, timeLimit=10.0):
+        configurations = makeConfigurations(task, self.workers, self.seed)
+        deadline = None if timeLimit is None else time.time() + timeLimit
+        event = multiprocessing.Event()
+        self.winner = None
+        self.results = []
+        best = None
+
+        executor = concurrent.futures.ProcessPoolExecutor(self.workers, initializer=initWorker, initargs=(event,))
+        try:
+            futures = {}
+            for configuration in configurations:
+                future = executor.submit(solveConfiguration, self.comedian_List, self.demographic_List, self.spec, task, configuration, deadline)
+                futures[future] = configuration
+
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                self.results.append([futures[future], None if result is None else result[0]])
+                if result is None:
+                    continue
+                if best is None or result[0] < best[0]:
+                    best = result
+                    self.winner = futures[future]
+                # The first schedule is all tasks 1 and 2 need
+                if task != 3:
+                    break
+        finally:
+            event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if best is None:
+            return False
+        return self.rowsToTimetable(task, best[1])
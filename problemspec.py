@@ -0,0 +1,94 @@
+#The dimensions of a problem: how long the week is, how many slots each day has, and how long comedians can be on stage for.
+#The defaults are the original problem: 5 days, 5 main slots a day for task 1 and 10 slots a day for tasks 2 and 3,
+#at most 2 hours on stage a day and 4 a week.
+#Every demographic gets one main (task 1) or one main and one test (tasks 2 and 3), so the week needs exactly
+#days * mainSlotsPerDay demographics for task 1, and days * slotsPerDay / 2 for tasks 2 and 3.
+
+# Show lengths in hours. These are part of the cost rules (see costmodel.py), so they are fixed
+MAIN_HOURS = 2
+TEST_HOURS = 1
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Used to keep the checker's messages worded as they always have been
+NUMBER_WORDS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve"]
+
+def numberToWords(n):
+    if 0 <= n < len(NUMBER_WORDS):
+        return NUMBER_WORDS[n]
+    return str(n)
+
+# "1, 2, 3, 4 or 5"
+def listToWords(items):
+    items = [str(item) for item in items]
+    if len(items) == 1:
+        return items[0]
+    return ", ".join(items[:-1]) + " or " + items[-1]
+
+class ProblemSpec:
+
+    # The settings that can be given in a problem file, in the order they are written
+    FIELDS = ["days", "mainSlotsPerDay", "slotsPerDay", "dailyHours", "weeklyHours"]
+
+    def __init__(self, days=5, mainSlotsPerDay=5, slotsPerDay=10, dailyHours=2, weeklyHours=4):
+        self.days = days
+        self.mainSlotsPerDay = mainSlotsPerDay
+        self.slotsPerDay = slotsPerDay
+        self.dailyHours = dailyHours
+        self.weeklyHours = weeklyHours
+
+    # The names of the days, Monday first. Weeks longer than 7 days carry on with "Day 8", "Day 9" and so on
+    def dayNames(self):
+        names = DAY_NAMES[:self.days]
+        for d in range(len(names), self.days):
+            names.append("Day " + str(d + 1))
+        return names
+
+    # Total slots in the week for task 1, and for tasks 2 and 3
+    def mainSlots(self):
+        return self.days * self.mainSlotsPerDay
+
+    def slots(self):
+        return self.days * self.slotsPerDay
+
+    # The day a slot is on, when the week's slots are numbered day by day from 0
+    def getDay(self, slotNumber):
+        return slotNumber // self.slotsPerDay
+
+    # In task 1 each comedian does at most one main a day (none if a main doesn't fit in the daily hours), and as many a week
+    # as fit in their weekly hours
+    def mainsPerWeek(self):
+        mainsPerDay = min(1, self.dailyHours // MAIN_HOURS)
+        return min(self.weeklyHours // MAIN_HOURS, self.days * mainsPerDay)
+
+    # Can every comedian's task 2/3 shows go on days of their own? True if even a comedian doing nothing but tests has no more
+    # of them than there are days, and a main fits in a day. Then any pairing can be laid out one show per comedian per day
+    def oneShowADay(self):
+        return self.weeklyHours // TEST_HOURS <= self.days and self.dailyHours >= MAIN_HOURS
+
+    def hasStandardCaps(self):
+        return self.dailyHours == 2 and self.weeklyHours == 4
+
+    # Returns None if the week has exactly one slot for every show of the task, or a message saying why not
+    def checkDemographics(self, demographicCount, taskNumber):
+        if taskNumber == 1:
+            if demographicCount != self.mainSlots():
+                return "There are " + str(demographicCount) + " demographics, but " + str(self.mainSlots()) + " main slots in the week"
+        elif 2 * demographicCount != self.slots():
+            return "There are " + str(2 * demographicCount) + " shows, but " + str(self.slots()) + " slots in the week"
+        return None
+
+    def asDict(self):
+        return {field: getattr(self, field) for field in ProblemSpec.FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, ProblemSpec) and self.asDict() == other.asDict()
+
+    def __hash__(self):
+        return hash(tuple(self.asDict().values()))
+
+    def __str__(self):
+        return str(self.asDict())
+
+    def __repr__(self):
+        return str(self)
@@ -0,0 +1,184 @@
+from array import array
+import compactstate
+import costmodel
+import search
+
+#Incremental re-solve for task 3, for when the input changes a little from one week to the next: a comedian drops out or
+#joins, or a demographic's topics change. Rather than pairing and scheduling every show again, last week's timetable is
+#repaired in place:
+#   1) every show of last week's timetable is kept in its slot if its comedian (matched by name) and demographic (matched by
+#      reference) are still in the problem, the comedian can still market it, and it keeps to the hour caps
+#   2) every show that wasn't kept is given a comedian and a day with a free slot by a small search (RepairProblem in
+#      search.py), trying the cheapest option first against the shows that were kept
+#   3) if that search fails (or runs out of nodes), the neighbourhood is widened: every show of the comedians who could take
+#      one of the freed shows is freed as well, and the search is run again. This repeats until nothing more can be freed,
+#      and then the whole problem is solved from scratch with Scheduler.findMinCostTimeslots
+#Kept shows never move, so the churn against last week is only the shows that had to be re-searched.
+#
+#A diff is a dict with any of the keys addedComedians, changedComedians, addedDemographics and changedDemographics (lists of
+#Comedian or Demographic objects; a changed one replaces the one with the same name or reference) and removedComedians and
+#removedDemographics (lists of names and references). applyDiff turns last week's lists into this week's, and diffProblems
+#works out the diff between two weeks' lists.
+
+def applyDiff(comedian_List, demographic_List, diff):
+    return [applyChanges(comedian_List, diff, "Comedians", lambda c: c.name),
+        applyChanges(demographic_List, diff, "Demographics", lambda d: d.reference)]
+
+def applyChanges(items, diff, kind, key):
+    removed = set(diff.get("removed" + kind, []))
+    changed = {key(item): item for item in diff.get("changed" + kind, [])}
+    result = [changed.get(key(item), item) for item in items if key(item) not in removed]
+    return result + list(diff.get("added" + kind, []))
+
+def diffProblems(oldComedians, oldDemographics, newComedians, newDemographics):
+    diff = {}
+    for kind, old, new, key, content in [["Comedians", oldComedians, newComedians, lambda c: c.name, lambda c: set(c.themes)],
+            ["Demographics", oldDemographics, newDemographics, lambda d: d.reference, lambda d: set(d.topics)]]:
+        oldItems = {key(item): item for item in old}
+        newKeys = set(key(item) for item in new)
+        diff["added" + kind] = [item for item in new if key(item) not in oldItems]
+        diff["changed" + kind] = [item for item in new if key(item) in oldItems and content(item) != content(oldItems[key(item)])]
+        diff["removed" + kind] = [key(item) for item in old if key(item) not in newKeys]
+    return diff
+
+class Repair:
+
+    # scheduler is for this week's problem, and previous is last week's task 3 Timetable.
+    # nodeLimit caps the search at each neighbourhood size before the neighbourhood is widened
+    def __init__(self, scheduler, previous, nodeLimit=20000):
+        self.scheduler = scheduler
+        self.previous = previous
+        self.nodeLimit = nodeLimit
+        # Filled in by run: how many shows were kept in their slots, how many neighbourhoods were searched,
+        # whether the problem had to be solved from scratch, and how many slots differ from last week's timetable
+        self.kept = 0
+        self.rounds = 0
+        self.fellBack = False
+        self.churn = 0
+
+    # Last week's timetable as packed shows in this week's ids (see compactstate.py), with EMPTY for a show that can't be kept
+    def previousShows(self):
+        sch = self.scheduler
+        spec = sch.spec
+        comedianIds = {c.name: i for i, c in enumerate(sch.comedian_List)}
+        demographicIds = {d.reference: i for i, d in enumerate(sch.demographic_List)}
+
+        timeslots = array("l", [compactstate.EMPTY]) * spec.slots()
+        for dayNumber, day in enumerate(self.previous.schedule):
+            for session, [comedian, demographic, showType] in self.previous.schedule[day].items():
+                c = comedianIds.get(comedian.name)
+                d = demographicIds.get(demographic.reference)
+                if c is None or d is None or session > spec.slotsPerDay or not sch.index.canMarketIds(c, d, showType == "test"):
+                    continue
+                timeslots[dayNumber * spec.slotsPerDay + session - 1] = compactstate.packShow(c, d, showType == "test")
+        return timeslots
+
+    # Drops every show of the given comedians from the timeslots, and every show that would break an hour cap or repeat a
+    # show already kept. Returns the cost model of the shows that are left, over comedian ids
+    def keepShows(self, timeslots, freedComedians):
+        spec = self.scheduler.spec
+        costModel = costmodel.CostModel(spec.days, spec.dailyHours, spec.weeklyHours)
+        seen = set()
+        for i in range(len(timeslots)):
+            show = timeslots[i]
+            if show == compactstate.EMPTY:
+                continue
+            c = compactstate.showComedian(show)
+            day = spec.getDay(i)
+            key = [compactstate.showDemographic(show), compactstate.showIsTest(show)]
+            if c in freedComedians or tuple(key) in seen or not costModel.canPlace(c, day, key[1]):
+                timeslots[i] = compactstate.EMPTY
+                continue
+            seen.add(tuple(key))
+            costModel.place(c, day, key[1])
+        return costModel
+
+    # The shows that aren't in the timeslots, packed without a comedian, with the shows fewest comedians can take first
+    def missingShows(self, timeslots):
+        index = self.scheduler.index
+        placed = set(compactstate.packShow(0, compactstate.showDemographic(show), compactstate.showIsTest(show)) for show in timeslots if show != compactstate.EMPTY)
+        shows = []
+        for d in range(len(self.scheduler.demographic_List)):
+            for isTest in [False, True]:
+                show = compactstate.packShow(0, d, isTest)
+                if show not in placed:
+                    shows.append(show)
+        return sorted(shows, key = lambda show: len(index.candidateIds(compactstate.showDemographic(show), compactstate.showIsTest(show))))
+
+    # Searches for comedians and days for the missing shows. Returns the filled timeslots, or None if the search failed
+    def searchNeighbourhood(self, timeslots, freedComedians):
+        sch = self.scheduler
+        costModel = self.keepShows(timeslots, freedComedians)
+        shows = self.missingShows(timeslots)
+        assignments = []
+        sch.search = search.Search(search.RepairProblem(sch, shows, costModel, assignments), sch.stats)
+        result = sch.runSlices(self.nodeLimit)
+        sch.nodes += sch.search.nodes
+        sch.backtracks += sch.search.backtracks
+        if not result:
+            return None
+
+        self.kept = sum(1 for show in timeslots if show != compactstate.EMPTY)
+        # Each day's new shows go into its free slots in the order they were placed
+        spec = sch.spec
+        for show, day in assignments:
+            for i in range(day * spec.slotsPerDay, (day + 1) * spec.slotsPerDay):
+                if timeslots[i] == compactstate.EMPTY:
+                    timeslots[i] = show
+                    break
+        return timeslots
+
+    # Returns the repaired timeslots as [demo, comedian, isTest] lists, like Scheduler.findMinCostTimeslots, or False
+    def run(self, mode="heuristic"):
+        sch = self.scheduler
+        spec = sch.spec
+        self.kept = 0
+        self.rounds = 0
+        self.fellBack = False
+
+        problem = spec.checkDemographics(len(sch.demographic_List), 3)
+        if problem is not None:
+            print(problem)
+            return False
+
+        result = None
+        if len(self.previous.schedule) == spec.days:
+            previous = self.previousShows()
+            freedComedians = set()
+            with sch.phase("repair"):
+                while result is None:
+                    self.rounds += 1
+                    result = self.searchNeighbourhood(array("l", previous), freedComedians)
+                    if result is not None or (sch.shouldStop is not None and sch.shouldStop()):
+                        break
+                    # Widen the neighbourhood to the comedians who could take any of the shows that are still missing
+                    timeslots = array("l", previous)
+                    self.keepShows(timeslots, freedComedians)
+                    widened = set(freedComedians)
+                    for show in self.missingShows(timeslots):
+                        widened.update(sch.index.candidateIds(compactstate.showDemographic(show), compactstate.showIsTest(show)))
+                    if widened == freedComedians:
+                        break
+                    freedComedians = widened
+
+        if result is None:
+            self.fellBack = True
+            timeslots = sch.findMinCostTimeslots(mode)
+            if timeslots == False:
+                return False
+        else:
+            timeslots = [compactstate.unpackShow(sch.index, show) for show in result]
+        self.churn = self.countChurn(timeslots)
+        return timeslots
+
+    # How many slots hold a different show (comedian, demographic or type) from last week's timetable
+    def countChurn(self, timeslots):
+        spec = self.scheduler.spec
+        previousDays = list(self.previous.schedule.values())
+        churn = 0
+        for i, [demographic, comedian, isTest] in enumerate(timeslots):
+            day = spec.getDay(i)
+            old = previousDays[day].get(i % spec.slotsPerDay + 1) if day < len(previousDays) else None
+            if old is None or [old[0].name, old[1].reference, old[2]] != [comedian.name, demographic.reference, "test" if isTest else "main"]:
+                churn += 1
+        return churn
@@ -16,26 +16,44 @@ import scheduler
 
 #Overall, the only changes that need to be made to this file is commenting and uncommenting the correct method call
 #based on which problem you are trying to solve, and changing which problem is loaded in. 
-
-rw = ReaderWriter.ReaderWriter()
-[comedian_List, demographic_List] = rw.readRequirements("ExampleProblems/Problem8.txt")
-sch = scheduler.Scheduler(comedian_List, demographic_List)
-
-#this method will be used to create a schedule that solves task 1
-#tt = sch.createSchedule()
-
-#This method will be used to create a schedule that solves task 2
-#tt = sch.createTestShowSchedule()
-
-#this method will be used to create a schedule that solves task 3
-tt = sch.createMinCostSchedule()
-
-if tt.scheduleChecker(comedian_List, demographic_List):
-	print("Schedule is legal.")
-
-	#For problem 1, the cost will be printed, but will be 0
-	#For problem 2, the cost will be printed, but can be ignored. 
-	print("Schedule has a cost of " + str(tt.cost))
-
-
-	#print(str(tt.schedule))
+#To solve a whole directory (or glob) of problems for one or more tasks at once, without editing this file, use batch.py instead.
+
+#The code below only runs when this file is run directly, not when it is imported, e.g. by the portfolio's worker processes
+#on platforms that start them by re-importing the main module
+if __name__ == "__main__":
+	rw = ReaderWriter.ReaderWriter()
+	[comedian_List, demographic_List] = rw.readRequirements("ExampleProblems/Problem8.txt")
+	#rw.spec holds the problem's dimensions (days, slots per day and hour caps), which are the standard week unless the file gives them
+	sch = scheduler.Scheduler(comedian_List, demographic_List, rw.spec)
+	#to have the backtracking searches restart with random tie-breaking when they take too long (see Scheduler.runSearch), uncomment this
+	#sch.restartNodes = 200
+	#to reuse schedules already solved for this problem (even with the comedians and demographics renamed or reordered), uncomment these
+	#import solutioncache
+	#sch.cache = solutioncache.SolutionCache(".schedulecache")
+
+	#this method will be used to create a schedule that solves task 1
+	#tt = sch.createSchedule()
+	#or, using the bipartite matching solver, which also explains why no schedule exists when that happens
+	#tt = sch.createSchedule("matching")
+
+	#This method will be used to create a schedule that solves task 2
+	#tt = sch.createTestShowSchedule()
+
+	#this method will be used to create a schedule that solves task 3
+	tt = sch.createMinCostSchedule()
+	#or, to spend a second improving the heuristic schedule with simulated annealing
+	#tt = sch.createImprovedSchedule(timeLimit=1.0)
+	#or, to get a provably optimal schedule (optionally giving up after a number of seconds and reporting the optimality gap)
+	#tt = sch.createOptimalSchedule(timeLimit=10)
+	#or, to race differently configured solvers on every core and keep the cheapest schedule found in 10 seconds (this works for tasks 1 and 2 too)
+	#tt = sch.createPortfolioSchedule(3, timeLimit=10)
+
+	if tt.scheduleChecker(comedian_List, demographic_List):
+		print("Schedule is legal.")
+
+		#For problem 1, the cost will be printed, but will be 0
+		#For problem 2, the cost will be printed, but can be ignored. 
+		print("Schedule has a cost of " + str(tt.cost))
+
+
+		#print(str(tt.schedule))
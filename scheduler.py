@@ -2,76 +2,210 @@ import comedian
 import demographic
 import ReaderWriter
 import timetable
+import eligibility
+import matching
+import exactsolver
+import localsearch
+import lns
+import lowerbound
+import costmodel
+import dayassignment
+import repair
+import search
+import portfolio
+import stats
+import problemspec
+import compactstate
 import random
 import math
+import json
+from array import array
+
+# Points for each feature of an assignment, used by applyAssignmentHeuristics and applySchedulingHeuristics
+# sameType     - per show of the same type the comedian already has (task 2/3 pairing)
+# adjacentMain - a main on the day after the comedian's last main, which costs 100 rather than 300 (task 3 days)
+# secondTest   - a second test on the same day, which makes both half price (task 3 days)
+# showCount    - per point of the comedian's show score: 5 per main and 1 per test they have still to place (task 3 days)
+DEFAULT_WEIGHTS = {"sameType": 1, "adjacentMain": 400, "secondTest": 300, "showCount": 1}
 
 class Scheduler:
 
-    def __init__(self,comedian_List, demographic_List):
+    # spec gives the number of days and slots, and the hour caps (see problemspec.py). It defaults to the standard week
+    def __init__(self,comedian_List, demographic_List, spec=None):
         self.comedian_List = comedian_List
         self.demographic_List = demographic_List
+        self.spec = spec if spec is not None else problemspec.ProblemSpec()
+        # Built once per problem, so the searches below never have to scan themes/topics
+        self.index = eligibility.EligibilityIndex(comedian_List, demographic_List)
+        # Set by the matching solver when no schedule exists: a set of demographics that too few comedians can cover
+        self.hallViolation = None
+        # The weights of the features the heuristics score assignments with (see DEFAULT_WEIGHTS)
+        self.weights = dict(DEFAULT_WEIGHTS)
+        # If set to a random.Random, ties in the heuristic orderings are broken randomly rather than by list order
+        self.tieBreaker = None
+        # If set to a function, the searches check it every 1000 nodes and give up (as if they had failed) once it returns True
+        self.shouldStop = None
+        # If set, searches restart after restartNodes times the next Luby number of nodes, breaking ties randomly from the second run on
+        self.restartNodes = None
+        self.restartSeed = 0
+        # Which restart (counting from 0) the last search found its answer on
+        self.solvedOnRestart = None
+        # Nodes and backtracks over every search this scheduler has run, including restarts
+        self.nodes = 0
+        self.backtracks = 0
+        # Set to a stats.SearchStats to count checks, prunes and time per phase in more detail
+        self.stats = None
+        # Don't search the same assignment again with interchangeable comedians or demographics swapped round (see search.py)
+        self.symmetryBreaking = True
+        # States the searches have found to fail, so they aren't searched again (see search.NogoodTable). None turns this off
+        self.nogoods = search.NogoodTable()
+        # Set to a solutioncache.SolutionCache to reuse schedules already solved for the same problem with the same settings
+        self.cache = None
+        # How task 3 gives the paired shows their days: "heuristic" (the slot by slot search in assignShowsToDays) or
+        # "optimal" (the cheapest week for the pairing, from each comedian's day patterns, see dayassignment.py)
+        self.daysMode = "heuristic"
+        # If set (e.g. 0.01), createImprovedSchedule, createLNSSchedule and createOptimalSchedule stop as soon as the gap of their schedule is at
+        # most this (see lowerbound.py)
+        self.gapTarget = None
+        # Set to True to have every task 3 solve work out the lower bound and report its gap. Without it (or a gapTarget) only
+        # createOptimalSchedule, which finds a bound anyway, reports one
+        self.reportGap = False
+        # Set by each task 3 solve: the lower bound on the cost of any schedule (None if there isn't one for these caps), the
+        # cost of the schedule found, and the fraction of that cost that is above the bound
+        self.bound = None
+        self.incumbent = None
+        self.gap = None
+        # The bound from lowerbound.py, worked out the first time a task 3 solve needs it
+        self.rootBound = False
+
+    # Runs a search problem (see search.py) to the end, keeping the search in self.search so its node counts can be read afterwards
+    # With restartNodes set, a run that goes on for too long is cancelled, which puts the problem back as it started, and the search
+    # starts again with ties broken randomly, so one unlucky ordering can't keep it stuck. The cutoffs follow the Luby sequence
+    # (see search.luby), so however long the search needs, it is never more than a log factor slower than the best fixed cutoff
+    def runSearch(self, problem):
+        tieBreaker = self.tieBreaker
+        restart = 0
+        while True:
+            self.search = search.Search(problem, self.stats, self.nogoods)
+            nodeLimit = None
+            if self.restartNodes is not None:
+                nodeLimit = self.restartNodes * search.luby(restart + 1)
+            result = self.runSlices(nodeLimit)
+            self.nodes += self.search.nodes
+            self.backtracks += self.search.backtracks
+            if result is not None:
+                break
+            restart += 1
+            if self.tieBreaker is None:
+                self.tieBreaker = random.Random(self.restartSeed)
+
+        self.tieBreaker = tieBreaker
+        self.solvedOnRestart = restart if result else None
+        return result
+
+    # Runs self.search for at most nodeLimit nodes, checking shouldStop every 1000. Returns None (and cancels the search) if it hit the limit
+    def runSlices(self, nodeLimit):
+        while True:
+            step = None if self.shouldStop is None else 1000
+            if nodeLimit is not None:
+                step = nodeLimit - self.search.nodes if step is None else min(step, nodeLimit - self.search.nodes)
+            result = self.search.run(step)
+            if result is not None:
+                return result
+            if self.shouldStop is not None and self.shouldStop():
+                self.search.cancel()
+                return False
+            if nodeLimit is not None and self.search.nodes >= nodeLimit:
+                self.search.cancel()
+                return None
+
+    # Times a phase of the solve in self.stats, used as "with self.phase(name):"
+    def phase(self, name):
+        if self.stats is None:
+            return stats.NO_PHASE
+        return self.stats.phase(name)
+
+    # The heuristic orderings sort stably, so ties keep the order they were in. With a tieBreaker, ties are shuffled first
+    def breakTies(self, items):
+        items = list(items)
+        if self.tieBreaker is not None:
+            self.tieBreaker.shuffle(items)
+        return items
 
     ######################### A simple CSP solver that uses backtracking find a valid configuation of Comics/Shows
     ######## TASK 1 ######### Comic/Show pairs are then assigned to a schedule using a structural trick, negating the need for a CSP
     #########################
 
-    # At each stage of the recursion, check the constraints haven't been violated
-    def violationsMain(self, assignments):
-        # Check that all comedians canMarket their show 
-        tt = timetable.Timetable(1)
-        showCounts = {}
-        for demo, comedian in assignments.items():
-            # Sanity check - should never get hit
-            if not tt.canMarket(comedian, demo, False):
-                return True
-        
-            # Get the count of shows this comic has done this week
-            if showCounts.get(comedian) == None:
-                showCount = 0
-            else:
-                showCount = showCounts.get(comedian)
-
-            # Increment showCount for this comedian 
-            if showCount < 2: 
-                showCounts.update({comedian: showCount + 1})
-            else: 
-                # If a comedian has done > 2 shows this week, return violation
-                return True
-        
-        return False
-
-    # Solves the task 1 CSP by backtracking
-    # Recursively calls itself, backtracking when constraints are violated, until a valid solution of 25 demo/comedian assignments exists
+    # Solves the task 1 CSP by backtracking, using the iterative search engine in search.py
+    # Tries each comedian that can market the next demographic in turn, backtracking when a comedian would have too many mains, until a valid solution of 25 demo/comedian assignments exists
+    # The search works on comedian ids (see MainsProblem), and the pairs are added to assignments once it has finished
     def assignMains(self, assignments, demoNumber): 
-        tt = timetable.Timetable(1)
+        matches = compactstate.zeros(len(self.demographic_List))
+        for d, demo in enumerate(self.demographic_List):
+            matches[d] = self.index.comedianId(assignments[demo]) if demo in assignments else compactstate.EMPTY
+        with self.phase("pairing"):
+            if self.runSearch(search.MainsProblem(self, matches, demoNumber)) == False:
+                return False
+        for d, c in enumerate(matches):
+            assignments.update({self.demographic_List[d]: self.comedian_List[c]})
+        return True
+
+    # Solves the task 1 pairing as a capacitated bipartite matching (each demographic needs 1 main, each comedian can do 2, or spec.mainsPerWeek())
+    # Runs in polynomial time, and if no pairing exists, records a set of demographics that breaks Hall's condition
+    def matchMains(self, assignments):
+        candidates = [self.index.candidateIds(d, False) for d in range(len(self.demographic_List))]
+        capacities = [self.spec.mainsPerWeek()] * len(self.comedian_List)
+
+        with self.phase("pairing"):
+            [matches, hallSet] = matching.matchShows(candidates, capacities)
+        if matches is None:
+            self.hallViolation = [self.demographic_List[d] for d in hallSet]
+            return False
 
-        # If we're reached 25 assignments, we've finished so return true
-        if demoNumber >= 25: 
-            return True
-        else:
-            demo = self.demographic_List[demoNumber]
-
-        # For the new demographic, find the first comedian that can market it, and assign them to it
-        for comedian in self.comedian_List:
-            if tt.canMarket(comedian, demo, False): 
-                # Assign the demo to the comedian 
-                assignments.update({demo: comedian})
-                # Check the 2 shows/wk constraint isn't violated
-                if self.violationsMain(assignments) == False: 
-                    # Recursively call assignMains with the newly added-to list of assignments, and the next demo to assign
-                    if self.assignMains(assignments, demoNumber + 1) == True: 
-                        return True
-                    del assignments[demo]
+        for d, c in enumerate(matches):
+            assignments.update({self.demographic_List[d]: self.comedian_List[c]})
+        return True
 
-        return False
-    
-    def createSchedule(self):
-        timetableObj = timetable.Timetable(1)
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    # Looks the problem up in self.cache, returning the cached timetable for this task and mode or None
+    def cachedSchedule(self, task, mode):
+        if self.cache is None:
+            return None
+        return self.cache.get(self.comedian_List, self.demographic_List, self.spec, self.cacheSettings(task, mode), self.index)
+
+    # Stores a timetable the driver for the task just solved in self.cache
+    def cacheSchedule(self, task, mode, tt):
+        if self.cache is not None:
+            self.cache.put(self.comedian_List, self.demographic_List, self.spec, self.cacheSettings(task, mode), tt)
+
+    def cacheSettings(self, task, mode):
+        return {"task": task, "mode": mode, "weights": self.weights, "days": self.daysMode}
+
+    # mode is either "backtrack" (the original CSP) or "matching"
+    def createSchedule(self, mode="backtrack"):
+        timetableObj = timetable.Timetable(1, self.spec)
+        days = self.spec.dayNames()
         assignments = {}
 
+        # The week has to have a main slot for every demographic
+        problem = self.spec.checkDemographics(len(self.demographic_List), 1)
+        if problem is not None:
+            print(problem)
+            return False
+
+        cached = self.cachedSchedule(1, mode)
+        if cached is not None:
+            return cached
+
+        if mode == "matching":
+            if self.matchMains(assignments) == False:
+                comics = set()
+                for demo in self.hallViolation:
+                    comics.update(c.name for c in self.index.candidates(demo, False))
+                print("No valid assignment of demographics to comedians was found")
+                print(str(len(self.hallViolation)) + " demographics " + str([d.reference for d in self.hallViolation]) + " can only be marketed by " + str(len(comics)) + " comedians " + str(sorted(comics)))
+                return False
         # Begin backtrack to find a valid pairing between demographics and comedians
-        if self.assignMains(assignments, 0) == False:
+        elif self.assignMains(assignments, 0) == False:
             print("No valid assignment of demographics to comedians was found")
             return False
 
@@ -80,12 +214,14 @@ class Scheduler:
 
         # Add all the demo/comedian pairs as sessions
         # Filling by session rather than day, in combination with our ordered list of pairs, means we'll never schedule a comedian for 2 sessions in one day
-        for session in range(1,6):
-            for day in range(5):
-                # s counts from 0 to 24
-                s = (session - 1) * 5 + day
+        # (spec.mainsPerWeek() is never more than the number of days)
+        for session in range(1, self.spec.mainSlotsPerDay + 1):
+            for day in range(self.spec.days):
+                # s counts from 0 to 24 in the standard week
+                s = (session - 1) * self.spec.days + day
                 timetableObj.addSession(days[day], session, sortedList[s][1], sortedList[s][0], "main")
 
+        self.cacheSchedule(1, mode, timetableObj)
         return timetableObj
 
     ######################### Uses a more sophisticated search involves the use of a heuristic function that orders the list of possible assigments
@@ -93,126 +229,43 @@ class Scheduler:
     ######################### In this task, we don't bother using a CSP to assign Comic->Demo pairs to timeslots. We just order by comic name and assign slot by slot, meaning no comic can ever have >1 show per day, making that constriant void
                                 # this approach means we don't get an optimal score, but means we can run the timeslot assignment in O(n) rather than using a CSP to do it. 
 
-    # Function to work out how many main shows and test shows a comedian is currently assigned, given a list of assignments
-    def getShowCounts(self, assignments):
-        comicScore = {}
-        # Iterate over all assignments so far, and update the score for the comedian 
-        for a in assignments:
-            c = a[1]
-            t = a[2]
-            score = 1 if t else 5
-
-            if comicScore.get(c) == None:
-                oldScore = 0
-            else:
-                oldScore = comicScore.get(c)
-            
-            newScore = score + oldScore
-            comicScore.update({c: newScore})
-        # Return a dict of comic:score
-        return comicScore
-        
-    # Given our current list of assignments of comic->demographic, take the next demographic and rank the comedians
-    # based on how well they fit the potential demographic. We return this ordered list of comedians 
+    # Given the comedians (ids) with hours left and how many shows of each type they have so far (a compactstate.PairingState),
+    # take the next demographic d and rank the comedians based on how well they fit it. We return this ordered list of comedians
     # and try to assign them in that order 
-    def applyAssignmentHeuristics(self, comedians, demo, isTest, assignments):
-        # return a dict of {comedian, hours}, ordered by points
-        tt = timetable.Timetable(2)
-
+    def applyAssignmentHeuristics(self, comedians, d, isTest, state):
         # Get some scores based on who we think would be a good fit for this demographic, based on previous assignments
         # Score for each comedian = how many shows of each type they have done before, e.g. a comedian that has already done 3 Tests will get a score of 3 
-        comicScores = {}
-        for comic in comedians:
-            testCount = 0 
-            mainCount = 0 
-            if not tt.canMarket(comic, demo, isTest):
-                comicScores.update({comic: 0})        
+        counts = state.testCounts if isTest else state.mainCounts
+        comicScores = []
+        for c in comedians:
+            if not self.index.canMarketIds(c, d, isTest):
+                comicScores.append([c, 0])
                 continue
-            # For every assignment that this comic has, count the tests and mains. This will be their score
-            for a in assignments:
-                if not (a[1] == comic):
-                    continue
-                if a[2] == True:
-                    testCount += 1
-                elif a[2] == False:
-                    mainCount += 1
-
-            # Add 1 just to indicate that this person CAN do the demo, even if they score 0 on the other suitability criteraik
-            score = 1 + (testCount if isTest else mainCount)
-            comicScores.update({comic: score})        
-
-        # Convert the points dictionary into a format that we can return and use
-        orderedComediansList = sorted(comicScores.items(), reverse=True, key = lambda x: x[1])
-        orderedComediansDict = {}
-        for o in orderedComediansList:
-            comedian = o[0]
-            orderedComediansDict.update({comedian: comedians.get(comedian)})
-
-        return orderedComediansDict
-
-    # Recursive algorithm for Task 2 and the first part of task 3
-    # Assigns 50 demographics (25 tests and 25 mains) to a set of comedians. 
-    # Each time the function recurses, it orders the potential 
-    def assignMainsAndTest(self, extendedDemoList, comediansNotBusy, assignments, demoNumber): 
-        tt = timetable.Timetable(2)
-
-        # If we've reached assignments, we've finished so return true
-        if demoNumber >= 50: 
-            return True
-    
-        # Get the demographic we're looking at in this recursion, and whether we're assigning a test for that demo, or a main 
-        demo = extendedDemoList[demoNumber][0]
-        isTest = extendedDemoList[demoNumber][1]
-        
-        comediansNotBusy = self.applyAssignmentHeuristics(comediansNotBusy, demo, isTest, assignments)
-        # For the new demographic, find the first comedian that can market it, and assign them to it
-        for comedian, hours in comediansNotBusy.items():
-            if tt.canMarket(comedian, demo, isTest): 
-                # Can't use a dict for this one because of duplicate demos (1 test, 1 main) so use list of 3 element tuples
-                t = [demo, comedian, isTest]
-                newHours = 1 if isTest else 2 
-
-                if hours >= newHours: 
-                    # remove hours from comediansNotBusy
-                    comediansNotBusy.update({comedian: hours - newHours})
-                    # remove comedian from available comics if hours left is 0 
-                    if hours == newHours:
-                        del comediansNotBusy[comedian]
-
-                    assignments.append(t)
-
-                    if self.assignMainsAndTest(extendedDemoList, comediansNotBusy, assignments, demoNumber + 1) == True: 
-                        return True
-                        
-                    # If this assignment failed, remove it and add hours and comedian back to list
-                    removed = assignments.pop()
-                    comedian = removed[1]
-                    plusHours = 1 if removed[2] == True else 2
-                    alreadyHours = 0 if comediansNotBusy.get(comedian) == None else comediansNotBusy.get(comedian)
-                    comediansNotBusy.update({comedian: alreadyHours + plusHours})
+            # Add 1 just to indicate that this person CAN do the demo, even if they score 0 on the other suitability criteria
+            comicScores.append([c, 1 + self.weights["sameType"] * counts[c]])
 
-        return False
+        orderedComedians = sorted(self.breakTies(comicScores), reverse=True, key = lambda x: x[1])
+        return [o[0] for o in orderedComedians]
+
+    # Backtracking search for Task 2 and the first part of task 3 (see MainsAndTestsProblem in search.py)
+    # Assigns 50 shows (25 tests and 25 mains, packed as in compactstate.py) to a set of comedians. 
+    # At each show, the comedians are ordered by applyAssignmentHeuristics, and tried in that order
+    def assignMainsAndTest(self, shows, state, comedians, demoNumber): 
+        return self.runSearch(search.MainsAndTestsProblem(self, shows, state, comedians, demoNumber))
         
     # Organies the demographics in descending order of how many comedians can fulfil the show. We can to 
     def getSortedDemoList(self): 
-        tt = timetable.Timetable(2)
         demos = []
         sortedDemos = []
 
         # Iterate over demographics and work out how many comics can do the test/main show for the given topics
         for demographic in self.demographic_List:
-            canDoMainCount = 0
             # Check how many comics are qualified to do the main show for this demo
-            for comedian in self.comedian_List:
-                if tt.canMarket(comedian, demographic, False):
-                    canDoMainCount += 1
+            canDoMainCount = len(self.index.candidates(demographic, False))
             demos.append([demographic, False, canDoMainCount])
 
-            canDoTestCount = 0
             # Check how many comics are qualified to do the test show for this demo
-            for comedian in self.comedian_List:
-                if tt.canMarket(comedian, demographic, True):
-                    canDoTestCount += 1
+            canDoTestCount = len(self.index.candidates(demographic, True))
             demos.append([demographic, True, canDoTestCount])
 
         # Sort list by the number of comics that can do show
@@ -220,34 +273,110 @@ class Scheduler:
 
         return sortedDemos
 
+    # An alternative search for the Task 2/3 pairing, using forward checking (see ForwardCheckingProblem in search.py)
+    # Every show still to be assigned keeps a live domain: a bitmask over comedian ids (see eligibility.py) of who could still take it.
+    # The next show is always the one with the fewest comedians left in its domain, with ties going to the show whose candidates
+    # overlap with the most other shows. When a comedian is down to 1 hour they are removed from every main's domain, and at 0 hours
+    # from every domain, so a show nobody can take any more is spotted straight away rather than when the search reaches it.
+    # The search also keeps count of how many more mains the comedians have the hours for, which has to stay at least the number of mains left.
+    def forwardCheckMainsAndTests(self, state):
+        shows = []
+        domains = []
+        for d in range(len(self.demographic_List)):
+            shows.append(compactstate.packShow(0, d, False))
+            domains.append(self.index.mainComedians[d])
+            shows.append(compactstate.packShow(0, d, True))
+            domains.append(self.index.testComedians[d])
+
+        # The degree of a show is how many other shows share at least one candidate with it
+        degrees = []
+        for s in range(len(shows)):
+            degree = 0
+            for t in range(len(shows)):
+                if t != s and domains[s] & domains[t]:
+                    degree += 1
+            degrees.append(degree)
+
+        # Every show uses up exactly the hours it needs, so if there aren't enough hours in total now, there never will be
+        if self.spec.weeklyHours * len(self.comedian_List) < (problemspec.MAIN_HOURS + problemspec.TEST_HOURS) * len(self.demographic_List):
+            return False
+
+        return self.runSearch(search.ForwardCheckingProblem(self, shows, domains, degrees, state))
+
+    # Pairs every demographic's main and test show with a comedian, for tasks 2 and 3.
+    # mode is either "heuristic" (assignMainsAndTest, over the list from getSortedDemoList) or "forwardchecking" (forwardCheckMainsAndTests)
+    # Returns the packed shows (see compactstate.py), or False if there is no valid pairing
+    def pairShows(self, mode="heuristic"):
+        with self.phase("pairing"):
+            # Keeps every comedian's hours left and show counts, and the shows assigned so far
+            state = compactstate.PairingState(len(self.comedian_List), self.spec.weeklyHours)
+
+            if mode == "forwardchecking":
+                if self.forwardCheckMainsAndTests(state) == False:
+                    print("No valid assignment of demographics (including tests) to comedians was found")
+                    return False
+                return state.shows
+
+            # Get a list of 50 shows, (1 test, 1 main for each demo) sorted by the number of comics that canMarket that show
+            shows = [compactstate.packShow(0, self.index.demographicId(demo), isTest) for demo, isTest, count in self.getSortedDemoList()]
+
+            # We're going to keep a list of the comedians with time left, so we can avoid trying to assign shows to fully-booked comedians
+            comediansNotBusy = list(range(len(self.comedian_List)))
+
+            # Begin backtrack to find a valid pairing between demographics and comedians
+            if self.assignMainsAndTest(shows, state, comediansNotBusy, 0) == False:
+                print("No valid assignment of demographics (including tests) to comedians was found")
+                return False
+            return state.shows
+
+    # The same, as a list of [demo, comedian, isTest]
+    def pairMainsAndTests(self, mode="heuristic"):
+        shows = self.pairShows(mode)
+        if shows == False:
+            return False
+        return [compactstate.unpackShow(self.index, show) for show in shows]
+
     # Task 2 driver - similar to task 1, but does some preprocessing and uses hueristics to cut down run time 
-    def createTestShowSchedule(self):
-        timetableObj = timetable.Timetable(2)
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        assignments = []
-        # Get a list of 50 shows, (1 test, 1 main for each demo) sorted by the number of comics that canMarket that show
-        extendedDemoList = self.getSortedDemoList()
-
-        # We're going to keep a list of comedians and their available time, so we can avoid trying to assign shows to fully-booked comedians
-        comediansNotBusy = {}
-        for comedian in self.comedian_List:
-            comediansNotBusy.update({comedian: 4})
+    def createTestShowSchedule(self, mode="heuristic"):
+        timetableObj = timetable.Timetable(2, self.spec)
+        days = self.spec.dayNames()
+
+        # The week has to have a slot for every show
+        problem = self.spec.checkDemographics(len(self.demographic_List), 2)
+        if problem is not None:
+            print(problem)
+            return False
 
-        # Begin backtrack to find a valid pairing between demographics and comedians
-        if self.assignMainsAndTest(extendedDemoList, comediansNotBusy, assignments, 0) == False:
-            print("No valid assignment of demographics (including tests) to comedians was found")
+        cached = self.cachedSchedule(2, mode)
+        if cached is not None:
+            return cached
+
+        shows = self.pairShows(mode)
+        if shows == False:
             return False
 
+        # In a short week a comedian can have more shows than there are days, so the session by session fill below could give
+        # them a main and a test on the same day. Their days are searched for instead, as in task 3
+        if not self.spec.oneShowADay():
+            timeslots = self.scheduleShows(shows)
+            if timeslots == False:
+                print("No valid way of assigning those demographics to days (cap)")
+                return False
+            timetableObj = self.timeslotsToTimetable(timeslots, 2)
+            self.printTimeslots(timeslots)
+            self.cacheSchedule(2, mode, timetableObj)
+            return timetableObj
+
         # Sort the list alphabetically by comedian name  
-        sortedList = sorted(assignments, key = lambda c: c[1].name)
+        sortedList = sorted([compactstate.unpackShow(self.index, show) for show in shows], key = lambda c: c[1].name)
 
         # Add all the demo/comedian pairs as sessions
         # Filling by session rather than day, in combination with our ordered list of pairs, means we'll never schedule a comedian for 2 sessions in one day
-        for session in range(1,11):
+        for session in range(1, self.spec.slotsPerDay + 1):
             out = " | "
-            for day in range(5):
-                # s counts from 0 to 49
-                s = (session - 1) * 5 + day
+            for day in range(self.spec.days):
+                # s counts from 0 to 49 in the standard week
+                s = (session - 1) * self.spec.days + day
                 isTest = sortedList[s][2]
                 out += "T " if isTest else "M "
                 out += sortedList[s][1].name[:2] + " | "
@@ -255,204 +384,420 @@ class Scheduler:
                 timetableObj.addSession(days[day], session, sortedList[s][1], sortedList[s][0], test)
             print(out)
 
+        self.cacheSchedule(2, mode, timetableObj)
         return timetableObj
         
     ######################### Task 3 utilises a lot of the logic from task 2, with the addition of a CSP to assign the task 2 comic->demo pairs to timeslots in the schedule
     ######## TASK 3 ######### This second CSP uses a new heuristic, that uses a points based system for different features to decide which comic->demo pair to assign to a given timeslot
     ######################### The benefit of scoring possible assignments with points based on what features they have is that we can change the waiting of different potential assignments in order to fine-tune the CSP for time/cost
                                 # the fine tuning can be done manually, by changing the weights of different features, or we can work out the optimal weightings via bruteforcing each combination 
-                                # of weightings and taking the average score over the 8 example sheets. This is a task for a future version, as we found a satsifactory combination of weights by hand in this version, for this problem. 
+                                # of weightings and taking the average score over the 8 example sheets. The defaults were found by hand, and tuner.py searches for better ones
+                                # over any set of problems (grid search, random search or successive halving), writing a profile that createMinCostSchedule can load.
 
-    # Gets the day of the week from the index in a 50 element array
+    # Gets the day of the week from the index in the array of timeslots (50 elements in the standard week)
+    # This used to divide by 10 until the number was below 10, which only worked for 10 slots a day and fewer than 10 days
     def getDay(self, slotNumber): 
-        i = slotNumber
-        if i < 10:
-            i = 0
-        else:
-            while i >= 10:
-                i = i / 10
-        day = int(i) 
-        return day
-
-    # Give every possible next assignment a score, based on whether it is a test/main and the surrounding tests/mains
-    # Then return the list of assignments in descending order of score, so that we try the highest score option next
-    def applySchedulingHeuristics(self, unorderedAssignments, n, timeslots):
-        assignmentScores = {}
+        return self.spec.getDay(slotNumber)
+
+    # Give every possible next show (packed, see compactstate.py) a score, based on whether it is a test/main and the surrounding tests/mains
+    # Then return the list of shows in descending order of score, so that we try the highest score option next
+    def applySchedulingHeuristics(self, unorderedShows, n, timeslots):
+        showScores = []
         day = self.getDay(n)
-        todaysStart = day * 10
-        yesterdaysStart = (todaysStart - 10) if todaysStart > 0 else -1 
-
-        # Iterate over each of the possible next assignments
-        for assignment in unorderedAssignments:
-            assignmentScores.update({tuple(assignment): 0})
-            mainYesterday = False
-            mainToday = False 
-            testsToday = 0
-            c = assignment[1]
-            test = assignment[2]
-
-            # Check the assignments currently in "today". If they are by the same comic, we can work out whether or not we benefit from this assignment
-            for i in range(todaysStart, todaysStart + 10):
-                if timeslots[i] is not None and timeslots[i][1] == c:
-                    if timeslots[i][2] == True:
-                        testsToday += 1 
-                    elif timeslots[i][2] == False:
-                        mainToday = True
-            # If yeseterday exists, then check all the shows yesterday and see if they're by the same comic 
+        state = self.slotState
+
+        # Iterate over each of the possible next shows
+        for show in unorderedShows:
+            score = 0
+            c = compactstate.showComedian(show)
+            test = compactstate.showIsTest(show)
+
+            # Look up the shows this comic already has today, so we can work out whether or not we benefit from this assignment
+            testsToday = state.testsOnDay(c, day)
+            mainToday = state.mainsOnDay(c, day) > 0
+            # If yesterday exists, check whether the comic did a main yesterday
             # We dont care about tests yesterday because we derive no benefit, but we do care about adjacent mains
-            if yesterdaysStart >= 0:
-                for i in range(yesterdaysStart, yesterdaysStart + 10):
-                    if timeslots[i] is not None and timeslots[i][1] == c:
-                        if timeslots[i][2] == False:
-                            mainYesterday = True 
+            mainYesterday = day > 0 and state.mainsOnDay(c, day - 1) > 0
                     
             # If this is a main, and there was a main yesterday, then we should place a high value on putting this assignment in the given timeslot
             if not test and not mainToday and mainYesterday:
-                assignmentScores.update({assignment: 400})
+                score = self.weights["adjacentMain"]
             if test and testsToday == 1:
-                assignmentScores.update({assignment: 300})
-                
-        # Now sort scores by number of comic scores
-        comicScores = self.getShowCounts(unorderedAssignments)
-        for assignment in assignmentScores:
-            comic = assignment[1]
-            isTest = assignment[2]
-            #print(comic)
-            showScore = comicScores.get(comic)
-            if not isTest and (showScore >= 5 and showScore <= 7): 
-                showScore = 0
-            #print(showScore)
-            assignmentScore = assignmentScores.get(assignment)
-            assignmentScores.update({assignment: showScore + assignmentScore})
+                score = self.weights["secondTest"]
 
-        sortedScores = sorted(assignmentScores.items(), key = lambda a: a[1], reverse=True)
-
-        sortedAssignments = []
-        for assignment in sortedScores:
-            sortedAssignments.append(assignment[0])
+            # Add the comic's show score: 5 for each main and 1 for each test they still have to place
+            showScore = 5 * state.unplacedMains[c] + state.unplacedTests[c]
+            if not test and (showScore >= 5 and showScore <= 7): 
+                showScore = 0
+            showScores.append([show, self.weights["showCount"] * showScore + score])
 
-        return sortedAssignments
+        sortedScores = sorted(self.breakTies(showScores), key = lambda a: a[1], reverse=True)
+        return [s[0] for s in sortedScores]
 
     # Before we embark upon the route, try to identify whether we are destined to fail. 
     # If we can spot a future failure ahead, we can cancel this search and go back without wasting time 
-    def futureFailureDetected(self, slotNumber, timeslots, assignments):
+    # This runs at every slot, with the show we're about to try already placed in self.slotState.
+    # It checks two things that any completion of the schedule would need:
+    # 1) every comic still has enough room in the rest of the week: a free day (no shows yet) for each main left,
+    #    and enough free hours over the remaining days (at most spec.dailyHours a day) for all their shows
+    # 2) the remaining shows fit into the remaining slots, checked with a max-flow from comics to days, where a comic
+    #    can put at most as many shows on a day as they have free hours on it
+    def futureFailureDetected(self, slotNumber, timeslots, shows):
         day = self.getDay(slotNumber)
 
-        # If we're on day 4 and still have > 2 hours of shows in assignments, we're going to have a bad time
-        comicHours = {}
-        if day == 4:
-            for a in assignments:
-                c = a[1]
-                t = a[2]
-                newHours = 1 if t else 2
-                hoursAlready = comicHours.get(c) if comicHours.get(c) is not None else 0
-                comicHours.update({c: hoursAlready + newHours})
-
-            for i in range(40, 50):
-                if timeslots[i] is None:
-                    continue
-                if timeslots[i][1] == c:
-                    hoursAlready = comicHours.get(c) if comicHours.get(c) is not None else 0
-                    comicHours.update({c: hoursAlready + 1 if timeslots[i][2] else 2})
-
-        # If it's friday and someone has > 2 hours to do, it's not going to work. Back out 
-        for comic, hours in comicHours.items():
-            if hours > 2: 
+        # The slots still free on each remaining day, once this slot is filled
+        slotsPerDay = self.spec.slotsPerDay
+        freeSlots = []
+        for d in range(day, self.spec.days):
+            freeSlots.append(slotsPerDay * (d + 1) - max(slotNumber + 1, slotsPerDay * d))
+
+        state = self.slotState
+        comics = []
+        freeHours = []
+        for comic in range(len(self.comedian_List)):
+            mains = state.unplacedMains[comic]
+            tests = state.unplacedTests[comic]
+            if mains + tests == 0:
+                continue
+            hours = []
+            for d in range(day, self.spec.days):
+                hours.append(self.spec.dailyHours - state.hoursOnDay(comic, d) if freeSlots[d - day] > 0 else 0)
+            if mains > sum(h // problemspec.MAIN_HOURS for h in hours) or problemspec.MAIN_HOURS * mains + problemspec.TEST_HOURS * tests > sum(hours):
                 return True
+            comics.append(mains + tests)
+            freeHours.append([h // problemspec.TEST_HOURS for h in hours])
+
+        network = matching.FlowNetwork(len(comics) + len(freeSlots) + 2)
+        source = len(comics) + len(freeSlots)
+        sink = source + 1
+        for c in range(len(comics)):
+            network.addEdge(source, c, comics[c])
+            for d in range(len(freeSlots)):
+                if freeHours[c][d] > 0:
+                    network.addEdge(c, len(comics) + d, freeHours[c][d])
+        for d in range(len(freeSlots)):
+            network.addEdge(len(comics) + d, sink, freeSlots[d])
+
+        if network.maxFlow(source, sink) < sum(comics):
+            return True
 
         return False 
 
     # Check for any schedule violations. 
-    def scheduleViolations(self, timeslots, slotNumber, assignments, assignment):
+    def scheduleViolations(self, timeslots, slotNumber, shows, show):
         day = self.getDay(slotNumber)
-        todaysStart = day * 10
 
-        # Try to detect if this configuration is destined to fail so we can backtrack early
-        if self.futureFailureDetected(slotNumber, timeslots, assignments):
+        todayHours = self.slotState.hoursOnDay(compactstate.showComedian(show), day)
+        hours = compactstate.showHours(show)
+        if self.stats is not None:
+            self.stats.check()
+        
+        if todayHours + hours > self.spec.dailyHours:
+            if self.stats is not None:
+                self.stats.prune("dailyCap")
             return True
 
-        comedian = assignment[1]
-        hours = 1 if assignment[2] == True else 2
-        todayHours = 0 
-        for i in range(todaysStart, todaysStart + 10):
-            if timeslots[i] == None:
-                continue
-            if timeslots[i][1] == comedian:
-                if timeslots[i][2] == False:
-                    todayHours += 2
-                elif timeslots[i][2] == True:
-                    todayHours += 1
-        
-        if todayHours + hours > 2:
+        # Try to detect if this configuration is destined to fail so we can backtrack early
+        self.placeShow(show, slotNumber)
+        failure = self.futureFailureDetected(slotNumber, timeslots, shows)
+        self.unplaceShow(show, slotNumber)
+        if failure:
+            if self.stats is not None:
+                self.stats.prune("futureFailure")
             return True
 
         return False
 
-    # Our second CSP, that takes a list of comic->show assignments, and tries to give them time slots to produce an optimal cost.
-    def assignShowsToDays(self, assignments, timeslots, slotNumber):
-        # If we've reached 50 assignments, we've finished (base) so return true
-        if slotNumber >= 50: 
+    # Keep the count of each comic's shows on each day, and of their unplaced mains/tests, up to date as assignShowsToDays places shows
+    def placeShow(self, show, slotNumber):
+        self.slotState.place(show, self.getDay(slotNumber))
+
+    def unplaceShow(self, show, slotNumber):
+        self.slotState.remove(show, self.getDay(slotNumber))
+
+    # Our second CSP, that takes a list of packed comic->show assignments (see compactstate.py), and tries to give them time slots to produce an optimal cost.
+    # timeslots is an array of packed shows, with compactstate.EMPTY in the slots still to fill.
+    # self.slotState mirrors the filled timeslots, so the heuristics and constraint checks can look up each comic's day in O(1)
+    def assignShowsToDays(self, shows, timeslots, slotNumber):
+        if slotNumber == 0:
+            self.slotState = compactstate.SlotState(len(self.comedian_List), self.spec.days)
+            for i in range(len(timeslots)):
+                if timeslots[i] != compactstate.EMPTY:
+                    self.slotState.addUnplaced(timeslots[i])
+                    self.placeShow(timeslots[i], i)
+            for show in shows:
+                self.slotState.addUnplaced(show)
+
+        # Before we pick each show, they are ordered from best to worst, judged with a points based system in applySchedulingHeuristics()
+        # Then we pick the next show, check if it violates, and if not move on to the next slot, backtracking when we reach failure
+        with self.phase("slots"):
+            return self.runSearch(search.ShowsToDaysProblem(self, shows, timeslots, slotNumber))
+
+    # The optimal alternative to assignShowsToDays (see dayassignment.py): finds the cheapest week for the paired shows from
+    # each comedian's day patterns, rather than slot by slot, and fills the timeslots with it. Returns False if the shows don't fit
+    def assignOptimalDays(self, shows, timeslots):
+        with self.phase("slots"):
+            # Each comedian's mains and tests, to hand out to the days their patterns pick
+            mains = {}
+            tests = {}
+            for show in shows:
+                (tests if compactstate.showIsTest(show) else mains).setdefault(compactstate.showComedian(show), []).append(show)
+            types = [[c, (len(mains.get(c, [])), len(tests.get(c, [])))] for c in sorted(set(mains) | set(tests))]
+
+            self.dayAssignment = dayassignment.DayAssignment(lowerbound.dayPatterns(self.spec.days, self.spec.weeklyHours), self.spec.days, self.spec.slotsPerDay)
+            if self.dayAssignment.solve(types, shouldStop=self.shouldStop) is None:
+                return False
+            for day, dayShows in enumerate(self.dayAssignment.week()):
+                for session, [c, isTest] in enumerate(dayShows):
+                    timeslots[day * self.spec.slotsPerDay + session] = (tests if isTest else mains)[c].pop()
             return True
 
-        if timeslots[slotNumber] is not None:
-            print("Error - trying to allocate to a timeslot that has already been filled")
-
-        # Before we pick an assignment, order them in order of best to worst
-        # Best and worst are judged with a points based system in applySchedulingHeuristic()
-        assignments = self.applySchedulingHeuristics(assignments, slotNumber, timeslots)
-        
-        # Pick the next assignment, check if it violates, if not recurse until we reach failure.
-        for assignment in assignments:
-            if self.scheduleViolations(timeslots, slotNumber, assignments, assignment) == False:
-                timeslots[slotNumber] = assignment
-                assignments.remove(assignment)
-                if self.assignShowsToDays(assignments, timeslots, slotNumber + 1) == True: 
-                    return True
-                assignments.append(timeslots[slotNumber])
-                timeslots[slotNumber] = None
-
-        return False
-
-    # Driver function for Task 3
+    # Runs both of the task 3 CSPs, and returns the filled timeslots (50 in the standard week), or False if either CSP fails
     # We have split this task into 2 CSP's.
     # 1) We assign Comics->Demographics using the same CSP as Task 2
     # 2) We then assign those pairs to timeslots using a new CSP specifically for producing the lowest cost schedule
-    def createMinCostSchedule(self):
-        tt = timetable.Timetable(3)
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        assignments = []
-        timeslots = [None] * 50
-        output = [""] * 10
-
-        # Get a list of 50 shows, (1 test, 1 main for each demo) sorted by the number of comics that canMarket that show
-        extendedDemoList = self.getSortedDemoList()
-
-        # We're going to keep a list of comedians and their available time, so we can avoid trying to assign shows to fully-booked comedians
-        comediansNotBusy = {}
-        for comedian in self.comedian_List:
-            comediansNotBusy.update({comedian: 4})
+    #    (or, with daysMode "optimal", the cheapest days for those pairs)
+    def findMinCostTimeslots(self, mode="heuristic"):
+        # The week has to have a slot for every show
+        problem = self.spec.checkDemographics(len(self.demographic_List), 3)
+        if problem is not None:
+            print(problem)
+            return False
 
-        # Begin backtrack to find a valid pairing between demographics and comedians
-        if self.assignMainsAndTest(extendedDemoList, comediansNotBusy, assignments, 0) == False:
-            print("No valid assignment of demographics (including tests) to comedians was found")
+        # The day patterns are only a main, a test or two tests a day
+        if self.daysMode == "optimal" and self.spec.dailyHours != 2:
+            print("The optimal day assignment only works with the standard 2 hour daily cap")
             return False
 
-        sortedAssignments = sorted(assignments, key = lambda a: a[1].name)
-        if self.assignShowsToDays(sortedAssignments, timeslots, 0) == False:
+        # Find a valid pairing between demographics and comedians
+        shows = self.pairShows(mode)
+        if shows == False:
+            return False
+        return self.scheduleShows(shows, self.daysMode)
+
+    # The second task 3 CSP on its own: gives paired shows (packed, see compactstate.py) their slots, with the search in
+    # assignShowsToDays or, with daysMode "optimal", assignOptimalDays. Returns the filled timeslots as [demo, comedian, isTest],
+    # or False if the shows don't fit
+    def scheduleShows(self, shows, daysMode="heuristic"):
+        timeslots = array("l", [compactstate.EMPTY]) * self.spec.slots()
+        sortedShows = sorted(shows, key = lambda show: self.comedian_List[compactstate.showComedian(show)].name)
+        if daysMode == "optimal":
+            found = self.assignOptimalDays(sortedShows, timeslots)
+        else:
+            found = self.assignShowsToDays(sortedShows, timeslots, 0)
+        if found == False:
             print("No valid way of assigning those demographics to days (cap)")
             return False
 
-        # Convert the list of timeslots & comic/show pairs into a timetable 
-        for i in range(50):
+        # Back to [demo, comedian, isTest], for the timetable and the improvement stages
+        return [compactstate.unpackShow(self.index, show) for show in timeslots]
+
+    # Convert the list of timeslots & comic/show pairs into a timetable 
+    def timeslotsToTimetable(self, timeslots, taskNumber=3):
+        tt = timetable.Timetable(taskNumber, self.spec)
+        days = self.spec.dayNames()
+        for i in range(len(timeslots)):
             day = self.getDay(i)
-            session = (i % 10)
+            session = (i % self.spec.slotsPerDay)
             d = timeslots[i][0]
             c = timeslots[i][1]
             t = timeslots[i][2]
-            output[session] += (" T " if t else " M ") + c.name[:2] + " |"
             tt.addSession(days[day], session + 1, c, d, "test" if t else "main")
+        return tt
+
+    # The cost of a filled list of timeslots under the task 3 cost rules (see costmodel.py)
+    def timeslotsCost(self, timeslots):
+        costModel = costmodel.CostModel(self.spec.days, self.spec.dailyHours, self.spec.weeklyHours)
+        for i in range(len(timeslots)):
+            costModel.place(timeslots[i][1], self.getDay(i), timeslots[i][2])
+        return costModel.cost
+
+    def lowerBound(self):
+        if self.rootBound is False:
+            self.rootBound = lowerbound.lowerBound(self)
+        return self.rootBound
+
+    # Records the cost of the schedule a task 3 solve found against the lower bound, or against bound if it has a better one.
+    # The lower bound is only worked out if reportGap or gapTarget asks for it
+    def recordGap(self, cost, bound=None):
+        self.incumbent = cost
+        self.bound = self.lowerBound() if self.reportGap or self.gapTarget is not None else None
+        if bound is not None and (self.bound is None or bound > self.bound):
+            self.bound = bound
+        self.gap = None if self.bound is None else lowerbound.gap(cost, self.bound)
+
+    def printGap(self):
+        if self.bound is None:
+            print("Cost " + str(self.incumbent))
+        else:
+            print("Cost " + str(self.incumbent) + ", lower bound " + str(self.bound) + " (gap " + str(round(self.gap * 100, 2)) + "%)")
+
+    # The cost a schedule has to get down to for its gap to be within gapTarget, or None if there is no target or no bound
+    def targetCost(self):
+        if self.gapTarget is None:
+            return None
+        bound = self.lowerBound()
+        if bound is None:
+            return None
+        return bound / (1 - self.gapTarget) if self.gapTarget < 1 else float("inf")
+
+    # Print the week as a grid, one row per session
+    def printTimeslots(self, timeslots):
+        output = [""] * self.spec.slotsPerDay
+        for i in range(len(timeslots)):
+            session = (i % self.spec.slotsPerDay)
+            c = timeslots[i][1]
+            t = timeslots[i][2]
+            output[session] += (" T " if t else " M ") + c.name[:2] + " |"
 
         for o in output:
             print(o)
 
+    # Reads the weights from a profile written by tuner.py
+    def readWeights(self, filename):
+        with open(filename) as f:
+            return json.load(f)["weights"]
+
+    # Sets the heuristic weights for every later solve from a profile written by tuner.py. Weights the file doesn't give keep
+    # their current values
+    def loadWeights(self, filename):
+        self.weights.update(self.readWeights(filename))
+
+    # Driver function for Task 3. mode picks the pairing search, as in pairMainsAndTests
+    # weights, if given, is either a dict of changes to the heuristic weights or the filename of a profile written by tuner.py,
+    # and is only used for this call (use loadWeights to keep a profile for every solve)
+    def createMinCostSchedule(self, mode="heuristic", weights=None):
+        if weights is None:
+            return self.minCostSchedule(mode)
+
+        if isinstance(weights, str):
+            weights = self.readWeights(weights)
+        defaultWeights = self.weights
+        self.weights = dict(defaultWeights)
+        self.weights.update(weights)
+        try:
+            return self.minCostSchedule(mode)
+        finally:
+            self.weights = defaultWeights
+
+    # createMinCostSchedule with the scheduler's current weights
+    def minCostSchedule(self, mode):
+        cached = self.cachedSchedule(3, mode)
+        if cached is not None:
+            # A cached schedule comes back without working anything out, including the bound
+            self.incumbent = cached.cost
+            self.bound = None
+            self.gap = None
+            self.printGap()
+            return cached
+
+        timeslots = self.findMinCostTimeslots(mode)
+        if timeslots == False:
+            return False
+
+        tt = self.timeslotsToTimetable(timeslots)
+        self.printTimeslots(timeslots)
+        self.recordGap(self.timeslotsCost(timeslots))
+        self.printGap()
+        self.cacheSchedule(3, mode, tt)
+        return tt
+
+    # Task 3 with an improvement stage: the first feasible schedule found by createMinCostSchedule's CSPs is then improved by
+    # simulated annealing (see localsearch.py) for timeLimit seconds and/or a number of iterations.
+    # The timeslots are improved in place, and the best schedule found is returned, early once its gap is within gapTarget
+    def createImprovedSchedule(self, timeLimit=1.0, iterations=None, seed=None):
+        timeslots = self.findMinCostTimeslots()
+        if timeslots == False:
+            return False
+
+        self.localSearch = localsearch.LocalSearch(self, timeslots, seed=seed)
+        timeslots[:] = self.localSearch.run(timeLimit, iterations, stopAt=self.targetCost())
+
+        tt = self.timeslotsToTimetable(timeslots)
+        self.printTimeslots(timeslots)
+        self.recordGap(self.localSearch.bestCost)
+        self.printGap()
+        return tt
+
+    # Task 3 with the pairing and the days improved together: the first feasible schedule found by createMinCostSchedule's CSPs
+    # is torn down and rebuilt a few comedians (or a day) at a time by large neighbourhood search (see lns.py), for timeLimit
+    # seconds and/or a number of rebuilds, or until its gap is within gapTarget.
+    # onImprove(cost, timetable), if given, is called with each cheaper schedule as soon as it is found
+    def createLNSSchedule(self, timeLimit=1.0, iterations=None, seed=None, onImprove=None):
+        timeslots = self.findMinCostTimeslots()
+        if timeslots == False:
+            return False
+
+        self.lns = lns.LNS(self, timeslots, seed=seed)
+        improved = None
+        if onImprove is not None:
+            improved = lambda cost, timeslots: onImprove(cost, self.timeslotsToTimetable(timeslots))
+        timeslots = self.lns.run(timeLimit, iterations, improved, self.targetCost())
+
+        tt = self.timeslotsToTimetable(timeslots)
+        self.printTimeslots(timeslots)
+        self.recordGap(self.lns.bestCost)
+        self.printGap()
+        return tt
+
+    # Task 3 for a problem that is last week's with a few changes (see repair.py): previous is last week's task 3 timetable,
+    # and only the shows it can't keep are searched again, falling back to createMinCostSchedule's CSPs if that fails.
+    # This week's lists can be made from last week's and a diff with repair.applyDiff
+    def repairSchedule(self, previous, mode="heuristic", nodeLimit=20000):
+        self.repair = repair.Repair(self, previous, nodeLimit)
+        timeslots = self.repair.run(mode)
+        if timeslots == False:
+            return False
+
+        tt = self.timeslotsToTimetable(timeslots)
+        self.printTimeslots(timeslots)
+        self.recordGap(self.timeslotsCost(timeslots))
+        self.printGap()
+        if self.repair.fellBack:
+            print("Last week's schedule couldn't be repaired, so it was solved again from scratch")
+        print(str(self.repair.churn) + " of " + str(len(timeslots)) + " shows changed from last week's schedule")
+        return tt
+
+    # Exact alternative to createMinCostSchedule, see exactsolver.py
+    # The heuristic schedule is found first and used as the starting incumbent, then the exact engine tries to beat it.
+    # If timeLimit (seconds) runs out, or the gap gets within gapTarget, the best schedule found so far is returned, and the
+    # optimality gap is reported
+    def createOptimalSchedule(self, timeLimit=None):
+        # The exact solver's bounds rely on the standard caps, e.g. that a comedian can do at most 2 mains a week
+        if not self.spec.hasStandardCaps():
+            print("The exact solver only works with the standard 2 hours a day and 4 hours a week caps")
+            return False
+
+        incumbent = None
+        timeslots = self.findMinCostTimeslots()
+        if timeslots != False:
+            tt = self.timeslotsToTimetable(timeslots)
+            if tt.scheduleChecker(self.comedian_List, self.demographic_List):
+                incumbent = [tt.cost, timeslots]
+
+        self.exactSolver = exactsolver.ExactSolver(self)
+        timeslots = self.exactSolver.solve(timeLimit, incumbent, self.gapTarget)
+        if timeslots == False:
+            print("No valid schedule exists")
+            return False
+
+        tt = self.timeslotsToTimetable(timeslots)
+        self.printTimeslots(timeslots)
+        self.recordGap(self.exactSolver.cost, self.exactSolver.lowerBound)
+        if self.exactSolver.optimal:
+            print("Optimal schedule found with a cost of " + str(self.exactSolver.cost))
+        else:
+            print("Best schedule found has a cost of " + str(self.exactSolver.cost) + ", lower bound " + str(self.bound) + " (gap " + str(round(self.gap * 100, 2)) + "%)")
+        return tt
+
+    # Solves task 1, 2 or 3 with a portfolio of differently configured solvers running in parallel, one per core (see portfolio.py)
+    # Tasks 1 and 2 return the first schedule any of them finds, and task 3 the cheapest one found within timeLimit seconds
+    def createPortfolioSchedule(self, task, timeLimit=10.0, workers=None, seed=0):
+        self.portfolio = portfolio.Portfolio(self.comedian_List, self.demographic_List, workers, seed, self.spec)
+        tt = self.portfolio.solve(task, timeLimit)
+        if tt == False:
+            print("None of the solvers in the portfolio found a schedule")
+            return False
+
+        print("Schedule found by the configuration " + str(self.portfolio.winner))
         return tt
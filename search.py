@@ -0,0 +1,596 @@
+import time
+from array import array
+from collections import OrderedDict
+import problemspec
+import compactstate
+
+#An iterative backtracking engine, used by every CSP in scheduler.py instead of recursion
+#
+#A search problem provides:
+#   isComplete()              - True once every variable has a value
+#   choices()                 - an iterable (usually a generator) of the choices for the next variable, in the order to try them.
+#                               It is consumed lazily, so each choice can be checked against the state as it is at that moment
+#   apply(choice, trail)      - makes the choice, recording how to undo every change on the trail.
+#                               Returns False if the choice turned out to be inconsistent (the engine undoes it)
+#and optionally:
+#   signature()               - a hashable key of everything the rest of the search depends on, so that two states with the
+#                               same key either both have a solution or both don't. With a NogoodTable, the engine looks each
+#                               state up before expanding it, and fails it straight away if it has failed before
+#
+#Symmetry breaking: comedians with the same themes are interchangeable, and so are demographics with the same topics (see
+#EligibilityIndex.comedianClasses and demographicClasses). The pairing searches only look for assignments in the order
+#LexOrder below allows, and the slot search skips any show the state can't tell apart from one that has already failed
+#at the same node. Either way, a subtree is only skipped if a symmetric copy of it is searched instead.
+#
+#The engine keeps an explicit stack with one frame per variable: the iterator over its choices, and the trail position to
+#return to before trying the next one. That means no recursion limit, and that a search can be paused (by a node/time budget,
+#or by calling pause() from a callback), resumed by calling run() again, or cancelled, which puts the problem back the way it started.
+
+# The Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ... (counting i from 1), used to space out restarts
+def luby(i):
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if (1 << k) - 1 == i:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+#Records how to undo every change made since a mark, so backtracking can put the state back exactly as it was
+class Trail:
+
+    def __init__(self):
+        self.entries = []
+
+    def mark(self):
+        return len(self.entries)
+
+    # Records a function that undoes a change the caller has just made
+    def push(self, undo):
+        self.entries.append(undo)
+
+    # Sets container[key] = value (for a list, dict or anything else that supports item assignment), recording the old value
+    def setItem(self, container, key, value):
+        if isinstance(container, dict) and key not in container:
+            self.entries.append(lambda: container.__delitem__(key))
+        else:
+            old = container[key]
+            self.entries.append(lambda: container.__setitem__(key, old))
+        container[key] = value
+
+    # Sets obj.name = value, recording the old value
+    def setAttr(self, obj, name, value):
+        old = getattr(obj, name)
+        self.entries.append(lambda: setattr(obj, name, old))
+        setattr(obj, name, value)
+
+    def undoTo(self, mark):
+        while len(self.entries) > mark:
+            self.entries.pop()()
+
+#A bounded memo of the states ("nogoods") whose whole subtree has been searched without finding a solution, keyed by the
+#problem's signature(). One table can be shared by every search a scheduler runs, including restarts, as long as the
+#signatures of different problems can't clash. A state is only added once every one of its choices has failed, never
+#when a search is paused or cancelled part way through it. The table keeps the maxEntries most recently used states
+#(a slot search state takes about 500 bytes, so the default cap is about 25MB).
+class NogoodTable:
+
+    def __init__(self, maxEntries=50000):
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def contains(self, key):
+        self.lookups += 1
+        if key not in self.entries:
+            return False
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def add(self, key):
+        self.entries[key] = True
+        self.entries.move_to_end(key)
+        self.stores += 1
+        if len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def hitRate(self):
+        return self.hits / self.lookups if self.lookups > 0 else 0
+
+    def clear(self):
+        self.entries.clear()
+
+class Search:
+
+    # stats is an optional stats.SearchStats to count nodes and backtracks in.
+    # nogoods is an optional NogoodTable, used if the problem has a signature()
+    def __init__(self, problem, stats=None, nogoods=None):
+        self.problem = problem
+        self.stats = stats
+        self.nogoods = nogoods if hasattr(problem, "signature") else None
+        self.trail = Trail()
+        self.stack = []
+        # ready -> running -> paused/solved/failed/cancelled. A paused search can be run again
+        self.status = "ready"
+        self.pauseRequested = False
+        self.nodes = 0
+        self.backtracks = 0
+
+    # Asks a running search to stop at the next node. It can be carried on with run()
+    def pause(self):
+        self.pauseRequested = True
+
+    # Stops the search for good, undoing every choice so the problem's state is back to how it started
+    def cancel(self):
+        self.trail.undoTo(0)
+        self.stack = []
+        self.status = "cancelled"
+
+    # Searches until a solution is found (True), the search space is exhausted (False),
+    # or it is paused by pause(), nodeLimit more nodes or timeLimit more seconds (None)
+    # On a solution, the problem is left in the solved state
+    def run(self, nodeLimit=None, timeLimit=None):
+        if self.status == "solved":
+            return True
+        if self.status in ("failed", "cancelled"):
+            return False
+
+        if self.status == "ready":
+            if self.problem.isComplete():
+                self.status = "solved"
+                return True
+            if not self.expand():
+                self.status = "failed"
+                return False
+
+        self.status = "running"
+        self.pauseRequested = False
+        nodeBudget = None if nodeLimit is None else self.nodes + nodeLimit
+        deadline = None if timeLimit is None else time.time() + timeLimit
+
+        while self.stack:
+            if self.pauseRequested or (nodeBudget is not None and self.nodes >= nodeBudget):
+                self.status = "paused"
+                return None
+            if deadline is not None and self.nodes % 64 == 0 and time.time() > deadline:
+                self.status = "paused"
+                return None
+
+            # Put the state back to how it was when this frame was pushed, then try its next choice
+            frame = self.stack[-1]
+            self.trail.undoTo(frame[1])
+            choice = next(frame[0], None)
+            if choice is None:
+                self.stack.pop()
+                if frame[2] is not None:
+                    self.nogoods.add(frame[2])
+                self.backtracks += 1
+                if self.stats is not None:
+                    self.stats.backtrack(len(self.stack))
+                continue
+
+            self.nodes += 1
+            if self.stats is not None:
+                self.stats.node(len(self.stack) - 1)
+            if not self.problem.apply(choice, self.trail):
+                continue
+            if self.problem.isComplete():
+                self.status = "solved"
+                return True
+            self.expand()
+
+        self.status = "failed"
+        return False
+
+    # Pushes a frame for the problem's next variable: the iterator over its choices, the trail position to return to before
+    # each one, and the state's signature if nogoods are on. Returns False, without pushing, if the state is a known nogood
+    def expand(self):
+        key = None
+        if self.nogoods is not None:
+            key = self.problem.signature()
+            hit = self.nogoods.contains(key)
+            if self.stats is not None:
+                self.stats.nogoodLookup(hit)
+            if hit:
+                return False
+        self.stack.append([iter(self.problem.choices()), self.trail.mark(), key])
+        return True
+
+# For each entry, the index of the last entry before it with the same key, or None
+def previousWithSame(keys):
+    previous = []
+    last = {}
+    for i, key in enumerate(keys):
+        previous.append(last.get(key))
+        last[key] = i
+    return previous
+
+# The key LexOrder groups packed shows by: the class of the show's demographic, and whether it is a test
+def showClasses(index, shows):
+    return [(index.demographicClasses[compactstate.showDemographic(show)], compactstate.showIsTest(show)) for show in shows]
+
+#Symmetry breaking for the pairing searches, which give each show (a row) one comedian (a column). Rows whose shows are of
+#the same type for demographics of the same class are interchangeable, and so are the columns of comedians of the same class.
+#Swapping rows and columns around can turn any solution into one where
+#   - of two interchangeable shows, the later one gets a comedian with an id at least as high (the rows are in lex order)
+#   - a comedian is only given a show once the comedian before them in their class has had one that they haven't (the
+#     columns are in lex order, when the rows are assigned in order)
+#so searching only those assignments loses nothing but symmetric copies ("double lex", Flener et al.). It also means that a
+#search that tries comedians in id order, as task 1's does, still finds the same first solution.
+#With columns False (for searches that don't assign the rows in order) only the rows are ordered
+class LexOrder:
+
+    def __init__(self, index, showKeys, columns=True):
+        self.columns = columns
+        # The shows interchangeable with each one, in order, and the comedian each show has (or compactstate.EMPTY)
+        groups = {}
+        for s, key in enumerate(showKeys):
+            groups.setdefault(key, []).append(s)
+        self.group = [groups[key] for key in showKeys]
+        self.previous = previousWithSame(showKeys)
+        self.comedianOf = array("l", [compactstate.EMPTY]) * len(showKeys)
+        # The next comedian in each comedian's class (or EMPTY), and whether each comedian has had exactly the same shows
+        # as the one before them in their class so far
+        self.nextComedian = array("l", [compactstate.EMPTY]) * len(index.comedianClasses)
+        self.tied = compactstate.zeros(len(index.comedianClasses))
+        for c, previous in enumerate(previousWithSame(index.comedianClasses)):
+            if previous is not None:
+                self.nextComedian[previous] = c
+                self.tied[c] = 1
+
+    # Can show s be given comedian c?
+    def allows(self, s, c):
+        if self.columns and self.tied[c]:
+            return False
+        for t in self.group[s]:
+            other = self.comedianOf[t]
+            if other == compactstate.EMPTY:
+                continue
+            if (t < s and c < other) or (t > s and c > other):
+                return False
+        return True
+
+    # What allows depends on for the shows from s on, when the shows before s have been assigned in order: the comedian of
+    # the last show assigned in each group that still has shows to go, and which comedians are still tied
+    def signature(self, s):
+        last = tuple(self.comedianOf[self.previous[r]] for r in range(s, len(self.group)) if self.previous[r] is not None and self.previous[r] < s)
+        return (last, self.tied.tobytes() if self.columns else None)
+
+    def assign(self, s, c, trail):
+        trail.setItem(self.comedianOf, s, c)
+        following = self.nextComedian[c]
+        if self.columns and following != compactstate.EMPTY and self.tied[following]:
+            trail.setItem(self.tied, following, 0)
+
+# True (counting a prune) if the symmetry breaking rules a choice out
+def symmetryPrune(stats, ruledOut):
+    if ruledOut and stats is not None:
+        stats.prune("symmetry")
+    return ruledOut
+
+#Task 1: give each demographic (from demoNumber onwards) a comedian who can do its main, with no comedian doing more than 2
+#(or spec.mainsPerWeek()). matches holds the comedian id given to each demographic, or compactstate.EMPTY
+class MainsProblem:
+
+    def __init__(self, scheduler, matches, demoNumber):
+        self.scheduler = scheduler
+        self.matches = matches
+        self.demoNumber = demoNumber
+        self.mainsPerWeek = scheduler.spec.mainsPerWeek()
+        # How many mains each comedian has, by comedian id
+        self.mainCounts = compactstate.zeros(len(scheduler.comedian_List))
+        for c in matches:
+            if c != compactstate.EMPTY:
+                self.mainCounts[c] += 1
+        self.lexOrder = None
+        if scheduler.symmetryBreaking:
+            self.lexOrder = LexOrder(scheduler.index, scheduler.index.demographicClasses)
+            for d in range(demoNumber):
+                if matches[d] != compactstate.EMPTY:
+                    self.lexOrder.assign(d, matches[d], Trail())
+
+    def isComplete(self):
+        return self.demoNumber >= len(self.matches)
+
+    def choices(self):
+        lexOrder = self.lexOrder
+        for c in self.scheduler.breakTies(self.scheduler.index.candidateIds(self.demoNumber, False)):
+            if lexOrder is not None and symmetryPrune(self.scheduler.stats, not lexOrder.allows(self.demoNumber, c)):
+                continue
+            yield c
+
+    def apply(self, c, trail):
+        stats = self.scheduler.stats
+        if stats is not None:
+            stats.check()
+        if self.mainCounts[c] >= self.mainsPerWeek:
+            if stats is not None:
+                stats.prune("hoursCap")
+            return False
+        trail.setItem(self.matches, self.demoNumber, c)
+        trail.setItem(self.mainCounts, c, self.mainCounts[c] + 1)
+        if self.lexOrder is not None:
+            self.lexOrder.assign(self.demoNumber, c, trail)
+        trail.setAttr(self, "demoNumber", self.demoNumber + 1)
+        return True
+
+#Task 2 and the first half of task 3: give each show in shows (packed without a comedian, see compactstate.py) a comedian,
+#ordered by applyAssignmentHeuristics. comedians lists the ids of the comedians with hours left, and a comedian is taken out
+#of it once they have none left. Each node works on its own ordered copy of the list, made by applyAssignmentHeuristics
+class MainsAndTestsProblem:
+
+    def __init__(self, scheduler, shows, state, comedians, demoNumber):
+        self.scheduler = scheduler
+        self.shows = shows
+        self.state = state
+        self.comedians = comedians
+        self.demoNumber = demoNumber
+        # Tells this problem's nogoods apart from those of any other list of shows
+        self.showsKey = ("pairing", tuple(shows))
+        self.lexOrder = None
+        if scheduler.symmetryBreaking:
+            self.lexOrder = LexOrder(scheduler.index, showClasses(scheduler.index, shows))
+            for s, show in enumerate(state.shows[:demoNumber]):
+                self.lexOrder.assign(s, compactstate.showComedian(show), Trail())
+
+    def isComplete(self):
+        return self.demoNumber >= len(self.shows)
+
+    # The rest of the search only depends on which shows are left, the hours each comedian has left (which also decides who
+    # is in the comedians list), and the symmetry breaking. The show counts only change the order comedians are tried in
+    def signature(self):
+        lexOrder = None if self.lexOrder is None else self.lexOrder.signature(self.demoNumber)
+        return (self.showsKey, self.demoNumber, self.state.hoursLeft.tobytes(), lexOrder)
+
+    def choices(self):
+        show = self.shows[self.demoNumber]
+        d = compactstate.showDemographic(show)
+        isTest = compactstate.showIsTest(show)
+        newHours = compactstate.showHours(show)
+        comedians = self.scheduler.applyAssignmentHeuristics(self.comedians, d, isTest, self.state)
+
+        # Iterate over a snapshot, since apply takes comedians out of the list and undoing puts them back at the end
+        index = self.scheduler.index
+        hoursLeft = self.state.hoursLeft
+        stats = self.scheduler.stats
+        lexOrder = self.lexOrder
+        for c in list(comedians):
+            if not index.canMarketIds(c, d, isTest):
+                continue
+            if stats is not None:
+                stats.check()
+            if hoursLeft[c] < newHours:
+                if stats is not None:
+                    stats.prune("hoursCap")
+                continue
+            if lexOrder is not None and symmetryPrune(stats, not lexOrder.allows(self.demoNumber, c)):
+                continue
+            yield [comedians, show, c]
+
+    def apply(self, choice, trail):
+        [comedians, show, c] = choice
+        state = self.state
+
+        # remove hours from the comedian, and remove the comedian from available comics if they have no hours left
+        trail.setItem(state.hoursLeft, c, state.hoursLeft[c] - compactstate.showHours(show))
+        if state.hoursLeft[c] == 0:
+            comedians.remove(c)
+            trail.push(lambda: comedians.append(c))
+        counts = state.testCounts if compactstate.showIsTest(show) else state.mainCounts
+        trail.setItem(counts, c, counts[c] + 1)
+
+        state.shows.append(compactstate.withComedian(show, c))
+        trail.push(state.shows.pop)
+        if self.lexOrder is not None:
+            self.lexOrder.assign(self.demoNumber, c, trail)
+        trail.setAttr(self, "comedians", comedians)
+        trail.setAttr(self, "demoNumber", self.demoNumber + 1)
+        return True
+
+#The forward checking version of the task 2/3 pairing (see Scheduler.forwardCheckMainsAndTests)
+class ForwardCheckingProblem:
+
+    def __init__(self, scheduler, shows, domains, degrees, state):
+        self.scheduler = scheduler
+        self.shows = shows
+        self.domains = domains
+        self.degrees = degrees
+        self.state = state
+        # How many more mains the comedians have the hours for, and how many mains are left to assign
+        self.mainSlots = sum(hours // problemspec.MAIN_HOURS for hours in state.hoursLeft)
+        self.mainsLeft = sum(1 for show in shows if not compactstate.showIsTest(show))
+        self.remaining = len(shows)
+        # The shows aren't assigned in order, so only the rows can be kept in lex order
+        self.lexOrder = LexOrder(scheduler.index, showClasses(scheduler.index, shows), False) if scheduler.symmetryBreaking else None
+
+    def isComplete(self):
+        return self.remaining == 0
+
+    # Pick the most constrained show that hasn't been assigned yet, breaking ties by degree
+    def mostConstrainedShow(self):
+        best = None
+        bestSize = 0
+        for s in range(len(self.shows)):
+            if self.domains[s] is None:
+                continue
+            size = bin(self.domains[s]).count("1")
+            if best is None or size < bestSize or (size == bestSize and self.degrees[s] > self.degrees[best]):
+                best = s
+                bestSize = size
+        return best
+
+    def choices(self):
+        best = self.mostConstrainedShow()
+        isTest = compactstate.showIsTest(self.shows[best])
+
+        # Like applyAssignmentHeuristics, try comedians who already do this type of show first
+        candidates = []
+        c = 0
+        mask = self.domains[best]
+        while mask:
+            if mask & 1:
+                candidates.append(c)
+            mask >>= 1
+            c += 1
+        candidates = self.scheduler.breakTies(candidates)
+        counts = self.state.testCounts if isTest else self.state.mainCounts
+        candidates.sort(key = lambda c: -counts[c])
+        lexOrder = self.lexOrder
+        for c in candidates:
+            if lexOrder is not None and symmetryPrune(self.scheduler.stats, not lexOrder.allows(best, c)):
+                continue
+            yield [best, c]
+
+    def apply(self, choice, trail):
+        [s, c] = choice
+        show = self.shows[s]
+        state = self.state
+
+        trail.setItem(self.domains, s, None)
+        trail.setAttr(self, "remaining", self.remaining - 1)
+        if self.lexOrder is not None:
+            self.lexOrder.assign(s, c, trail)
+        if not compactstate.showIsTest(show):
+            trail.setAttr(self, "mainsLeft", self.mainsLeft - 1)
+        slotsBefore = state.hoursLeft[c] // problemspec.MAIN_HOURS
+        trail.setItem(state.hoursLeft, c, state.hoursLeft[c] - compactstate.showHours(show))
+        counts = state.testCounts if compactstate.showIsTest(show) else state.mainCounts
+        trail.setItem(counts, c, counts[c] + 1)
+        trail.setAttr(self, "mainSlots", self.mainSlots + state.hoursLeft[c] // problemspec.MAIN_HOURS - slotsBefore)
+        state.shows.append(compactstate.withComedian(show, c))
+        trail.push(state.shows.pop)
+
+        stats = self.scheduler.stats
+        if stats is not None:
+            stats.check()
+        if self.mainSlots < self.mainsLeft:
+            if stats is not None:
+                stats.prune("forwardCheck")
+            return False
+
+        # Forward check: take this comedian out of the domains they no longer have the hours for
+        if state.hoursLeft[c] < problemspec.MAIN_HOURS:
+            bit = 1 << c
+            for t in range(len(self.shows)):
+                if self.domains[t] is None or not self.domains[t] & bit:
+                    continue
+                if state.hoursLeft[c] < problemspec.TEST_HOURS or not compactstate.showIsTest(self.shows[t]):
+                    trail.setItem(self.domains, t, self.domains[t] & ~bit)
+                    if self.domains[t] == 0:
+                        if stats is not None:
+                            stats.prune("forwardCheck")
+                        return False
+        return True
+
+#The second half of task 3: give each packed show a timeslot, slot by slot, ordered by applySchedulingHeuristics.
+#timeslots is an array of packed shows, with compactstate.EMPTY for the slots not filled yet
+class ShowsToDaysProblem:
+
+    def __init__(self, scheduler, shows, timeslots, slotNumber):
+        self.scheduler = scheduler
+        self.shows = shows
+        self.timeslots = timeslots
+        self.slotNumber = slotNumber
+
+    def isComplete(self):
+        return self.slotNumber >= len(self.timeslots)
+
+    # The slots are filled in order, so nothing is on a later day yet, and no constraint looks back at an earlier one. So
+    # the rest of the search only depends on the slot, and on each comedian's unplaced mains and tests and hours so far today.
+    # Comedians are interchangeable here (every show already has one), so the key is the sorted list of those
+    def signature(self):
+        return ("slots", self.slotNumber, self.scheduler.slotState.signature(self.scheduler.getDay(self.slotNumber)))
+
+    def choices(self):
+        slotNumber = self.slotNumber
+        if self.timeslots[slotNumber] != compactstate.EMPTY:
+            print("Error - trying to allocate to a timeslot that has already been filled")
+
+        # Before we pick a show, order them in order of best to worst
+        shows = self.scheduler.applySchedulingHeuristics(self.shows, slotNumber, self.timeslots)
+        symmetryBreaking = self.scheduler.symmetryBreaking
+        state = self.scheduler.slotState
+        # Once the engine asks for the next show, the subtree under the last one has failed. Which demographic a show is for
+        # makes no difference to the days, so a show of the same type by a comedian whose profile so far is the same (which
+        # includes another show by the same comedian) would fail too. The shows are still tried in the same order, so the
+        # schedule found is the same as without this, just sooner
+        failed = set()
+        for show in list(shows):
+            if symmetryBreaking:
+                key = (compactstate.showIsTest(show), state.profile(compactstate.showComedian(show)))
+                if symmetryPrune(self.scheduler.stats, key in failed):
+                    continue
+            if self.scheduler.scheduleViolations(self.timeslots, slotNumber, shows, show) == False:
+                yield [shows, show]
+            if symmetryBreaking:
+                failed.add(key)
+
+    def apply(self, choice, trail):
+        [shows, show] = choice
+        slotNumber = self.slotNumber
+
+        trail.setItem(self.timeslots, slotNumber, show)
+        self.scheduler.placeShow(show, slotNumber)
+        trail.push(lambda: self.scheduler.unplaceShow(show, slotNumber))
+        shows.remove(show)
+        trail.push(lambda: shows.append(show))
+        trail.setAttr(self, "shows", shows)
+        trail.setAttr(self, "slotNumber", slotNumber + 1)
+        return True
+
+#Incremental repair of a task 3 schedule (see repair.py): give each packed show that has lost its place (packed without a
+#comedian) both a comedian and a day with a free slot. costModel (a costmodel.CostModel over comedian ids) holds the shows
+#that were kept, so the hour caps are checked and each option priced against them, and options are tried cheapest first.
+#assignments gets a [show, day] for each show, in the order they were placed
+class RepairProblem:
+
+    def __init__(self, scheduler, shows, costModel, assignments):
+        self.scheduler = scheduler
+        self.shows = shows
+        self.costModel = costModel
+        self.assignments = assignments
+        self.slotsPerDay = scheduler.spec.slotsPerDay
+        self.showNumber = 0
+
+    def isComplete(self):
+        return self.showNumber >= len(self.shows)
+
+    def choices(self):
+        show = self.shows[self.showNumber]
+        d = compactstate.showDemographic(show)
+        isTest = compactstate.showIsTest(show)
+        costModel = self.costModel
+        stats = self.scheduler.stats
+
+        options = []
+        for c in self.scheduler.breakTies(self.scheduler.index.candidateIds(d, isTest)):
+            for day in range(costModel.days):
+                if costModel.occupancy[day] >= self.slotsPerDay:
+                    continue
+                if stats is not None:
+                    stats.check()
+                if not costModel.canPlace(c, day, isTest):
+                    if stats is not None:
+                        stats.prune("hoursCap")
+                    continue
+                options.append([costModel.placeDelta(c, day, isTest), c, day])
+
+        # sorted is stable, so ties keep the tie-broken comedian order and then the earliest day
+        for delta, c, day in sorted(options, key = lambda o: o[0]):
+            yield [compactstate.withComedian(show, c), day]
+
+    def apply(self, choice, trail):
+        [show, day] = choice
+        c = compactstate.showComedian(show)
+        isTest = compactstate.showIsTest(show)
+        self.costModel.place(c, day, isTest)
+        trail.push(lambda: self.costModel.remove(c, day, isTest))
+        self.assignments.append(choice)
+        trail.push(self.assignments.pop)
+        trail.setAttr(self, "showNumber", self.showNumber + 1)
+        return True
@@ -0,0 +1,139 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import problemspec
+import timetable
+
+#A persistent cache of solved timetables, kept as one JSON file per schedule in a directory, so a weekly input that has been
+#solved before isn't solved again from scratch.
+#
+#Schedules are keyed by a fingerprint of the problem that doesn't depend on the order of the comedians and demographics or on
+#their names. Each comedian is described only by its sorted themes and each demographic by its sorted topics, and the
+#fingerprint is a hash of the sorted lists of those, the spec and the solver settings (task, mode and weights). Two comedians
+#with the same themes (or demographics with the same topics) are interchangeable, so a schedule stored for one problem becomes
+#a schedule for any problem with the same fingerprint by matching its comedians and demographics up in that sorted order.
+#
+#A hit is always re-checked with Timetable.scheduleChecker against the problem being solved, and counts as a miss if it fails.
+#The cache holds at most maxEntries schedules. A hit touches its file's modification time, and the least recently used
+#schedules are deleted when a new one takes the cache over its cap. Files are written under a temporary name and renamed into
+#place, so the workers of a Portfolio or the tuner can share one cache directory.
+
+def comedianSignature(comedian):
+    return sorted(comedian.themes)
+
+def demographicSignature(demographic):
+    return sorted(demographic.topics)
+
+# The comedians and demographics in the order the fingerprint lists them. Ties keep the order they were given in
+def canonicalOrder(comedian_List, demographic_List):
+    return [sorted(comedian_List, key = comedianSignature), sorted(demographic_List, key = demographicSignature)]
+
+# settings is a dict of whatever else the schedule depends on, e.g. {"task": 3, "mode": "heuristic", "weights": {...}}
+def fingerprint(comedian_List, demographic_List, spec=None, settings=None):
+    spec = spec if spec is not None else problemspec.ProblemSpec()
+    problem = {
+        "comedians": sorted(comedianSignature(c) for c in comedian_List),
+        "demographics": sorted(demographicSignature(d) for d in demographic_List),
+        "spec": spec.asDict(),
+        "settings": settings if settings is not None else {},
+    }
+    return hashlib.sha256(json.dumps(problem, sort_keys=True).encode()).hexdigest()
+
+class SolutionCache:
+
+    def __init__(self, directory, maxEntries=1000):
+        self.directory = directory
+        self.maxEntries = maxEntries
+        os.makedirs(directory, exist_ok=True)
+        # Counted over every lookup this object has made
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    # Returns the cached timetable for the problem, checked and priced against it, or None.
+    # index can be the problem's eligibility.EligibilityIndex, if one has been built, so the check doesn't build another
+    def get(self, comedian_List, demographic_List, spec=None, settings=None, index=None):
+        spec = spec if spec is not None else problemspec.ProblemSpec()
+        filename = self.path(fingerprint(comedian_List, demographic_List, spec, settings))
+        try:
+            with open(filename) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        tt = self.rowsToTimetable(comedian_List, demographic_List, spec, entry)
+        # The checker prints the constraint a bad schedule breaks, which isn't worth showing for a cache entry
+        with contextlib.redirect_stdout(io.StringIO()):
+            valid = tt is not None and tt.scheduleChecker(comedian_List, demographic_List, index)
+        if not valid:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+        return tt
+
+    # Stores a timetable that solves the problem, evicting the least recently used schedules if the cache is over its cap
+    def put(self, comedian_List, demographic_List, spec, settings, tt):
+        spec = spec if spec is not None else problemspec.ProblemSpec()
+        [comedians, demographics] = canonicalOrder(comedian_List, demographic_List)
+        comedianPositions = {c: i for i, c in enumerate(comedians)}
+        demographicPositions = {d: i for i, d in enumerate(demographics)}
+        days = spec.dayNames()
+
+        rows = []
+        for day in tt.schedule:
+            for session, [c, d, showType] in sorted(tt.schedule[day].items()):
+                rows.append([days.index(day), session, comedianPositions[c], demographicPositions[d], showType])
+        entry = {"task": tt.taskNumber, "rows": rows}
+
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as f:
+            json.dump(entry, f)
+        os.replace(temporary, self.path(fingerprint(comedian_List, demographic_List, spec, settings)))
+        self.evict()
+
+    # Rebuilds a stored schedule with this problem's own comedian and demographic objects, or None if it doesn't fit the problem
+    def rowsToTimetable(self, comedian_List, demographic_List, spec, entry):
+        [comedians, demographics] = canonicalOrder(comedian_List, demographic_List)
+        days = spec.dayNames()
+        tt = timetable.Timetable(entry["task"], spec)
+        try:
+            for day, session, c, d, showType in entry["rows"]:
+                tt.addSession(days[day], session, comedians[c], demographics[d], showType)
+        except (IndexError, ValueError, TypeError):
+            return None
+        return tt
+
+    def entries(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    # Deletes the least recently used schedules until there are at most maxEntries
+    def evict(self):
+        filenames = self.entries()
+        if len(filenames) <= self.maxEntries:
+            return
+        ages = []
+        for filename in filenames:
+            try:
+                ages.append([os.path.getmtime(filename), filename])
+            except OSError:
+                pass
+        for mtime, filename in sorted(ages)[:len(ages) - self.maxEntries]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def clear(self):
+        for filename in self.entries():
+            os.remove(filename)
@@ -0,0 +1,29 @@
+#Every task and solver mode the command line tools can run (batch.py, benchmark.py), so they all run the same ones.
+#Each solver is [task, mode, function that runs it on a Scheduler with a time limit and a seed]. The time limit is the
+#budget the anytime modes (improved, lns and optimal) use in full, and the seed is for the improved and lns modes.
+#The first mode for each task is its default
+
+# Task 3 with the days given to the heuristic pairing by dayassignment.py rather than by assignShowsToDays
+def optimalDays(sch, timeLimit, seed):
+    sch.daysMode = "optimal"
+    return sch.createMinCostSchedule()
+
+SOLVERS = [
+    [1, "backtrack", lambda sch, timeLimit, seed: sch.createSchedule()],
+    [1, "matching", lambda sch, timeLimit, seed: sch.createSchedule("matching")],
+    [2, "heuristic", lambda sch, timeLimit, seed: sch.createTestShowSchedule()],
+    [2, "forwardchecking", lambda sch, timeLimit, seed: sch.createTestShowSchedule("forwardchecking")],
+    [3, "heuristic", lambda sch, timeLimit, seed: sch.createMinCostSchedule()],
+    [3, "forwardchecking", lambda sch, timeLimit, seed: sch.createMinCostSchedule("forwardchecking")],
+    [3, "optimaldays", optimalDays],
+    [3, "improved", lambda sch, timeLimit, seed: sch.createImprovedSchedule(timeLimit=timeLimit, seed=seed)],
+    [3, "lns", lambda sch, timeLimit, seed: sch.createLNSSchedule(timeLimit=timeLimit, seed=seed)],
+    [3, "optimal", lambda sch, timeLimit, seed: sch.createOptimalSchedule(timeLimit)],
+]
+
+# The solver for a task and mode (or the task's default mode if mode is None), or None if SOLVERS doesn't have it
+def findSolver(task, mode):
+    for solver in SOLVERS:
+        if solver[0] == task and (mode is None or solver[1] == mode):
+            return solver
+    return None
@@ -0,0 +1,105 @@
+import time
+
+#Counts what the searches do, for finding out which part of a solve is slow on which problem.
+#Set Scheduler.stats to a SearchStats (or anything with the same methods, e.g. a subclass that logs) to turn it on.
+#It is None by default, and then every hook is a single "is not None" check.
+#   nodes, backtracks - choices made and choice lists run out of, over every search (see search.py)
+#   checks            - constraint checks made on candidate choices
+#   prunes            - how many candidates each constraint ruled out:
+#                       hoursCap      - the comedian doesn't have the hours left this week (or, in task 1, already has 2 mains)
+#                       dailyCap      - the comedian would be on for more than 2 hours that day
+#                       futureFailure - Scheduler.futureFailureDetected saw the rest of the week couldn't be filled
+#                       forwardCheck  - the forward checking search ran a show out of comedians, or ran out of hours for mains
+#                       symmetry      - the choice is a symmetric copy of one that is (or was) searched anyway
+#   nogoods           - lookups in the scheduler's search.NogoodTable, how many of them found a state known to fail (so
+#                       its subtree wasn't searched again), and the fraction that did
+#   phaseTimes        - seconds spent in each phase: "pairing" (comedians to shows) and "slots" (shows to timeslots)
+#   depths            - if depthHistogram is on, how many nodes were made at each depth of the search
+#trace, if given, is called as trace(event, detail) for every event, where event is "node", "backtrack", "prune", "nogood" or "phase"
+class SearchStats:
+
+    def __init__(self, depthHistogram=False, trace=None):
+        self.depthHistogram = depthHistogram
+        self.trace = trace
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0
+        self.backtracks = 0
+        self.checks = 0
+        self.prunes = {}
+        self.nogoodLookups = 0
+        self.nogoodHits = 0
+        self.phaseTimes = {}
+        self.depths = []
+
+    def node(self, depth):
+        self.nodes += 1
+        if self.depthHistogram:
+            while len(self.depths) <= depth:
+                self.depths.append(0)
+            self.depths[depth] += 1
+        if self.trace is not None:
+            self.trace("node", depth)
+
+    def backtrack(self, depth):
+        self.backtracks += 1
+        if self.trace is not None:
+            self.trace("backtrack", depth)
+
+    def check(self):
+        self.checks += 1
+
+    def prune(self, reason):
+        self.prunes[reason] = self.prunes.get(reason, 0) + 1
+        if self.trace is not None:
+            self.trace("prune", reason)
+
+    def nogoodLookup(self, hit):
+        self.nogoodLookups += 1
+        if hit:
+            self.nogoodHits += 1
+            if self.trace is not None:
+                self.trace("nogood", self.nogoodLookups)
+
+    # Used as "with stats.phase(name):", and adds the time spent inside to phaseTimes[name]
+    def phase(self, name):
+        return PhaseTimer(self, name)
+
+    def addPhaseTime(self, name, seconds):
+        self.phaseTimes[name] = self.phaseTimes.get(name, 0) + seconds
+        if self.trace is not None:
+            self.trace("phase", [name, seconds])
+
+    def asDict(self):
+        return {"nodes": self.nodes, "backtracks": self.backtracks, "checks": self.checks, "prunes": dict(self.prunes),
+            "nogoods": {"lookups": self.nogoodLookups, "hits": self.nogoodHits, "hitRate": self.nogoodHits / self.nogoodLookups if self.nogoodLookups > 0 else 0},
+            "phaseTimes": dict(self.phaseTimes), "depths": list(self.depths)}
+
+    def __str__(self):
+        return str(self.asDict())
+
+class PhaseTimer:
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        self.stats.addPhaseTime(self.name, time.perf_counter() - self.start)
+        return False
+
+# Stands in for a PhaseTimer when stats are off
+class NoPhase:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+NO_PHASE = NoPhase()
@@ -1,22 +1,33 @@
 import demographic
 import comedian
+import eligibility
+import problemspec
 
 #This class is used to create the time table object that you will assign a schedule to
 #Importantly, it creates a dictionary, of dictionaries. Each day of the week is it's own dictionary, which can have a key value pair assigned to it.
 #The key will be the slot number, and the value a list of objects that is the comedian, demographic and show_type in that order.
 #Comedian will be a comedian object, demographic will be a demographic object and show_type is a string that should be either 'main' or 'test'
+#The number of days and slots, and the hour caps, come from a ProblemSpec (see problemspec.py), which defaults to the standard week
 class Timetable:
 
-    def __init__(self, taskNumber):
-        self.schedule = {"Monday" : {}, "Tuesday" : {}, "Wednesday" : {}, "Thursday" : {}, "Friday" : {}}
+    def __init__(self, taskNumber, spec=None):
+        self.spec = spec if spec is not None else problemspec.ProblemSpec()
+        self.schedule = {}
+        for day in self.spec.dayNames():
+            self.schedule[day] = {}
         self.cost = 0
         self.taskNumber = taskNumber
+        self.index = None
+
+    #The error for a day that isn't in the week
+    def dayError(self):
+        return ValueError("Day can only be " + problemspec.listToWords(self.spec.dayNames()))
 
 
     #This method is used by other classes, and should not be used by you
     def getSession(self, day, timeslot):
         if day not in self.schedule:
-            raise ValueError("Day can only be Monday, Tuesday, Wednesday, Thursday or Friday")
+            raise self.dayError()
         else:
             if timeslot in self.schedule[day]:
                 return self.schedule[day][timeslot]
@@ -26,7 +37,7 @@ class Timetable:
     #This method is used by other classes, and should not be used by you
     def sessionAssigned(self,day,timeslot):
         if day not in self.schedule:
-            raise ValueError("Day can only be Monday, Tuesday, Wednesday, Thursday or Friday")
+            raise self.dayError()
         else:
             if timeslot in self.schedule[day]:
                 return True
@@ -35,22 +46,22 @@ class Timetable:
 
     #This method will take all the information needed to assign a comedian and a demographic to a particular show slot.
     #day should be one of the days of the working week, as defined in the schedule dictionary above
-    #timeslot should be a number between and including 1-5 or 1-10 based on the task being attempted.
+    #timeslot should be a number between and including 1-5 or 1-10 based on the task being attempted (or the spec's slots per day).
     #comedian should be a comedian object
     #demographic should be a demographic object
     #show_type should be either 'main' or 'test'
     def addSession(self, day, timeslot, comedian, demographic, show_type):
         if day not in self.schedule:
-            raise ValueError("Day can only be Monday, Tuesday, Wednesday, Thursday or Friday")
+            raise self.dayError()
         elif self.taskNumber == 1:
-            if timeslot == 0 or timeslot > 5:
-                raise ValueError("timeslot can only be: 1, 2, 3, 4 or 5")
+            if timeslot == 0 or timeslot > self.spec.mainSlotsPerDay:
+                raise ValueError("timeslot can only be: " + problemspec.listToWords(range(1, self.spec.mainSlotsPerDay + 1)))
             else:
                 #print("Inserting into schedule: " + str(day) + " - " + str(timeslot))
                 self.schedule[day][timeslot] = [comedian, demographic, "main"]
         else:
-            if timeslot == 0 or timeslot > 10:
-                raise ValueError("timeslot can only be: 1, 2, 3, 4, 5, 6, 7, 8, 9 or 10")
+            if timeslot == 0 or timeslot > self.spec.slotsPerDay:
+                raise ValueError("timeslot can only be: " + problemspec.listToWords(range(1, self.spec.slotsPerDay + 1)))
             elif show_type != "main" and show_type != "test":
                 raise ValueError("show_type must be either: main or test") 
             else:
@@ -58,7 +69,10 @@ class Timetable:
                 self.schedule[day][timeslot] = [comedian, demographic, show_type]
 
     #This method calls the correct checker based on the task
-    def scheduleChecker(self, comedian_List, demographic_List):
+    #index can be an eligibility index already built for these lists (such as a Scheduler's), to save building another
+    def scheduleChecker(self, comedian_List, demographic_List, index=None):
+        #Build the eligibility index once, so checking each entry is a lookup rather than a scan of the comedian's themes
+        self.index = index if index is not None else eligibility.EligibilityIndex(comedian_List, demographic_List)
 
         if self.taskNumber == 1:
             return self.task1Checker(comedian_List, demographic_List)
@@ -67,29 +81,17 @@ class Timetable:
 
     #Small utility method to check if a comedian can market a show to a demographic
     def canMarket(self, comedian, demographic, isTest):
+        #if an eligibility index has been built for this problem, use it
+        if self.index is not None:
+            return self.index.canMarket(comedian, demographic, isTest)
+
         #if its not a test show, we make sure every one of the demographics' topics is matched by the comedian's themes.
         if not isTest:
-            topics = demographic.topics
-
-            i = 0
-            for t in topics:
-                if t not in comedian.themes:
-                    #print(str(comedian.name) + " cannot be marketed to demographic " + str(demographic.reference))
-                    return False
-
-            return True
+            return comedian.canDoMain(demographic)
 
         #if it is a test show, we make sure the comedian has at least one theme that matches a topic of the demographic.
         else:
-            topics = demographic.topics
-
-            i = 0
-            for t in topics:
-                if t in comedian.themes:
-                    return True
-
-            #print(str(comedian.name) + " cannot be marketed to demographic " + str(demographic.reference))
-            return False    
+            return comedian.canDoTest(demographic)
 
     #A checker to make sure your task 1 schedule is legal. 
     def task1Checker(self, comedian_List, demographic_List):
@@ -99,7 +101,7 @@ class Timetable:
         #We make sure to check that every day has all its timeslots assigned
         for day in self.schedule:
             day_List = self.schedule[day]
-            if len(day_List) != 5:
+            if len(day_List) != self.spec.mainSlotsPerDay:
                 print(str(day) + " does not have every slot assigned.")
                 return False
             comedians_Today = list()
@@ -122,12 +124,12 @@ class Timetable:
                 else:
                     comedians_Today.append(comedian.name)
 
-                #This makes sure a comedian is in a maximum of two shows a week.
+                #This makes sure a comedian is in a maximum of two shows a week (or as many as fit in the spec's weekly hours).
                 if comedian.name in comedian_Count:
                     show_Count = comedian_Count[comedian.name]
                     comedian_Count[comedian.name] = comedian_Count[comedian.name] + 1
-                    if show_Count == 2:
-                        print(str(comedian.name) + " is in more than two shows a week.")
+                    if show_Count == self.spec.mainsPerWeek():
+                        print(str(comedian.name) + " is in more than " + problemspec.numberToWords(self.spec.mainsPerWeek()) + " shows a week.")
                         return False
                 else:
                     comedian_Count[comedian.name] = 1
@@ -141,15 +143,20 @@ class Timetable:
 
 
     #This checks the validity of a solution to problem 2 and 3, and also calculates the cost. 
+    #Shows are priced slot by slot, and this pricing is the reference the solvers' CostModel (see costmodel.py) is checked against.
+    #Only a daily cap above 2 hours lets a comedian do a test and then a main on the same day, which the original rules didn't
+    #price. Then the test is made half price when the main comes, as it would have been with the main first
     def task23Checker(self, comedian_List, demographics_List):
 
         comedian_Count = dict()
-        main_demographics_Assigned = list()
-        test_demographics_Assigned = list()
+        main_demographics_Assigned = set()
+        test_demographics_Assigned = set()
         schedule_Cost = 0
-        comedians_Yesterday = list()
+        comedians_Yesterday = dict()
         main_show_Count = dict()
         test_show_Count = dict()
+        dailyHours = self.spec.dailyHours
+        weeklyHours = self.spec.weeklyHours
 
         for comedian in comedian_List:
             main_show_Count[comedian.name] = 0
@@ -161,7 +168,7 @@ class Timetable:
             day_List = self.schedule[day]
 
             #Again, we check each day has all of its slots assigned
-            if len(day_List) != 10:
+            if len(day_List) != self.spec.slotsPerDay:
                 print(str(day) + " does not have every slot assigned.")
                 return False
 
@@ -178,14 +185,14 @@ class Timetable:
                         print(str(demographic.reference) + " is being marketed more than one main show a week.")
                         return False
                     else:
-                        main_demographics_Assigned.append(demographic.reference)
+                        main_demographics_Assigned.add(demographic.reference)
 
                 elif show_type == "test":
                     if demographic.reference in test_demographics_Assigned:
                         print(str(demographic.reference) + " is being marketed more than one test show a week.")
                         return False
                     else:
-                        test_demographics_Assigned.append(demographic.reference)    
+                        test_demographics_Assigned.add(demographic.reference)    
 
                 #We make sure that an illegal session type hasn't been entered somehow
                 else:
@@ -193,60 +200,44 @@ class Timetable:
                     return False
 
                 #We now go through every comedian to make sure they are not on stage for too long in a week 
-                if comedian.name in comedians_Today:
-                    #This branch means the comedian is already on stage today.
-                    if comedians_Today[comedian.name] >= 2:
-                        print(str(comedian.name) + " is already on stage for two hours on " + str(day))
-                        return False
+                if comedians_Today.get(comedian.name, 0) >= dailyHours:
+                    print(str(comedian.name) + " is already on stage for " + problemspec.numberToWords(dailyHours) + " hours on " + str(day))
+                    return False
+
+                #We calculate the cost for the show, if it is a main show.
+                if show_type == "main":
+                    main_show_Count[comedian.name] = main_show_Count.get(comedian.name, 0) + 1
+                    if main_show_Count[comedian.name] == 1:
+                        schedule_Cost = schedule_Cost + 500
+                    elif comedian.name in comedians_Yesterday:
+                        schedule_Cost = schedule_Cost + 100
                     else:
-                        #We calculate the cost for the show, if it is a main show.
-                        if show_type == "main":
-                            comedians_Today[comedian.name] = comedians_Today[comedian.name] + 2
-                            main_show_Count[comedian.name] = main_show_Count[comedian.name] + 1
-                            if main_show_Count[comedian.name] == 1:
-                                schedule_Cost = schedule_Cost + 500
-                            elif comedian.name in comedians_Yesterday:
-                                schedule_Cost = schedule_Cost + 100
-                            else:
-                                schedule_Cost = schedule_Cost + 300
-                        else:
-                            #We calculate the cost of a test show
-                            comedians_Today[comedian.name] = comedians_Today[comedian.name] + 1
-                            test_show_Count[comedian.name] = test_show_Count[comedian.name] + 1
-                            initial_test_show_Cost = (300 - (50 * test_show_Count[comedian.name])) / 2
-                            schedule_Cost = schedule_Cost + initial_test_show_Cost
-
-                            if comedian.name in possible_Discount:
-                                schedule_Cost = schedule_Cost - possible_Discount.pop(comedian.name)
+                        schedule_Cost = schedule_Cost + 300
+
+                    #A full price test earlier today becomes half price (only possible with a daily cap above 2 hours)
+                    if dailyHours > 2 and comedian.name in possible_Discount:
+                        schedule_Cost = schedule_Cost - possible_Discount.pop(comedian.name)
+
+                #We calculate the cost of a test show, which is half price if the comedian is already on stage today
                 else:
-                    #This branch means the comedian has not yet been on stage today
-                    #We calculate the costs correspondingly
-                    if show_type == "main":
-                        comedians_Today[comedian.name] = 2
-                        main_show_Count[comedian.name] = main_show_Count[comedian.name] + 1
-                        if main_show_Count[comedian.name] == 1:
-                            schedule_Cost = schedule_Cost + 500
-                        elif comedian.name in comedians_Yesterday:
-                            schedule_Cost = schedule_Cost + 100
-                        else:
-                            schedule_Cost = schedule_Cost + 300
+                    test_show_Count[comedian.name] = test_show_Count.get(comedian.name, 0) + 1
+                    initial_test_show_Cost = 300 - (50 * test_show_Count[comedian.name])
+                    if comedian.name in comedians_Today:
+                        schedule_Cost = schedule_Cost + initial_test_show_Cost // 2
+                        if comedian.name in possible_Discount:
+                            schedule_Cost = schedule_Cost - possible_Discount.pop(comedian.name)
                     else:
-                        comedians_Today[comedian.name] = 1
-
-                        test_show_Count[comedian.name] = test_show_Count[comedian.name] + 1
-                        initial_test_show_Cost = (300 - (50 * test_show_Count[comedian.name]))
                         schedule_Cost = schedule_Cost + initial_test_show_Cost
-                        possible_Discount[comedian.name] = initial_test_show_Cost / 2
+                        possible_Discount[comedian.name] = initial_test_show_Cost // 2
 
-                #We update the hours the comedian is on stage for the week
-                if show_type == "main":
-                    comedian_Count[comedian.name] = comedian_Count[comedian.name] + 2
-                else:
-                    comedian_Count[comedian.name] = comedian_Count[comedian.name] + 1
+                #We update the hours the comedian is on stage for today and the week
+                hours = problemspec.MAIN_HOURS if show_type == "main" else problemspec.TEST_HOURS
+                comedians_Today[comedian.name] = comedians_Today.get(comedian.name, 0) + hours
+                comedian_Count[comedian.name] = comedian_Count.get(comedian.name, 0) + hours
 
                 #Make sure a comedian is not on stage for more than four hours a week
-                if comedian_Count[comedian.name] > 4:
-                        print(str(comedian.name) + " is already on stage for 4 hours")
+                if comedian_Count[comedian.name] > weeklyHours:
+                        print(str(comedian.name) + " is already on stage for " + str(weeklyHours) + " hours")
                         return False
 
                 #check if the comedian can be marketed to the assigned demographic
@@ -256,16 +247,16 @@ class Timetable:
 
             #One last check to make sure daily stage hours haven't been exceeded
             for name in comedians_Today:
-                if comedians_Today[name] > 2:
-                    print(str(name) + " is on stage for more than two hours in a day.")
+                if comedians_Today[name] > dailyHours:
+                    print(str(name) + " is on stage for more than " + problemspec.numberToWords(dailyHours) + " hours in a day.")
                     return False
 
             comedians_Yesterday = comedians_Today
 
         #One final check to make sure total hours haven't been exceeded
         for name in comedian_Count:
-            if comedian_Count[name] > 4:
-                print(str(name) + " is on stage for more than four hours a week")
+            if comedian_Count[name] > weeklyHours:
+                print(str(name) + " is on stage for more than " + problemspec.numberToWords(weeklyHours) + " hours a week")
                 return False
 
         #If we get here, schedule is legal, so we assign the cost and return True
@@ -0,0 +1,171 @@
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import time
+import scheduler
+import generator
+
+#Tunes the heuristic weights (see scheduler.DEFAULT_WEIGHTS) for the task 3 heuristic solver over a training set of problems,
+#running the solves in a process pool. Three ways of picking the weight profiles to try:
+#   grid   - every combination of the values in SPACE
+#   random - profiles drawn at random from SPACE
+#   halving - successive halving: many random profiles are scored on a few problems, the best third go on to be scored on
+#             three times as many, and so on until one is left or every problem has been used
+#Each profile is scored by how many problems it solved within the time limit, then its mean cost, then its mean time.
+#The result is written as JSON: the best profile, and the runtime/cost trade-off curve - the profiles that solved the most
+#problems and that no other profile beat on both mean cost and mean time. Scheduler.createMinCostSchedule(weights=filename)
+#(or Scheduler.loadWeights) loads the best profile from the file.
+
+# The values tried for each weight. The defaults are always among them
+SPACE = {
+    "sameType": [0, 1, 2, 4],
+    "adjacentMain": [0, 100, 200, 400, 800],
+    "secondTest": [0, 75, 150, 300, 600],
+    "showCount": [0, 0.5, 1, 2, 4],
+}
+
+# Set in each worker process by initWorker: [name, comedian_List, demographic_List, spec] for every training problem
+instances = None
+
+def initWorker(training):
+    global instances
+    instances = training
+
+# Solves one training problem with one profile in a worker process. Returns [cost or None, seconds]
+def solveInstance(job):
+    [weights, number, mode, timeLimit] = job
+    [name, comedian_List, demographic_List, spec] = instances[number]
+    sch = scheduler.Scheduler(comedian_List, demographic_List, spec)
+    start = time.perf_counter()
+    if timeLimit is not None:
+        sch.shouldStop = lambda: time.perf_counter() - start > timeLimit
+    with contextlib.redirect_stdout(io.StringIO()):
+        tt = sch.createMinCostSchedule(mode, weights)
+        valid = tt != False and tt.scheduleChecker(comedian_List, demographic_List)
+    seconds = time.perf_counter() - start
+    return [tt.cost if valid else None, seconds]
+
+def gridProfiles(space=SPACE):
+    features = list(space)
+    return [dict(zip(features, values)) for values in itertools.product(*[space[f] for f in features])]
+
+# count distinct random profiles, starting with the defaults
+def randomProfiles(count, seed=0, space=SPACE):
+    rng = random.Random(seed)
+    profiles = [dict(scheduler.DEFAULT_WEIGHTS)]
+    seen = {tuple(sorted(profiles[0].items()))}
+    limit = 1
+    for values in space.values():
+        limit *= len(values)
+    while len(profiles) < min(count, limit):
+        profile = {feature: rng.choice(values) for feature, values in space.items()}
+        if tuple(sorted(profile.items())) not in seen:
+            seen.add(tuple(sorted(profile.items())))
+            profiles.append(profile)
+    return profiles
+
+class Tuner:
+
+    # training is a list of [name, comedian_List, demographic_List, spec]. timeLimit is per solve, in seconds (None for no limit)
+    def __init__(self, training, mode="heuristic", timeLimit=5.0, workers=None):
+        self.training = training
+        self.mode = mode
+        self.timeLimit = timeLimit
+        self.workers = workers if workers is not None else os.cpu_count()
+        # Every score worked out so far, as {"weights", "problems", "solved", "meanCost", "meanTime"}
+        self.results = []
+
+    # Scores every profile on the first problemCount training problems, in the pool. Returns the scores in the same order
+    def score(self, executor, profiles, problemCount):
+        jobs = [[profile, number, self.mode, self.timeLimit] for profile in profiles for number in range(problemCount)]
+        outcomes = list(executor.map(solveInstance, jobs))
+        scores = []
+        for p, profile in enumerate(profiles):
+            runs = outcomes[p * problemCount:(p + 1) * problemCount]
+            costs = [cost for cost, seconds in runs if cost is not None]
+            scores.append({"weights": profile, "problems": problemCount, "solved": len(costs),
+                "meanCost": sum(costs) / len(costs) if costs else None, "meanTime": sum(seconds for cost, seconds in runs) / problemCount})
+        self.results += scores
+        return scores
+
+    # Most problems solved first, then the lowest mean cost, then the lowest mean time
+    def rank(self, scores):
+        return sorted(scores, key = lambda s: [-s["solved"], s["meanCost"] if s["meanCost"] is not None else float("inf"), s["meanTime"]])
+
+    # Scores the profiles on every training problem, returning the scores best first
+    def evaluate(self, profiles):
+        with self.pool() as executor:
+            return self.rank(self.score(executor, profiles, len(self.training)))
+
+    # Successive halving from count random profiles, keeping the best 1/eta each round while scoring on eta times as many problems
+    def halving(self, count, seed=0, eta=3, startProblems=1):
+        profiles = randomProfiles(count, seed)
+        problemCount = min(startProblems, len(self.training))
+        with self.pool() as executor:
+            while True:
+                scores = self.rank(self.score(executor, profiles, problemCount))
+                if len(profiles) == 1 or problemCount == len(self.training):
+                    return scores
+                profiles = [s["weights"] for s in scores[:max(1, len(profiles) // eta)]]
+                problemCount = min(len(self.training), problemCount * eta)
+
+    def pool(self):
+        return concurrent.futures.ProcessPoolExecutor(self.workers, initializer=initWorker, initargs=(self.training,))
+
+    # The profiles scored on every problem that solved as many as any profile did, and that no other such profile beats on
+    # both mean cost and mean time
+    def tradeOffCurve(self):
+        complete = [s for s in self.results if s["problems"] == len(self.training) and s["solved"] > 0]
+        if not complete:
+            return []
+        mostSolved = max(s["solved"] for s in complete)
+        complete = [s for s in complete if s["solved"] == mostSolved]
+        curve = []
+        for s in sorted(complete, key = lambda s: [s["meanTime"], s["meanCost"]]):
+            if not curve or s["meanCost"] < curve[-1]["meanCost"]:
+                curve.append(s)
+        return curve
+
+    # The tuned profile, in the format Scheduler.loadWeights reads
+    def report(self, best, method):
+        return {"weights": best["weights"], "meanCost": best["meanCost"], "meanTime": best["meanTime"], "solved": best["solved"],
+            "method": method, "mode": self.mode, "timeLimit": self.timeLimit, "problems": [t[0] for t in self.training],
+            "curve": self.tradeOffCurve()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the task 3 heuristic weights over a training set of problems")
+    parser.add_argument("--method", choices=["grid", "random", "halving"], default="halving")
+    parser.add_argument("--profiles", type=int, default=27, help="how many random profiles to try (random and halving)")
+    parser.add_argument("--problems", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "ExampleProblems", "*.txt"), help="glob of training problem files")
+    parser.add_argument("--generate", type=int, default=0, help="how many generated problems to add to the training set")
+    parser.add_argument("--comedians", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated problems and the random profiles")
+    parser.add_argument("--mode", default="heuristic", help="the pairing search mode (see Scheduler.pairMainsAndTests)")
+    parser.add_argument("--time-limit", type=float, default=5.0, help="seconds before a solve is stopped and counted as unsolved")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None, help="file to write the tuned profile to, instead of printing it")
+    args = parser.parse_args()
+
+    training = generator.readProblems(args.problems, args.generate, args.seed, comedians=args.comedians)
+    tuner = Tuner(training, args.mode, args.time_limit, args.workers)
+    if args.method == "grid":
+        scores = tuner.evaluate(gridProfiles())
+    elif args.method == "random":
+        scores = tuner.evaluate(randomProfiles(args.profiles, args.seed))
+    else:
+        scores = tuner.halving(args.profiles, args.seed)
+
+    report = tuner.report(scores[0], args.method)
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()